@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import Principal
 from app.core.database import get_db
 from app.core.deps import get_current_user
-from app.models.user import User
+from app.core.responses import ModelResponse
 from app.schemas.auth import AuthOut, LoginIn, RegisterIn, TokenOut
 from app.schemas.common import SuccessResponse
 from app.schemas.user import UserOut
@@ -13,17 +14,21 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=SuccessResponse[AuthOut])
-def register(payload: RegisterIn, db: Session = Depends(get_db)):
-    token, user = register_user(db, payload)
-    return {"data": AuthOut(access_token=token, user=UserOut.model_validate(user))}
+async def register(payload: RegisterIn, db: AsyncSession = Depends(get_db)):
+    token, user = await register_user(db, payload)
+    return ModelResponse(
+        SuccessResponse[AuthOut](
+            data=AuthOut(access_token=token, user=UserOut.model_validate(user))
+        )
+    )
 
 
 @router.post("/login", response_model=SuccessResponse[TokenOut])
-def login(payload: LoginIn, db: Session = Depends(get_db)):
-    token = login_user(db, payload)
-    return {"data": TokenOut(access_token=token)}
+async def login(payload: LoginIn, db: AsyncSession = Depends(get_db)):
+    token = await login_user(db, payload)
+    return ModelResponse(SuccessResponse[TokenOut](data=TokenOut(access_token=token)))
 
 
 @router.get("/me", response_model=SuccessResponse[UserOut])
-def me(current_user: User = Depends(get_current_user)):
-    return {"data": UserOut.model_validate(current_user)}
+async def me(current_user: Principal = Depends(get_current_user)):
+    return ModelResponse(SuccessResponse[UserOut](data=UserOut.model_validate(current_user)))
@@ -0,0 +1,56 @@
+import datetime as dt
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth_cache import Principal
+from app.core.deps import conditional_get, get_current_user, get_read_db
+from app.core.responses import ModelResponse
+from app.models.balance import Balance
+from app.schemas.balance import BalanceOut
+from app.schemas.common import SuccessResponse
+from app.services.fx_service import convert_rows
+
+router = APIRouter(prefix="/balances", tags=["balances"])
+
+
+@router.get("", response_model=SuccessResponse[list[BalanceOut]])
+async def list_balances(
+    group_id: uuid.UUID | None = None,
+    currency: str | None = None,
+    by_group: bool = False,
+    target_currency: str | None = Query(default=None, min_length=3, max_length=3),
+    etag: str | None = Depends(conditional_get("balances", unless=("target_currency",))),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    keys = [Balance.counterparty_type, Balance.counterparty_id, Balance.currency]
+    if by_group:
+        keys.append(Balance.group_id)
+    total = func.sum(Balance.amount)
+    stmt = select(*keys, total.label("amount")).where(Balance.owner_id == current_user.id)
+    if group_id:
+        stmt = stmt.where(Balance.group_id == group_id)
+    if currency:
+        stmt = stmt.where(Balance.currency == currency)
+    stmt = stmt.group_by(*keys).having(total != 0).order_by(*keys)
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    if target_currency:
+        # Open balances are converted at today's rate, then merged per counterparty.
+        converted = await convert_rows(db, rows, target_currency, [dt.date.today()] * len(rows))
+        merged = defaultdict(Decimal)
+        for row in converted:
+            merged[tuple(row[key.key] for key in keys)] += row["amount"]
+        rows = [
+            {**dict(zip((key.key for key in keys), values, strict=True)), "amount": amount}
+            for values, amount in merged.items()
+            if amount
+        ]
+    return ModelResponse(
+        SuccessResponse[list[BalanceOut]](data=[BalanceOut.model_validate(row) for row in rows]),
+        headers={"ETag": etag} if etag else None,
+    )
@@ -3,74 +3,101 @@ import uuid
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import Principal
 from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user, get_read_db
+from app.core.responses import ModelResponse
 from app.models.category import Category
-from app.models.user import User
 from app.schemas.category import CategoryCreate, CategoryOut, CategoryUpdate
 from app.schemas.common import SuccessListResponse, SuccessResponse
 from app.services.pagination import paginate
+from app.services.search import SearchSort, apply_search
 
 router = APIRouter(prefix="/categories", tags=["categories"])
 
 
 @router.post("", response_model=SuccessResponse[CategoryOut])
-def create_category(
+async def create_category(
     payload: CategoryCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     category = Category(owner_id=current_user.id, **payload.model_dump())
     db.add(category)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="Category name already exists")
-    db.refresh(category)
-    return {"data": CategoryOut.model_validate(category)}
+    await db.refresh(category)
+    return ModelResponse(SuccessResponse[CategoryOut](data=CategoryOut.model_validate(category)))
 
 
 @router.get("", response_model=SuccessListResponse[CategoryOut])
-def list_categories(
+async def list_categories(
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None, description="next_cursor of a previous page; page is ignored when set"
+    ),
+    include_total: bool = True,
     name: str | None = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    sort: SearchSort = "recent",
+    etag: str = Depends(conditional_get("categories")),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     stmt = select(Category).where(Category.owner_id == current_user.id)
+    ranked = bool(name) and sort == "relevance"
     if name:
-        stmt = stmt.where(Category.name.ilike(f"%{name}%"))
-    stmt = stmt.order_by(Category.created_at.desc())
-    items, meta = paginate(db, stmt, page, limit)
-    return {"data": [CategoryOut.model_validate(i) for i in items], "meta": meta}
+        stmt = apply_search(db, stmt, Category.name, name, ranked)
+    stmt = stmt.order_by(Category.created_at.desc(), Category.id.desc())
+    items, meta = await paginate(
+        db,
+        stmt,
+        page,
+        limit,
+        keyset=() if ranked else (Category.created_at, Category.id),
+        cursor=cursor,
+        owner_id=current_user.id,
+        include_total=include_total,
+    )
+    return ModelResponse(
+        SuccessListResponse[CategoryOut](
+            data=[CategoryOut.model_validate(i) for i in items], meta=meta
+        ),
+        headers={"ETag": etag},
+    )
 
 
 @router.get("/{category_id}", response_model=SuccessResponse[CategoryOut])
-def get_category(
+async def get_category(
     category_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    etag: str = Depends(conditional_get("categories", weak=False)),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    category = db.scalar(
+    category = await db.scalar(
         select(Category).where(Category.id == category_id, Category.owner_id == current_user.id)
     )
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    return {"data": CategoryOut.model_validate(category)}
+    return ModelResponse(
+        SuccessResponse[CategoryOut](data=CategoryOut.model_validate(category)),
+        headers={"ETag": etag},
+    )
 
 
 @router.patch("/{category_id}", response_model=SuccessResponse[CategoryOut])
-def update_category(
+async def update_category(
     category_id: uuid.UUID,
     payload: CategoryUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    category = db.scalar(
+    category = await db.scalar(
         select(Category).where(Category.id == category_id, Category.owner_id == current_user.id)
     )
     if not category:
@@ -78,25 +105,25 @@ def update_category(
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(category, key, value)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="Category name already exists")
-    db.refresh(category)
-    return {"data": CategoryOut.model_validate(category)}
+    await db.refresh(category)
+    return ModelResponse(SuccessResponse[CategoryOut](data=CategoryOut.model_validate(category)))
 
 
 @router.delete("/{category_id}", response_model=SuccessResponse[dict])
-def delete_category(
+async def delete_category(
     category_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    category = db.scalar(
+    category = await db.scalar(
         select(Category).where(Category.id == category_id, Category.owner_id == current_user.id)
     )
     if not category:
         raise HTTPException(status_code=404, detail="Category not found")
-    db.delete(category)
-    db.commit()
-    return {"data": {"deleted": True}}
+    await db.delete(category)
+    await db.commit()
+    return ModelResponse(SuccessResponse[dict](data={"deleted": True}))
@@ -1,192 +1,290 @@
 import uuid
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy import and_, select
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 
+from app.core.auth_cache import Principal
 from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user, get_read_db
+from app.core.responses import ModelResponse
 from app.models.category import Category
 from app.models.expense import Expense
 from app.models.expense_split import ExpenseSplit
 from app.models.group import Group
-from app.models.user import User
 from app.schemas.common import SuccessListResponse, SuccessResponse
-from app.schemas.expense import ExpenseCreate, ExpenseOut, ExpenseSplitOut, ExpenseUpdate
+from app.schemas.expense import (
+    ExpenseBatchIn,
+    ExpenseBatchOut,
+    ExpenseCreate,
+    ExpenseImportOut,
+    ExpenseOut,
+    ExpenseUpdate,
+)
+from app.services import idempotency
+from app.services.balance_service import apply_deltas, expense_deltas
+from app.services.batch_service import run_expense_batch
+from app.services.export_service import export_expenses
+from app.services.import_service import import_expenses
 from app.services.pagination import paginate
+from app.services.rollup_service import apply_rollup_deltas, rollup_deltas
+from app.services.search import SearchSort, apply_search
 from app.services.split_service import validate_and_compute_splits
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
 
-def _ensure_owner_refs(db: Session, user: User, category_id, group_id):
+async def _ensure_owner_refs(db: AsyncSession, user: Principal, category_id, group_id):
     if category_id:
-        category = db.scalar(
+        category = await db.scalar(
             select(Category).where(Category.id == category_id, Category.owner_id == user.id)
         )
         if not category:
             raise HTTPException(status_code=422, detail="Invalid category_id")
     if group_id:
-        group = db.scalar(select(Group).where(Group.id == group_id, Group.owner_id == user.id))
+        group = await db.scalar(
+            select(Group).where(Group.id == group_id, Group.owner_id == user.id)
+        )
         if not group:
             raise HTTPException(status_code=422, detail="Invalid group_id")
 
 
-def _to_expense_out(db: Session, expense: Expense):
-    splits = db.scalars(select(ExpenseSplit).where(ExpenseSplit.expense_id == expense.id)).all()
-    return ExpenseOut.model_validate(
-        {
-            **expense.__dict__,
-            "splits": [ExpenseSplitOut.model_validate(s) for s in splits],
-        }
-    )
+def _owned_expenses(user: Principal):
+    return select(Expense).where(Expense.owner_id == user.id).options(selectinload(Expense.splits))
+
+
+async def _get_owned_expense(db: AsyncSession, user: Principal, expense_id) -> Expense | None:
+    stmt = _owned_expenses(user).where(Expense.id == expense_id)
+    return await db.scalar(stmt.execution_options(populate_existing=True))
+
+
+def _build_splits(computed) -> list[ExpenseSplit]:
+    return [
+        ExpenseSplit(
+            participant_type=c["split"].participant_type,
+            participant_user_id=c["split"].user_id,
+            participant_friend_id=c["split"].friend_id,
+            share_amount=c["amount"],
+            share_percentage=c["percentage"],
+        )
+        for c in computed
+    ]
+
+
+def expense_filters(
+    date_from: str | None = None,
+    date_to: str | None = None,
+    category_id: uuid.UUID | None = None,
+    group_id: uuid.UUID | None = None,
+) -> list:
+    conditions = []
+    if category_id:
+        conditions.append(Expense.category_id == category_id)
+    if group_id:
+        conditions.append(Expense.group_id == group_id)
+    if date_from:
+        conditions.append(Expense.date >= date_from)
+    if date_to:
+        conditions.append(Expense.date <= date_to)
+    return conditions
+
+
+def _to_expense_out(expense: Expense):
+    return ExpenseOut.model_validate(expense)
 
 
 @router.post("", response_model=SuccessResponse[ExpenseOut])
-def create_expense(
+async def create_expense(
     payload: ExpenseCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    idempotency_key: str | None = Header(default=None, min_length=1, max_length=255),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    _ensure_owner_refs(db, current_user, payload.category_id, payload.group_id)
-    computed = validate_and_compute_splits(
+    if idempotency_key:
+        fingerprint = idempotency.request_hash(payload.model_dump_json(exclude_unset=True))
+        replay = await idempotency.claim(db, current_user.id, idempotency_key, fingerprint)
+        if replay is not None:
+            return replay
+    await _ensure_owner_refs(db, current_user, payload.category_id, payload.group_id)
+    computed = await validate_and_compute_splits(
         db=db,
         owner_id=current_user.id,
         total_amount=payload.amount,
         split_type=payload.split_type,
         splits=payload.splits,
     )
-    expense = Expense(owner_id=current_user.id, **payload.model_dump(exclude={"splits"}))
+    expense = Expense(
+        owner_id=current_user.id,
+        **payload.model_dump(exclude={"splits"}),
+        splits=_build_splits(computed),
+    )
     db.add(expense)
-    db.flush()
-    for c in computed:
-        sp = c["split"]
-        db.add(
-            ExpenseSplit(
-                expense_id=expense.id,
-                participant_type=sp.participant_type,
-                participant_user_id=sp.user_id,
-                participant_friend_id=sp.friend_id,
-                share_amount=c["amount"],
-                share_percentage=c["percentage"],
-            )
-        )
-    db.commit()
-    db.refresh(expense)
-    return {"data": _to_expense_out(db, expense)}
+    await apply_deltas(db, expense_deltas(expense))
+    await apply_rollup_deltas(db, rollup_deltas(expense))
+    await db.flush()
+    # Rendered before the commit so a replayable response is stored in the same transaction.
+    expense = await _get_owned_expense(db, current_user, expense.id)
+    response = ModelResponse(SuccessResponse[ExpenseOut](data=_to_expense_out(expense)))
+    if idempotency_key:
+        await idempotency.store_response(db, current_user.id, idempotency_key, response)
+    await db.commit()
+    return response
+
+
+@router.post("/import", response_model=SuccessResponse[ExpenseImportOut])
+async def import_expense_rows(
+    request: Request,
+    fmt: Literal["csv", "ndjson"] | None = Query(default=None, alias="format"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    if fmt is None:
+        fmt = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    report = await import_expenses(db, current_user.id, request.stream(), fmt)
+    return ModelResponse(SuccessResponse[ExpenseImportOut](data=report))
+
+
+@router.post(":batch", response_model=SuccessResponse[ExpenseBatchOut])
+async def batch_expenses(
+    payload: ExpenseBatchIn,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    results = await run_expense_batch(db, current_user.id, payload.operations)
+    return ModelResponse(SuccessResponse[ExpenseBatchOut](data={"results": results}))
 
 
 @router.get("", response_model=SuccessListResponse[ExpenseOut])
-def list_expenses(
+async def list_expenses(
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
-    date_from: str | None = None,
-    date_to: str | None = None,
-    category_id: uuid.UUID | None = None,
-    group_id: uuid.UUID | None = None,
+    cursor: str | None = Query(
+        default=None, description="next_cursor of a previous page; page is ignored when set"
+    ),
+    include_total: bool = True,
     q: str | None = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    sort: SearchSort = "recent",
+    conditions: list = Depends(expense_filters),
+    etag: str = Depends(conditional_get("expenses")),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    conditions = [Expense.owner_id == current_user.id]
-    if category_id:
-        conditions.append(Expense.category_id == category_id)
-    if group_id:
-        conditions.append(Expense.group_id == group_id)
-    if date_from:
-        conditions.append(Expense.date >= date_from)
-    if date_to:
-        conditions.append(Expense.date <= date_to)
+    stmt = _owned_expenses(current_user).where(*conditions)
+    ranked = bool(q) and sort == "relevance"
     if q:
-        conditions.append(Expense.description.ilike(f"%{q}%"))
+        stmt = apply_search(db, stmt, Expense.description, q, ranked)
+    stmt = stmt.order_by(Expense.date.desc(), Expense.id.desc())
+    items, meta = await paginate(
+        db,
+        stmt,
+        page,
+        limit,
+        keyset=() if ranked else (Expense.date, Expense.id),
+        cursor=cursor,
+        owner_id=current_user.id,
+        include_total=include_total,
+    )
+    return ModelResponse(
+        SuccessListResponse[ExpenseOut](data=[_to_expense_out(i) for i in items], meta=meta),
+        headers={"ETag": etag},
+    )
 
-    stmt = select(Expense).where(and_(*conditions)).order_by(Expense.date.desc())
-    items, meta = paginate(db, stmt, page, limit)
-    return {"data": [_to_expense_out(db, i) for i in items], "meta": meta}
+
+@router.get("/export")
+async def export_expense_rows(
+    fmt: Literal["csv", "ndjson"] = Query(default="ndjson", alias="format"),
+    q: str | None = None,
+    conditions: list = Depends(expense_filters),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    stmt = _owned_expenses(current_user).where(*conditions)
+    if q:
+        stmt = apply_search(db, stmt, Expense.description, q, ranked=False)
+    stmt = stmt.order_by(Expense.date.desc(), Expense.id.desc())
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        export_expenses(db, stmt, fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="expenses.{fmt}"'},
+    )
 
 
 @router.get("/{expense_id}", response_model=SuccessResponse[ExpenseOut])
-def get_expense(
+async def get_expense(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    etag: str = Depends(conditional_get("expenses", weak=False)),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    expense = db.scalar(
-        select(Expense).where(Expense.id == expense_id, Expense.owner_id == current_user.id)
-    )
+    expense = await _get_owned_expense(db, current_user, expense_id)
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
-    return {"data": _to_expense_out(db, expense)}
+    return ModelResponse(
+        SuccessResponse[ExpenseOut](data=_to_expense_out(expense)), headers={"ETag": etag}
+    )
 
 
 @router.patch("/{expense_id}", response_model=SuccessResponse[ExpenseOut])
-def update_expense(
+async def update_expense(
     expense_id: uuid.UUID,
     payload: ExpenseUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    expense = db.scalar(
-        select(Expense).where(Expense.id == expense_id, Expense.owner_id == current_user.id)
-    )
+    expense = await _get_owned_expense(db, current_user, expense_id)
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
 
     update_data = payload.model_dump(exclude_unset=True)
     new_amount = update_data.get("amount", expense.amount)
     new_split_type = update_data.get("split_type", expense.split_type)
-    new_splits = update_data.get("splits")
+    new_splits = payload.splits if "splits" in update_data else None
 
-    _ensure_owner_refs(
+    await _ensure_owner_refs(
         db,
         current_user,
         update_data.get("category_id", expense.category_id),
         update_data.get("group_id", expense.group_id),
     )
 
+    deltas = expense_deltas(expense, sign=-1)
+    rollups = rollup_deltas(expense, sign=-1)
     for key, value in update_data.items():
         if key != "splits":
             setattr(expense, key, value)
 
     if new_splits is not None:
-        computed = validate_and_compute_splits(
+        computed = await validate_and_compute_splits(
             db=db,
             owner_id=current_user.id,
             total_amount=new_amount,
             split_type=new_split_type,
             splits=new_splits,
         )
-        db.query(ExpenseSplit).filter(ExpenseSplit.expense_id == expense.id).delete()
-        for c in computed:
-            sp = c["split"]
-            db.add(
-                ExpenseSplit(
-                    expense_id=expense.id,
-                    participant_type=sp.participant_type,
-                    participant_user_id=sp.user_id,
-                    participant_friend_id=sp.friend_id,
-                    share_amount=c["amount"],
-                    share_percentage=c["percentage"],
-                )
-            )
-
-    db.commit()
-    db.refresh(expense)
-    return {"data": _to_expense_out(db, expense)}
+        expense.splits = _build_splits(computed)
+
+    await apply_deltas(db, expense_deltas(expense, into=deltas))
+    await apply_rollup_deltas(db, rollup_deltas(expense, into=rollups))
+    await db.commit()
+    expense = await _get_owned_expense(db, current_user, expense.id)
+    return ModelResponse(SuccessResponse[ExpenseOut](data=_to_expense_out(expense)))
 
 
 @router.delete("/{expense_id}", response_model=SuccessResponse[dict])
-def delete_expense(
+async def delete_expense(
     expense_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    expense = db.scalar(
-        select(Expense).where(Expense.id == expense_id, Expense.owner_id == current_user.id)
-    )
+    expense = await _get_owned_expense(db, current_user, expense_id)
     if not expense:
         raise HTTPException(status_code=404, detail="Expense not found")
-    db.query(ExpenseSplit).filter(ExpenseSplit.expense_id == expense.id).delete()
-    db.delete(expense)
-    db.commit()
-    return {"data": {"deleted": True}}
+    await apply_deltas(db, expense_deltas(expense, sign=-1))
+    await apply_rollup_deltas(db, rollup_deltas(expense, sign=-1))
+    await db.delete(expense)
+    await db.commit()
+    return ModelResponse(SuccessResponse[dict](data={"deleted": True}))
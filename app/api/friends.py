@@ -2,92 +2,118 @@ import uuid
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import Principal
 from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user, get_read_db
+from app.core.responses import ModelResponse
 from app.models.friend import Friend
-from app.models.user import User
 from app.schemas.common import SuccessListResponse, SuccessResponse
 from app.schemas.friend import FriendCreate, FriendOut, FriendUpdate
 from app.services.pagination import paginate
+from app.services.search import SearchSort, apply_search
 
 router = APIRouter(prefix="/friends", tags=["friends"])
 
 
 @router.post("", response_model=SuccessResponse[FriendOut])
-def create_friend(
+async def create_friend(
     payload: FriendCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     friend = Friend(owner_id=current_user.id, **payload.model_dump())
     db.add(friend)
-    db.commit()
-    db.refresh(friend)
-    return {"data": FriendOut.model_validate(friend)}
+    await db.commit()
+    await db.refresh(friend)
+    return ModelResponse(SuccessResponse[FriendOut](data=FriendOut.model_validate(friend)))
 
 
 @router.get("", response_model=SuccessListResponse[FriendOut])
-def list_friends(
+async def list_friends(
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None, description="next_cursor of a previous page; page is ignored when set"
+    ),
+    include_total: bool = True,
     name: str | None = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    sort: SearchSort = "recent",
+    etag: str = Depends(conditional_get("friends")),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     stmt = select(Friend).where(Friend.owner_id == current_user.id)
+    ranked = bool(name) and sort == "relevance"
     if name:
-        stmt = stmt.where(Friend.name.ilike(f"%{name}%"))
-    stmt = stmt.order_by(Friend.created_at.desc())
-    items, meta = paginate(db, stmt, page, limit)
-    return {"data": [FriendOut.model_validate(i) for i in items], "meta": meta}
+        stmt = apply_search(db, stmt, Friend.name, name, ranked)
+    stmt = stmt.order_by(Friend.created_at.desc(), Friend.id.desc())
+    items, meta = await paginate(
+        db,
+        stmt,
+        page,
+        limit,
+        keyset=() if ranked else (Friend.created_at, Friend.id),
+        cursor=cursor,
+        owner_id=current_user.id,
+        include_total=include_total,
+    )
+    return ModelResponse(
+        SuccessListResponse[FriendOut](
+            data=[FriendOut.model_validate(i) for i in items], meta=meta
+        ),
+        headers={"ETag": etag},
+    )
 
 
 @router.get("/{friend_id}", response_model=SuccessResponse[FriendOut])
-def get_friend(
+async def get_friend(
     friend_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    etag: str = Depends(conditional_get("friends", weak=False)),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    friend = db.scalar(
+    friend = await db.scalar(
         select(Friend).where(Friend.id == friend_id, Friend.owner_id == current_user.id)
     )
     if not friend:
         raise HTTPException(status_code=404, detail="Friend not found")
-    return {"data": FriendOut.model_validate(friend)}
+    return ModelResponse(
+        SuccessResponse[FriendOut](data=FriendOut.model_validate(friend)), headers={"ETag": etag}
+    )
 
 
 @router.patch("/{friend_id}", response_model=SuccessResponse[FriendOut])
-def update_friend(
+async def update_friend(
     friend_id: uuid.UUID,
     payload: FriendUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    friend = db.scalar(
+    friend = await db.scalar(
         select(Friend).where(Friend.id == friend_id, Friend.owner_id == current_user.id)
     )
     if not friend:
         raise HTTPException(status_code=404, detail="Friend not found")
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(friend, key, value)
-    db.commit()
-    db.refresh(friend)
-    return {"data": FriendOut.model_validate(friend)}
+    await db.commit()
+    await db.refresh(friend)
+    return ModelResponse(SuccessResponse[FriendOut](data=FriendOut.model_validate(friend)))
 
 
 @router.delete("/{friend_id}", response_model=SuccessResponse[dict])
-def delete_friend(
+async def delete_friend(
     friend_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    friend = db.scalar(
+    friend = await db.scalar(
         select(Friend).where(Friend.id == friend_id, Friend.owner_id == current_user.id)
     )
     if not friend:
         raise HTTPException(status_code=404, detail="Friend not found")
-    db.delete(friend)
-    db.commit()
-    return {"data": {"deleted": True}}
+    await db.delete(friend)
+    await db.commit()
+    return ModelResponse(SuccessResponse[dict](data={"deleted": True}))
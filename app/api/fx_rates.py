@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth_cache import Principal
+from app.core.database import get_db
+from app.core.deps import get_admin_user
+from app.core.responses import ModelResponse
+from app.schemas.common import SuccessResponse
+from app.services.fx_service import fx_cache, parse_rates_csv, upsert_rates
+
+router = APIRouter(prefix="/fx-rates", tags=["fx-rates"])
+
+
+@router.post("", response_model=SuccessResponse[dict])
+async def upload_fx_rates(
+    request: Request,
+    _: Principal = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    rows = parse_rates_csv((await request.body()).decode("utf-8-sig"))
+    await upsert_rates(db, rows)
+    await db.commit()
+    # Other processes pick up the new rates once their cached entries expire.
+    fx_cache.clear()
+    return ModelResponse(SuccessResponse[dict](data={"imported": len(rows)}))
@@ -1,96 +1,174 @@
 import uuid
+from collections import defaultdict
+from decimal import Decimal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.auth_cache import Principal
 from app.core.database import get_db
-from app.core.deps import get_current_user
+from app.core.deps import conditional_get, get_current_user, get_read_db
+from app.core.responses import ModelResponse
+from app.models.balance import Balance
+from app.models.enums import ParticipantType
 from app.models.group import Group
-from app.models.user import User
+from app.schemas.balance import SettlementOut
 from app.schemas.common import SuccessListResponse, SuccessResponse
 from app.schemas.group import GroupCreate, GroupOut, GroupUpdate
 from app.services.pagination import paginate
+from app.services.search import SearchSort, apply_search
+from app.services.settlement_service import simplify_debts
 
 router = APIRouter(prefix="/groups", tags=["groups"])
 
 
 @router.post("", response_model=SuccessResponse[GroupOut])
-def create_group(
+async def create_group(
     payload: GroupCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
     group = Group(owner_id=current_user.id, **payload.model_dump())
     db.add(group)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="Group name already exists")
-    db.refresh(group)
-    return {"data": GroupOut.model_validate(group)}
+    await db.refresh(group)
+    return ModelResponse(SuccessResponse[GroupOut](data=GroupOut.model_validate(group)))
 
 
 @router.get("", response_model=SuccessListResponse[GroupOut])
-def list_groups(
+async def list_groups(
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(
+        default=None, description="next_cursor of a previous page; page is ignored when set"
+    ),
+    include_total: bool = True,
     name: str | None = None,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    sort: SearchSort = "recent",
+    etag: str = Depends(conditional_get("groups")),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
     stmt = select(Group).where(Group.owner_id == current_user.id)
+    ranked = bool(name) and sort == "relevance"
     if name:
-        stmt = stmt.where(Group.name.ilike(f"%{name}%"))
-    stmt = stmt.order_by(Group.created_at.desc())
-    items, meta = paginate(db, stmt, page, limit)
-    return {"data": [GroupOut.model_validate(i) for i in items], "meta": meta}
+        stmt = apply_search(db, stmt, Group.name, name, ranked)
+    stmt = stmt.order_by(Group.created_at.desc(), Group.id.desc())
+    items, meta = await paginate(
+        db,
+        stmt,
+        page,
+        limit,
+        keyset=() if ranked else (Group.created_at, Group.id),
+        cursor=cursor,
+        owner_id=current_user.id,
+        include_total=include_total,
+    )
+    return ModelResponse(
+        SuccessListResponse[GroupOut](data=[GroupOut.model_validate(i) for i in items], meta=meta),
+        headers={"ETag": etag},
+    )
 
 
 @router.get("/{group_id}", response_model=SuccessResponse[GroupOut])
-def get_group(
+async def get_group(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    etag: str = Depends(conditional_get("groups", weak=False)),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
 ):
-    group = db.scalar(select(Group).where(Group.id == group_id, Group.owner_id == current_user.id))
+    group = await db.scalar(
+        select(Group).where(Group.id == group_id, Group.owner_id == current_user.id)
+    )
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
-    return {"data": GroupOut.model_validate(group)}
+    return ModelResponse(
+        SuccessResponse[GroupOut](data=GroupOut.model_validate(group)), headers={"ETag": etag}
+    )
 
 
 @router.patch("/{group_id}", response_model=SuccessResponse[GroupOut])
-def update_group(
+async def update_group(
     group_id: uuid.UUID,
     payload: GroupUpdate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    group = db.scalar(select(Group).where(Group.id == group_id, Group.owner_id == current_user.id))
+    group = await db.scalar(
+        select(Group).where(Group.id == group_id, Group.owner_id == current_user.id)
+    )
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
     for key, value in payload.model_dump(exclude_unset=True).items():
         setattr(group, key, value)
     try:
-        db.commit()
+        await db.commit()
     except IntegrityError:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=409, detail="Group name already exists")
-    db.refresh(group)
-    return {"data": GroupOut.model_validate(group)}
+    await db.refresh(group)
+    return ModelResponse(SuccessResponse[GroupOut](data=GroupOut.model_validate(group)))
 
 
 @router.delete("/{group_id}", response_model=SuccessResponse[dict])
-def delete_group(
+async def delete_group(
     group_id: uuid.UUID,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
 ):
-    group = db.scalar(select(Group).where(Group.id == group_id, Group.owner_id == current_user.id))
+    group = await db.scalar(
+        select(Group).where(Group.id == group_id, Group.owner_id == current_user.id)
+    )
     if not group:
         raise HTTPException(status_code=404, detail="Group not found")
-    db.delete(group)
-    db.commit()
-    return {"data": {"deleted": True}}
+    await db.delete(group)
+    await db.commit()
+    return ModelResponse(SuccessResponse[dict](data={"deleted": True}))
+
+
+@router.get("/{group_id}/settlements", response_model=SuccessResponse[list[SettlementOut]])
+async def get_group_settlements(
+    group_id: uuid.UUID,
+    etag: str = Depends(conditional_get("groups", "balances")),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    group = await db.scalar(
+        select(Group).where(Group.id == group_id, Group.owner_id == current_user.id)
+    )
+    if not group:
+        raise HTTPException(status_code=404, detail="Group not found")
+
+    rows = await db.execute(
+        select(
+            Balance.currency, Balance.counterparty_type, Balance.counterparty_id, Balance.amount
+        ).where(Balance.owner_id == current_user.id, Balance.group_id == group_id)
+    )
+    owner = (ParticipantType.user, current_user.id)
+    net_by_currency: dict[str, dict] = defaultdict(lambda: defaultdict(Decimal))
+    for currency, counterparty_type, counterparty_id, amount in rows:
+        net_by_currency[currency][owner] += amount
+        net_by_currency[currency][(counterparty_type, counterparty_id)] -= amount
+
+    settlements = []
+    for currency in sorted(net_by_currency):
+        for debtor, creditor, amount in simplify_debts(net_by_currency[currency]):
+            settlements.append(
+                SettlementOut(
+                    from_type=debtor[0],
+                    from_id=debtor[1],
+                    to_type=creditor[0],
+                    to_id=creditor[1],
+                    currency=currency,
+                    amount=amount,
+                )
+            )
+    return ModelResponse(
+        SuccessResponse[list[SettlementOut]](data=settlements), headers={"ETag": etag}
+    )
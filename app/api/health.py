@@ -1,8 +1,39 @@
 from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.auth_cache import principal_cache
+from app.core.database import engine
+from app.core.metrics import request_metrics
+from app.core.password_pool import password_pool
+from app.core.pool_stats import pool_status
 
 router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-def health():
+async def health():
     return {"data": {"status": "ok"}}
+
+
+@router.get("/health/db-pool")
+async def db_pool():
+    return {"data": pool_status(engine)}
+
+
+@router.get("/health/auth-cache")
+async def auth_cache():
+    return {"data": principal_cache.snapshot()}
+
+
+@router.get("/health/password-hashing")
+async def password_hashing():
+    return {"data": password_pool.snapshot()}
+
+
+class PrometheusResponse(PlainTextResponse):
+    media_type = "text/plain; version=0.0.4"
+
+
+@router.get("/metrics", response_class=PrometheusResponse)
+async def metrics():
+    return PrometheusResponse(request_metrics.render())
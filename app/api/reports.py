@@ -0,0 +1,36 @@
+import datetime as dt
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth_cache import Principal
+from app.core.deps import conditional_get, get_current_user, get_read_db
+from app.core.responses import ModelResponse
+from app.schemas.common import SuccessResponse
+from app.schemas.report import SpendOut
+from app.services.rollup_service import spend_report
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+
+@router.get("/spend", response_model=SuccessResponse[list[SpendOut]])
+async def spend(
+    granularity: Literal["month", "year"] = "month",
+    by: Literal["category", "group"] = "category",
+    date_from: dt.date | None = None,
+    date_to: dt.date | None = None,
+    currency: str | None = None,
+    target_currency: str | None = Query(default=None, min_length=3, max_length=3),
+    etag: str | None = Depends(conditional_get("spend_rollups", unless=("target_currency",))),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+):
+    rows = await spend_report(
+        db, current_user.id, granularity, by, date_from, date_to, currency, target_currency
+    )
+    return ModelResponse(
+        SuccessResponse[list[SpendOut]](data=[SpendOut(**row) for row in rows]),
+        exclude_unset=True,
+        headers={"ETag": etag} if etag else None,
+    )
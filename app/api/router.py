@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api import auth, categories, expenses, friends, groups
+from app.api import auth, balances, categories, expenses, friends, fx_rates, groups, reports
 
 api_router = APIRouter()
 api_router.include_router(auth.router)
@@ -8,3 +8,6 @@ api_router.include_router(friends.router)
 api_router.include_router(categories.router)
 api_router.include_router(groups.router)
 api_router.include_router(expenses.router)
+api_router.include_router(balances.router)
+api_router.include_router(reports.router)
+api_router.include_router(fx_rates.router)
@@ -0,0 +1,69 @@
+"""Maintenance commands: ``python -m app.cli <command>``."""
+
+import argparse
+import asyncio
+
+from app.core.database import SessionLocal, engine
+from app.services.balance_service import compute_balances, rebuild_balances, stored_balances
+from app.services.rollup_service import compute_rollups, rebuild_rollups, stored_rollups
+
+# command -> (label, compute from source, read stored, rebuild, help)
+DERIVED_TABLES = {
+    "rebuild-balances": (
+        "balances",
+        compute_balances,
+        stored_balances,
+        rebuild_balances,
+        "recompute the balances ledger from expense_splits",
+    ),
+    "rebuild-rollups": (
+        "spend rollups",
+        compute_rollups,
+        stored_rollups,
+        rebuild_rollups,
+        "recompute the monthly spend rollups from expenses",
+    ),
+}
+
+
+async def _rebuild(command: str, check: bool) -> int:
+    label, compute, stored_rows, rebuild, _ = DERIVED_TABLES[command]
+    async with SessionLocal() as db:
+        if check:
+            expected = await compute(db)
+            stored = await stored_rows(db)
+            mismatches = {
+                key: (stored.get(key), value)
+                for key in expected.keys() | stored.keys()
+                if stored.get(key) != (value := expected.get(key))
+            }
+            for key, (found, wanted) in sorted(mismatches.items(), key=str):
+                print(f"mismatch {key}: stored={found} expected={wanted}")
+            print(f"{len(expected)} {label} checked, {len(mismatches)} mismatches")
+            return 1 if mismatches else 0
+        count = await rebuild(db)
+        await db.commit()
+        print(f"{count} {label} rebuilt")
+        return 0
+
+
+async def _run(args: argparse.Namespace) -> int:
+    try:
+        return await _rebuild(args.command, args.check)
+    finally:
+        await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for command, (*_, help_text) in DERIVED_TABLES.items():
+        rebuild = commands.add_parser(command, help=help_text)
+        rebuild.add_argument(
+            "--check", action="store_true", help="only compare the table, do not rewrite it"
+        )
+    return asyncio.run(_run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,126 @@
+"""Bounded TTL/LRU cache for authenticated requests.
+
+Two maps are kept: decoded tokens (token -> user id, never past the token's own ``exp``)
+and lightweight principals (user id -> :class:`Principal`). A committed change to a user
+row drops that user's principal; ``ttl_seconds`` bounds staleness for writes made by other
+processes.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core import changes
+from app.core.config import settings
+from app.models.user import User
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: uuid.UUID
+    email: str
+    name: str
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, name=user.name, created_at=user.created_at)
+
+
+class PrincipalCache:
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._tokens: OrderedDict[str, tuple[float, uuid.UUID]] = OrderedDict()
+        self._principals: OrderedDict[uuid.UUID, tuple[float, Principal]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.stats = dict.fromkeys(
+            ("token_hits", "token_misses", "principal_hits", "principal_misses"), 0
+        )
+
+    def _get(self, store: OrderedDict, key, kind: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = store.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del store[key]
+                entry = None
+            if entry is None:
+                self.stats[f"{kind}_misses"] += 1
+                return None
+            store.move_to_end(key)
+            self.stats[f"{kind}_hits"] += 1
+            return entry[1]
+
+    def _put(self, store: OrderedDict, key, value, ttl: float) -> None:
+        if not self.enabled or ttl <= 0:
+            return
+        with self._lock:
+            store[key] = (time.monotonic() + ttl, value)
+            store.move_to_end(key)
+            while len(store) > self.max_entries:
+                store.popitem(last=False)
+
+    def get_token(self, token: str) -> uuid.UUID | None:
+        return self._get(self._tokens, token, "token")
+
+    def put_token(self, token: str, user_id: uuid.UUID, expires_at: float | None) -> None:
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+        self._put(self._tokens, token, user_id, ttl)
+
+    def get_principal(self, user_id: uuid.UUID) -> Principal | None:
+        return self._get(self._principals, user_id, "principal")
+
+    def put_principal(self, principal: Principal) -> None:
+        self._put(self._principals, principal.id, principal, self.ttl_seconds)
+
+    def invalidate(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._principals.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tokens.clear()
+            self._principals.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "tokens": len(self._tokens),
+                "principals": len(self._principals),
+                **self.stats,
+            }
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.auth_cache_max_entries,
+    ttl_seconds=settings.auth_cache_ttl_seconds,
+    enabled=settings.auth_cache_enabled,
+)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _mark_user(_mapper, _connection, user: User) -> None:
+    changes.mark(Session.object_session(user), User.__tablename__, user.id)
+
+
+@changes.on_commit
+def _invalidate(committed: set[changes.Change]) -> None:
+    for table, user_id in committed:
+        if table == User.__tablename__:
+            principal_cache.invalidate(user_id)
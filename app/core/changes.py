@@ -0,0 +1,54 @@
+"""Tracks which owner-scoped tables a session wrote to and notifies listeners on commit.
+
+Every flushed object with an ``owner_id`` is recorded as ``(table name, owner id)``. Once the
+transaction commits, the collected set is handed to the callbacks registered with
+:func:`on_commit`, which lets in-process caches drop entries that the write made stale.
+"""
+
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+Change = tuple[str, uuid.UUID]
+
+_INFO_KEY = "owner_changes"
+_listeners: list[Callable[[set[Change]], None]] = []
+
+
+def on_commit(listener: Callable[[set[Change]], None]):
+    _listeners.append(listener)
+    return listener
+
+
+def mark(session: Session, table: str, owner_id: uuid.UUID) -> None:
+    """Record a write that bypassed the unit of work (bulk UPDATE/DELETE, Core inserts)."""
+    session.info.setdefault(_INFO_KEY, set()).add((table, owner_id))
+
+
+def pending(session: Session) -> set[Change]:
+    """Writes recorded so far in the session's current transaction."""
+    return session.info.get(_INFO_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect(session: Session, _flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        owner_id = getattr(obj, "owner_id", None)
+        if owner_id is not None:
+            mark(session, obj.__table__.name, owner_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _dispatch(session: Session) -> None:
+    changes = session.info.pop(_INFO_KEY, None)
+    if not changes:
+        return
+    for listener in _listeners:
+        listener(changes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard(session: Session) -> None:
+    session.info.pop(_INFO_KEY, None)
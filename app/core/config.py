@@ -10,6 +10,34 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
     database_url: str = "postgresql+psycopg://postgres:postgres@db:5432/finance"
+    database_replica_url: str = ""
+    replica_read_your_writes_seconds: float = 10
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    count_cache_enabled: bool = True
+    count_cache_ttl_seconds: float = 30
+    count_cache_max_scopes: int = 10_000
+    count_estimate_threshold: int = 100_000
+    auth_cache_enabled: bool = True
+    auth_cache_ttl_seconds: float = 60
+    auth_cache_max_entries: int = 10_000
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_queue: int = 32
+    admin_emails: list[str] = []
+    fx_base_currency: str = "BRL"
+    fx_max_staleness_days: int = 7
+    fx_cache_ttl_seconds: float = 3600
+    fx_cache_max_entries: int = 50_000
+    idempotency_key_ttl_seconds: int = 86_400
+    idempotency_sweep_interval_seconds: float = 300
+    metrics_enabled: bool = True
+    sql_profile_header_enabled: bool = True
+    sql_profile_sample_rate: float = 0.0
+    slow_query_threshold_ms: float = 500
 
 
 settings = Settings()
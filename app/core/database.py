@@ -1,20 +1,61 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
 
+from app.core import metrics, profiling
 from app.core.config import settings
+from app.core.pool_stats import InstrumentedQueuePool
 
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, future=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+def engine_options(url: str) -> dict:
+    # SQLite (tests and local runs) keeps the dialect's own pool choice.
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+def _create_engine(url: str) -> AsyncEngine:
+    engine = create_async_engine(url, **engine_options(url))
+    if settings.metrics_enabled:
+        metrics.instrument_engine(engine)
+    profiling.instrument_engine(engine)
+    return engine
+
+
+engine = _create_engine(settings.database_url)
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+# Optional read replica; GET routes read from it through ``deps.get_read_db``.
+replica_engine = (
+    _create_engine(settings.database_replica_url) if settings.database_replica_url else None
+)
+ReplicaSessionLocal = (
+    async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False)
+    if replica_engine is not None
+    else None
+)
+
+
+async def get_db():
+    async with SessionLocal() as db:
+        yield db
+
+
+async def get_replica_db():
+    """Session on the read replica, or ``None`` when no replica is configured."""
+    if ReplicaSessionLocal is None:
+        yield None
+        return
+    async with ReplicaSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -1,19 +1,92 @@
-from fastapi import Depends, HTTPException, status
+import uuid
+
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.core.auth_cache import Principal, principal_cache
+from app.core.config import settings
+from app.core.database import get_db, get_replica_db
+from app.core.replica import recent_writers
 from app.core.security import decode_token
 from app.models.user import User
+from app.services.versions import collection_versions, etag_matches, make_etag
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/v1/auth/login")
 
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+def _credentials_error() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+
+
+def _token_user_id(token: str) -> uuid.UUID:
+    user_id = principal_cache.get_token(token)
+    if user_id is not None:
+        return user_id
     payload = decode_token(token)
     if not payload or "sub" not in payload:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    user = db.get(User, payload["sub"])
+        raise _credentials_error()
+    try:
+        user_id = uuid.UUID(payload["sub"])
+    except (TypeError, ValueError):
+        raise _credentials_error()
+    principal_cache.put_token(token, user_id, payload.get("exp"))
+    return user_id
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)
+) -> Principal:
+    user_id = _token_user_id(token)
+    principal = principal_cache.get_principal(user_id)
+    if principal is not None:
+        return principal
+    user = await db.get(User, user_id)
     if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    return user
+        raise _credentials_error()
+    principal = Principal.from_user(user)
+    principal_cache.put_principal(principal)
+    return principal
+
+
+async def get_read_db(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    replica: AsyncSession | None = Depends(get_replica_db),
+) -> AsyncSession:
+    """Session for read-only routes: the replica, unless the user has just written."""
+    if replica is None or recent_writers.wrote_recently(current_user.id):
+        return db
+    return replica
+
+
+async def get_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
+    if current_user.email not in settings.admin_emails:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
+
+
+def conditional_get(*collections: str, weak: bool = True, unless: tuple[str, ...] = ()):
+    """Dependency giving the ETag of a GET that reads ``collections`` of the current user.
+
+    Answers 304 straight away when ``If-None-Match`` matches. Lists use weak ETags and
+    single resources strong ones. Requests with any of the ``unless`` query parameters
+    depend on more than the collections and get no ETag (``None``). The versions are read
+    through :func:`get_read_db`, like the data, so an ETag never runs ahead of its body.
+    """
+
+    async def dependency(
+        request: Request,
+        current_user: Principal = Depends(get_current_user),
+        db: AsyncSession = Depends(get_read_db),
+    ) -> str | None:
+        if any(param in request.query_params for param in unless):
+            return None
+        versions = await collection_versions(db, current_user.id, collections)
+        target = f"{request.url.path}?{request.url.query}"
+        etag = make_etag(current_user.id, versions, target, weak)
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        return etag
+
+    return dependency
@@ -1,20 +1,28 @@
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 
 
-def error_response(code: str, message: str, details=None, status_code: int = 400):
+def error_response(code: str, message: str, details=None, status_code: int = 400, headers=None):
     payload = {"error": {"code": code, "message": message}}
     if details is not None:
         payload["error"]["details"] = details
-    return JSONResponse(status_code=status_code, content=payload)
+    return JSONResponse(status_code=status_code, content=payload, headers=headers)
 
 
 def install_exception_handlers(app: FastAPI):
     @app.exception_handler(HTTPException)
     async def http_exception_handler(_: Request, exc: HTTPException):
+        if exc.status_code == 304:
+            return Response(status_code=304, headers=exc.headers)
         detail = exc.detail if isinstance(exc.detail, str) else "Request failed"
-        return error_response("HTTP_ERROR", detail, status_code=exc.status_code)
+        return error_response(
+            "HTTP_ERROR",
+            detail,
+            details=getattr(exc, "details", None),
+            status_code=exc.status_code,
+            headers=exc.headers,
+        )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(_: Request, exc: RequestValidationError):
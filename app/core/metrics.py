@@ -0,0 +1,191 @@
+"""Per-route request metrics in the Prometheus text format.
+
+:class:`MetricsMiddleware` times every HTTP request and labels it with the matched route
+template (never the raw path, so ids do not multiply the series). Statements executed while
+a request is in flight are counted through engine events on the engines passed to
+:func:`instrument_engine`; the request's :class:`RequestTimer` travels in a context
+variable, which SQLAlchemy's async layer carries into the greenlet running the cursor.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DB_SECONDS_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+UNMATCHED_ROUTE = "unmatched"
+
+# (RouteStats attribute, metric name, help text)
+HISTOGRAMS = (
+    ("latency", "http_request_duration_seconds", "Time to send the full response."),
+    ("db_statements", "http_request_db_statements", "SQL statements executed per request."),
+    ("db_seconds", "http_request_db_seconds", "Time spent executing SQL per request."),
+)
+
+
+class RequestTimer:
+    """DB statements and time accumulated by one request."""
+
+    __slots__ = ("statements", "db_seconds", "_started")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self._started = 0.0
+
+
+_current: ContextVar[RequestTimer | None] = ContextVar("request_timer", default=None)
+
+
+class Histogram:
+    __slots__ = ("bounds", "buckets", "sum", "count")
+
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.buckets[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, name: str, labels: str) -> list[str]:
+        cumulative, lines = 0, []
+        for bound, count in zip((*self.bounds, "+Inf"), self.buckets, strict=True):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f"{name}_sum{{{labels}}} {self.sum}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
+
+
+class RouteStats:
+    __slots__ = ("responses", "latency", "db_statements", "db_seconds")
+
+    def __init__(self):
+        self.responses: dict[int, int] = {}
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.db_statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = Histogram(DB_SECONDS_BUCKETS)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class RequestMetrics:
+    """Request counters and histograms keyed by ``(method, route template)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._routes: dict[tuple[str, str], RouteStats] = {}
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, timer: RequestTimer
+    ) -> None:
+        with self._lock:
+            stats = self._routes.get((method, route))
+            if stats is None:
+                stats = self._routes[(method, route)] = RouteStats()
+            stats.responses[status] = stats.responses.get(status, 0) + 1
+            stats.latency.observe(seconds)
+            stats.db_statements.observe(timer.statements)
+            stats.db_seconds.observe(timer.db_seconds)
+
+    def render(self) -> str:
+        counts = [
+            "# HELP http_requests_total Requests handled, by route template and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        histograms = {
+            attr: [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for attr, name, help_text in HISTOGRAMS
+        }
+        with self._lock:
+            for (method, route), stats in sorted(self._routes.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                for status, count in sorted(stats.responses.items()):
+                    counts.append(f'http_requests_total{{{labels},status="{status}"}} {count}')
+                for attr, name, _ in HISTOGRAMS:
+                    histograms[attr].extend(getattr(stats, attr).lines(name, labels))
+        lines = [*counts, *(line for block in histograms.values() for line in block)]
+        return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timer = _current.get()
+    if timer is not None:
+        timer._started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timer = _current.get()
+    if timer is not None:
+        timer.statements += 1
+        timer.db_seconds += time.perf_counter() - timer._started
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attribute the statements ``engine`` executes to the request in flight."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def route_template(scope) -> str:
+    """The matched route's full path template, e.g. ``/v1/friends/{friend_id}``."""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    # Routes of an included router only know their path below the router's prefix: the
+    # prefix is the part of the request path in front of the segments the route matched.
+    segments = scope["path"].split("/")
+    prefix = "/".join(segments[: len(segments) - route.path.count("/")])
+    return prefix + route.path
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: no extra task or body buffering per request."""
+
+    def __init__(self, app, metrics: RequestMetrics = request_metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current.set(timer)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current.reset(token)
+            elapsed = time.perf_counter() - started
+            # The router records the matched route in the (shared) scope.
+            self.metrics.observe(scope["method"], route_template(scope), status, elapsed, timer)
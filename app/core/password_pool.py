@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class PasswordHashPool:
+    """Size-limited thread pool for bcrypt, kept apart from the request thread pool.
+
+    bcrypt releases the GIL while hashing, so a small dedicated pool caps how many CPU
+    cores a login burst can take without starving other handlers of worker threads.
+    At most ``workers + max_queue`` jobs may be pending; extra callers get a 503.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.completed = 0
+            self.rejected = 0
+            self.wait_seconds_sum = 0.0
+            self.run_seconds_sum = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+            return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many authentication requests, retry shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+        submitted = time.perf_counter()
+
+        def job() -> T:
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.completed += 1
+                    self.wait_seconds_sum += started - submitted
+                    self.run_seconds_sum += finished - started
+
+        try:
+            return await asyncio.wrap_future(self._get_executor().submit(job))
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            running = min(self._pending, self.workers)
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "running": running,
+                "queued": self._pending - running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "wait_seconds_sum": self.wait_seconds_sum,
+                "run_seconds_sum": self.run_seconds_sum,
+            }
+
+
+password_pool = PasswordHashPool(
+    workers=settings.password_hash_workers, max_queue=settings.password_hash_max_queue
+)
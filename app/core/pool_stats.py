@@ -0,0 +1,78 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolStats:
+    """Checkout counters and a wait-time histogram shared by every instrumented pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_seconds_sum = 0.0
+            self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_sum += seconds
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            cumulative, histogram = 0, {}
+            for bound, count in zip((*WAIT_BUCKETS, "+Inf"), self.wait_buckets, strict=True):
+                cumulative += count
+                histogram[str(bound)] = cumulative
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "wait_seconds_sum": self.wait_seconds_sum,
+                "wait_seconds_histogram": histogram,
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited and whether it timed out."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        finally:
+            pool_stats.observe_wait(time.perf_counter() - started)
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    status.update(pool_stats.snapshot())
+    return status
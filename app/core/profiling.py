@@ -0,0 +1,182 @@
+"""Opt-in per-request SQL profiling and a slow-query log.
+
+A request is profiled when it sends ``X-SQL-Profile: 1`` (if
+``SQL_PROFILE_HEADER_ENABLED``) or is picked by ``SQL_PROFILE_SAMPLE_RATE``. Every
+statement it runs is recorded with the shape of its parameters (types, never values), its
+row count and timing; the summary goes back in the ``X-SQL-Profile`` response header and
+the full list to the ``app.sql.profile`` logger.
+
+Independently of profiling, any statement slower than ``SLOW_QUERY_THRESHOLD_MS`` is
+logged to ``app.sql.slow`` with its plan, explained right away on the same connection so
+it sees the same transaction state.
+"""
+
+import json
+import logging
+import random
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+
+PROFILE_HEADER = b"x-sql-profile"
+# Statements EXPLAIN accepts; without ANALYZE it plans them but does not run them.
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+MAX_LISTED_PARAMS = 8
+
+profile_logger = logging.getLogger("app.sql.profile")
+slow_logger = logging.getLogger("app.sql.slow")
+
+_STARTED = "sql_profile_started"
+_EXPLAINING = "sql_profile_explaining"
+
+
+@dataclass(slots=True)
+class StatementRecord:
+    statement: str
+    params: str
+    rows: int
+    ms: float
+
+
+class SqlProfile:
+    """Statements recorded for one profiled request."""
+
+    def __init__(self):
+        self.statements: list[StatementRecord] = []
+
+    def summary(self) -> dict:
+        return {
+            "statements": len(self.statements),
+            "db_ms": round(sum(s.ms for s in self.statements), 3),
+            "slowest_ms": round(max((s.ms for s in self.statements), default=0.0), 3),
+        }
+
+    def header(self) -> str:
+        return "; ".join(f"{key}={value}" for key, value in self.summary().items())
+
+
+_profile: ContextVar[SqlProfile | None] = ContextVar("sql_profile", default=None)
+
+
+def param_shape(parameters, executemany: bool) -> str:
+    """Describe bound parameters by type, e.g. ``(id: UUID, limit: int)`` or ``500 x (...)``."""
+    if executemany:
+        return f"{len(parameters)} x {param_shape(parameters[0], False)}" if parameters else "[]"
+    if isinstance(parameters, dict):
+        names, values = list(parameters), list(parameters.values())
+    else:
+        names, values = None, list(parameters or ())
+    types = [type(v).__name__ for v in values]
+    if len(types) > MAX_LISTED_PARAMS:
+        counts = Counter(types)
+        return f"{len(types)} params: " + ", ".join(f"{n} {t}" for t, n in counts.most_common())
+    if names is not None:
+        return "(" + ", ".join(f"{n}: {t}" for n, t in zip(names, types, strict=True)) + ")"
+    return "(" + ", ".join(types) + ")"
+
+
+def explain(conn, statement: str, parameters) -> str:
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return "(not explainable)"
+    prefix = "EXPLAIN" if conn.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    conn.info[_EXPLAINING] = True
+    try:
+        # In a savepoint so a failed EXPLAIN leaves the request's transaction usable: the
+        # slow-query log must never fail the statement it reports on.
+        with conn.begin_nested():
+            rows = conn.exec_driver_sql(f"{prefix} {statement}", parameters).all()
+    except Exception:
+        slow_logger.exception("could not explain slow query: %s", statement)
+        return "(EXPLAIN failed)"
+    finally:
+        conn.info[_EXPLAINING] = False
+    return "\n".join(str(row[-1]) for row in rows)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info[_STARTED] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    ms = (time.perf_counter() - conn.info[_STARTED]) * 1000
+    if conn.info.get(_EXPLAINING):
+        return
+    profile = _profile.get()
+    if profile is not None:
+        profile.statements.append(
+            StatementRecord(statement, param_shape(parameters, executemany), cursor.rowcount, ms)
+        )
+    threshold = settings.slow_query_threshold_ms
+    if threshold and ms >= threshold:
+        shape = param_shape(parameters, executemany)
+        # An executemany has no single plan; the first row's plan is the representative one.
+        plan = explain(conn, statement, parameters[0] if executemany else parameters)
+        slow_logger.warning(
+            "slow query (%.1f ms): %s\nparams: %s\nplan:\n%s",
+            ms,
+            statement,
+            shape,
+            plan,
+            extra={"sql": statement, "params": shape, "ms": ms, "plan": plan},
+        )
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Time the statements ``engine`` executes for profiles and the slow-query log."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _wants_profile(scope) -> bool:
+    if settings.sql_profile_header_enabled:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER and value.strip() in (b"1", b"true"):
+                return True
+    rate = settings.sql_profile_sample_rate
+    return rate > 0 and random.random() < rate
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles the requests that opt in or are sampled."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = SqlProfile()
+        token = _profile.set(profile)
+
+        async def send_with_summary(message):
+            # Statements run while a streamed body is sent are only in the log record.
+            if message["type"] == "http.response.start":
+                headers = [
+                    *message.get("headers", []),
+                    (PROFILE_HEADER, profile.header().encode()),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_summary)
+        finally:
+            _profile.reset(token)
+            profile_logger.info(
+                "%s %s %s",
+                scope["method"],
+                scope["path"],
+                json.dumps(
+                    {**profile.summary(), "queries": [asdict(s) for s in profile.statements]}
+                ),
+            )
@@ -0,0 +1,49 @@
+"""Read-your-writes marker for replica routing.
+
+Every commit that touches an owner's rows marks that owner as a recent writer for
+``REPLICA_READ_YOUR_WRITES_SECONDS``; while marked, their reads stay on the primary so they
+never see a replica that has not caught up with their own write. The marker is
+per-process, like the other in-process caches: the window should exceed the replica lag.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from app.core import changes
+from app.core.config import settings
+
+
+class RecentWriters:
+    def __init__(self, window_seconds: float):
+        self.window_seconds = window_seconds
+        # Owner id -> expiry; touching moves an owner to the end, so expiries stay sorted.
+        self._until: OrderedDict[uuid.UUID, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def touch(self, owner_id: uuid.UUID) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._until[owner_id] = now + self.window_seconds
+            self._until.move_to_end(owner_id)
+            while self._until and next(iter(self._until.values())) <= now:
+                self._until.popitem(last=False)
+
+    def wrote_recently(self, owner_id: uuid.UUID) -> bool:
+        with self._lock:
+            until = self._until.get(owner_id)
+        return until is not None and until > time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._until.clear()
+
+
+recent_writers = RecentWriters(settings.replica_read_your_writes_seconds)
+
+
+@changes.on_commit
+def _touch_writers(committed: set[changes.Change]) -> None:
+    for owner_id in {owner_id for _, owner_id in committed}:
+        recent_writers.touch(owner_id)
@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+
+class ModelResponse(Response):
+    """JSON response rendered once, straight from a Pydantic model with ``model_dump_json``.
+
+    Returning it from a route skips FastAPI's second validation and serialization of the
+    returned value against ``response_model``, which stays on the route for the OpenAPI
+    schema. The body is byte-for-byte what that path would have produced.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: BaseModel,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        background: BackgroundTask | None = None,
+        exclude_unset: bool = False,
+    ):
+        self.exclude_unset = exclude_unset
+        super().__init__(content, status_code=status_code, headers=headers, background=background)
+
+    def render(self, content: BaseModel) -> bytes:
+        return content.model_dump_json(by_alias=True, exclude_unset=self.exclude_unset).encode()
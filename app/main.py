@@ -1,12 +1,37 @@
+import asyncio
+import contextlib
+
 from fastapi import FastAPI
 
 from app.api.health import router as health_router
 from app.api.router import api_router
 from app.core.config import settings
+from app.core.database import SessionLocal
 from app.core.errors import install_exception_handlers
+from app.core.metrics import MetricsMiddleware
+from app.core.profiling import ProfilingMiddleware
+from app.services.idempotency import run_sweeper
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_: FastAPI):
+    sweeper = None
+    if settings.idempotency_sweep_interval_seconds > 0:
+        sweeper = asyncio.create_task(
+            run_sweeper(SessionLocal, settings.idempotency_sweep_interval_seconds)
+        )
+    yield
+    if sweeper is not None:
+        sweeper.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await sweeper
+
 
-app = FastAPI(title=settings.app_name)
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 install_exception_handlers(app)
+app.add_middleware(ProfilingMiddleware)
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
 
 app.include_router(health_router)
 app.include_router(api_router, prefix=settings.api_prefix)
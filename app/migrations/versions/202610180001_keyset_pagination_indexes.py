@@ -0,0 +1,38 @@
+"""keyset pagination indexes
+
+Revision ID: 202610180001
+Revises: 202602110001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "202610180001"
+down_revision = "202602110001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_friends_owner_created_at_id", "friends", ["owner_id", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_categories_owner_created_at_id",
+        "categories",
+        ["owner_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_groups_owner_created_at_id", "groups", ["owner_id", "created_at", "id"], unique=False
+    )
+    op.create_index(
+        "ix_expenses_owner_date_id", "expenses", ["owner_id", "date", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_expenses_owner_date_id", table_name="expenses")
+    op.drop_index("ix_groups_owner_created_at_id", table_name="groups")
+    op.drop_index("ix_categories_owner_created_at_id", table_name="categories")
+    op.drop_index("ix_friends_owner_created_at_id", table_name="friends")
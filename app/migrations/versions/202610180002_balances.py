@@ -0,0 +1,52 @@
+"""balances ledger
+
+Revision ID: 202610180002
+Revises: 202610180001
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "202610180002"
+down_revision = "202610180001"
+branch_labels = None
+depends_on = None
+
+
+participant_type_enum = postgresql.ENUM(
+    "user", "friend", name="participant_type_enum", create_type=False
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "balances",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column("counterparty_type", participant_type_enum, nullable=False),
+        sa.Column("counterparty_id", sa.Uuid(), nullable=False),
+        sa.Column("group_id", sa.Uuid(), nullable=True),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_balances_owner_id"), "balances", ["owner_id"], unique=False)
+    op.create_index(
+        "uq_balances_scope",
+        "balances",
+        ["owner_id", "counterparty_type", "counterparty_id", "group_id", "currency"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_balances_scope", table_name="balances")
+    op.drop_index(op.f("ix_balances_owner_id"), table_name="balances")
+    op.drop_table("balances")
@@ -0,0 +1,66 @@
+"""search indexes
+
+Revision ID: 202610180003
+Revises: 202610180002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+revision = "202610180003"
+down_revision = "202610180002"
+branch_labels = None
+depends_on = None
+
+SEARCHABLE = (
+    ("expenses", "description"),
+    ("friends", "name"),
+    ("groups", "name"),
+    ("categories", "name"),
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for table, column in SEARCHABLE:
+            fts = f"{table}_fts"
+            op.execute(
+                f"CREATE VIRTUAL TABLE {fts} USING fts5(id UNINDEXED, {column}, tokenize='trigram')"
+            )
+            op.execute(f"INSERT INTO {fts}(id, {column}) SELECT id, {column} FROM {table}")
+            op.execute(
+                f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN "
+                f"INSERT INTO {fts}(id, {column}) VALUES (new.id, new.{column}); END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN "
+                f"DELETE FROM {fts} WHERE id = old.id; END"
+            )
+            op.execute(
+                f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {column} ON {table} BEGIN "
+                f"UPDATE {fts} SET {column} = new.{column} WHERE id = old.id; END"
+            )
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for table, column in SEARCHABLE:
+        op.create_index(
+            f"ix_{table}_{column}_trgm",
+            table,
+            [column],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for table, _ in reversed(SEARCHABLE):
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+            for suffix in ("ai", "ad", "au"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}")
+        return
+
+    for table, column in reversed(SEARCHABLE):
+        op.drop_index(f"ix_{table}_{column}_trgm", table_name=table)
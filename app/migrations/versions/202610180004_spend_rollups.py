@@ -0,0 +1,45 @@
+"""spend rollups
+
+Revision ID: 202610180004
+Revises: 202610180003
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "202610180004"
+down_revision = "202610180003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "spend_rollups",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column("period", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Uuid(), nullable=True),
+        sa.Column("group_id", sa.Uuid(), nullable=True),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("amount", sa.Numeric(14, 2), nullable=False),
+        sa.Column("expense_count", sa.Integer(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.ForeignKeyConstraint(["owner_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "uq_spend_rollups_scope",
+        "spend_rollups",
+        ["owner_id", "period", "category_id", "group_id", "currency"],
+        unique=True,
+        postgresql_nulls_not_distinct=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_spend_rollups_scope", table_name="spend_rollups")
+    op.drop_table("spend_rollups")
@@ -0,0 +1,33 @@
+"""fx rates
+
+Revision ID: 202610180005
+Revises: 202610180004
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "202610180005"
+down_revision = "202610180004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fx_rates",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("currency", sa.String(length=3), nullable=False),
+        sa.Column("rate_date", sa.Date(), nullable=False),
+        sa.Column("rate", sa.Numeric(18, 8), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("currency", "rate_date", name="uq_fx_rates_currency_date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("fx_rates")
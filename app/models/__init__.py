@@ -1,8 +1,25 @@
+from app.models.balance import Balance
 from app.models.category import Category
+from app.models.collection_version import CollectionVersion
 from app.models.expense import Expense
 from app.models.expense_split import ExpenseSplit
 from app.models.friend import Friend
+from app.models.fx_rate import FxRate
 from app.models.group import Group
+from app.models.idempotency_key import IdempotencyKey
+from app.models.spend_rollup import SpendRollup
 from app.models.user import User
 
-__all__ = ["User", "Friend", "Category", "Group", "Expense", "ExpenseSplit"]
+__all__ = [
+    "User",
+    "Friend",
+    "Category",
+    "Group",
+    "Expense",
+    "ExpenseSplit",
+    "Balance",
+    "SpendRollup",
+    "FxRate",
+    "CollectionVersion",
+    "IdempotencyKey",
+]
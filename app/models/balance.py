@@ -0,0 +1,40 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, Numeric, String, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+from app.models.enums import ParticipantType
+
+
+class Balance(Base):
+    __tablename__ = "balances"
+    __table_args__ = (
+        Index(
+            "uq_balances_scope",
+            "owner_id",
+            "counterparty_type",
+            "counterparty_id",
+            "group_id",
+            "currency",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id"), index=True)
+    counterparty_type: Mapped[ParticipantType] = mapped_column(
+        Enum(ParticipantType, name="participant_type_enum")
+    )
+    counterparty_id: Mapped[uuid.UUID] = mapped_column(Uuid)
+    # Not a foreign key: a settled group must stay deletable while its zeroed rows remain.
+    group_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True)
+    currency: Mapped[str] = mapped_column(String(3))
+    # Positive when the counterparty owes the owner.
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=Decimal("0"))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
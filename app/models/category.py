@@ -1,18 +1,26 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, UniqueConstraint, Uuid, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, UniqueConstraint, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+from app.models.search import install_fts, trigram_index
 
 
 class Category(Base):
     __tablename__ = "categories"
-    __table_args__ = (UniqueConstraint("owner_id", "name", name="uq_category_owner_name"),)
+    __table_args__ = (
+        UniqueConstraint("owner_id", "name", name="uq_category_owner_name"),
+        Index("ix_categories_owner_created_at_id", "owner_id", "created_at", "id"),
+        trigram_index("ix_categories_name_trgm", "name"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     owner_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id"), index=True)
     name: Mapped[str] = mapped_column(String(120), index=True)
     color: Mapped[str | None] = mapped_column(String(20), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+install_fts(Category.__table__, "name")
@@ -0,0 +1,25 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, String, UniqueConstraint, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class CollectionVersion(Base):
+    """Write counter of one owner's collection; conditional GETs derive their ETags from it."""
+
+    __tablename__ = "collection_versions"
+    __table_args__ = (
+        UniqueConstraint("owner_id", "collection", name="uq_collection_versions_scope"),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id"))
+    # Table name of the collection.
+    collection: Mapped[str] = mapped_column(String(50))
+    version: Mapped[int] = mapped_column(BigInteger, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
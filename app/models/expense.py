@@ -1,16 +1,25 @@
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, DateTime, Enum, ForeignKey, Numeric, String, Uuid, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Date, DateTime, Enum, ForeignKey, Index, Numeric, String, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 from app.models.enums import SplitType
+from app.models.search import install_fts, trigram_index
+
+if TYPE_CHECKING:
+    from app.models.expense_split import ExpenseSplit
 
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (
+        Index("ix_expenses_owner_date_id", "owner_id", "date", "id"),
+        trigram_index("ix_expenses_description_trgm", "description"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     owner_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id"), index=True)
@@ -24,3 +33,11 @@ class Expense(Base):
     group_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, ForeignKey("groups.id"), nullable=True)
     split_type: Mapped[SplitType] = mapped_column(Enum(SplitType, name="split_type_enum"))
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    splits: Mapped[list["ExpenseSplit"]] = relationship(
+        back_populates="expense",
+        cascade="all, delete-orphan",
+    )
+
+
+install_fts(Expense.__table__, "description")
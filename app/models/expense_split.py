@@ -1,13 +1,17 @@
 import uuid
 from datetime import datetime
 from decimal import Decimal
+from typing import TYPE_CHECKING
 
 from sqlalchemy import DateTime, Enum, ForeignKey, Numeric, Uuid, func
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
 from app.models.enums import ParticipantType
 
+if TYPE_CHECKING:
+    from app.models.expense import Expense
+
 
 class ExpenseSplit(Base):
     __tablename__ = "expense_splits"
@@ -28,3 +32,5 @@ class ExpenseSplit(Base):
     share_amount: Mapped[Decimal] = mapped_column(Numeric(12, 2))
     share_percentage: Mapped[Decimal | None] = mapped_column(Numeric(7, 4), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    expense: Mapped["Expense"] = relationship(back_populates="splits")
@@ -1,18 +1,26 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, String, Text, UniqueConstraint, Uuid, func
+from sqlalchemy import DateTime, ForeignKey, Index, String, Text, UniqueConstraint, Uuid, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
+from app.models.search import install_fts, trigram_index
 
 
 class Group(Base):
     __tablename__ = "groups"
-    __table_args__ = (UniqueConstraint("owner_id", "name", name="uq_group_owner_name"),)
+    __table_args__ = (
+        UniqueConstraint("owner_id", "name", name="uq_group_owner_name"),
+        Index("ix_groups_owner_created_at_id", "owner_id", "created_at", "id"),
+        trigram_index("ix_groups_name_trgm", "name"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     owner_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id"), index=True)
     name: Mapped[str] = mapped_column(String(120), index=True)
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+install_fts(Group.__table__, "name")
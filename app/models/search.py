@@ -0,0 +1,45 @@
+"""Database objects backing substring search on names and descriptions.
+
+Postgres gets ``pg_trgm`` GIN indexes, which serve ``ILIKE '%q%'`` directly. SQLite has no
+trigram index type, so each searchable table gets an FTS5 shadow table using the
+``trigram`` tokenizer, kept in sync by triggers.
+"""
+
+from sqlalchemy import DDL, Index, Table, event
+
+from app.core.database import Base
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
+def fts_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+
+def trigram_index(name: str, column: str) -> Index:
+    return Index(
+        name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"}
+    ).ddl_if(dialect="postgresql")
+
+
+def install_fts(table: Table, column: str) -> None:
+    """Create ``<table>_fts(id, <column>)`` and its sync triggers along with ``table`` on SQLite."""
+    name, fts = table.name, fts_table_name(table.name)
+    statements = [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5(id UNINDEXED, {column}, tokenize='trigram')",
+        f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {name} BEGIN "
+        f"INSERT INTO {fts}(id, {column}) VALUES (new.id, new.{column}); END",
+        f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {name} BEGIN "
+        f"DELETE FROM {fts} WHERE id = old.id; END",
+        f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {column} ON {name} BEGIN "
+        f"UPDATE {fts} SET {column} = new.{column} WHERE id = old.id; END",
+    ]
+    for statement in statements:
+        event.listen(table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+    event.listen(
+        table, "after_drop", DDL(f"DROP TABLE IF EXISTS {fts}").execute_if(dialect="sqlite")
+    )
@@ -0,0 +1,40 @@
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Uuid, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class SpendRollup(Base):
+    """Monthly spend per owner, category, group and currency, kept in step with expenses."""
+
+    __tablename__ = "spend_rollups"
+    __table_args__ = (
+        Index(
+            "uq_spend_rollups_scope",
+            "owner_id",
+            "period",
+            "category_id",
+            "group_id",
+            "currency",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    owner_id: Mapped[uuid.UUID] = mapped_column(Uuid, ForeignKey("users.id"))
+    # First day of the month.
+    period: Mapped[date] = mapped_column(Date)
+    # Not foreign keys, as in balances: deleting a category or group must not be blocked.
+    category_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True)
+    group_id: Mapped[uuid.UUID | None] = mapped_column(Uuid, nullable=True)
+    currency: Mapped[str] = mapped_column(String(3))
+    amount: Mapped[Decimal] = mapped_column(Numeric(14, 2), default=Decimal("0"))
+    expense_count: Mapped[int] = mapped_column(Integer, default=0)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
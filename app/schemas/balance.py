@@ -0,0 +1,23 @@
+import uuid
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from app.models.enums import ParticipantType
+
+
+class BalanceOut(BaseModel):
+    counterparty_type: ParticipantType
+    counterparty_id: uuid.UUID
+    group_id: uuid.UUID | None = None
+    currency: str
+    amount: Decimal
+
+
+class SettlementOut(BaseModel):
+    from_type: ParticipantType
+    from_id: uuid.UUID
+    to_type: ParticipantType
+    to_id: uuid.UUID
+    currency: str
+    amount: Decimal
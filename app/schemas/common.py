@@ -1,4 +1,4 @@
-from typing import Generic, TypeVar
+from typing import Generic, Literal, TypeVar
 
 from pydantic import BaseModel, ConfigDict
 
@@ -6,9 +6,11 @@ T = TypeVar("T")
 
 
 class PaginationMeta(BaseModel):
-    total: int
-    page: int
+    total: int | None
+    total_kind: Literal["exact", "estimated", "omitted"] = "exact"
+    page: int | None
     limit: int
+    next_cursor: str | None = None
 
 
 class SuccessResponse(BaseModel, Generic[T]):
@@ -1,6 +1,7 @@
 import uuid
 import datetime as dt
 from decimal import Decimal
+from typing import Annotated, Literal
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -75,3 +76,53 @@ class ExpenseOut(ORMBase):
     split_type: SplitType
     created_at: dt.datetime
     splits: list[ExpenseSplitOut]
+
+
+class ExpenseImportError(BaseModel):
+    row: int
+    errors: list[str]
+
+
+class ExpenseImportOut(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ExpenseImportError]
+
+
+MAX_BATCH_OPERATIONS = 1000
+
+
+class ExpenseBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: ExpenseCreate
+
+
+class ExpenseBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: uuid.UUID
+    data: ExpenseUpdate
+
+
+class ExpenseBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: uuid.UUID
+
+
+ExpenseBatchOperation = Annotated[
+    ExpenseBatchCreate | ExpenseBatchUpdate | ExpenseBatchDelete, Field(discriminator="op")
+]
+
+
+class ExpenseBatchIn(BaseModel):
+    operations: list[ExpenseBatchOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class ExpenseBatchResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    id: uuid.UUID
+    status: Literal["created", "updated", "deleted"]
+
+
+class ExpenseBatchOut(BaseModel):
+    results: list[ExpenseBatchResult]
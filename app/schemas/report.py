@@ -0,0 +1,14 @@
+import datetime as dt
+import uuid
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+
+class SpendOut(BaseModel):
+    period: dt.date
+    category_id: uuid.UUID | None = None
+    group_id: uuid.UUID | None = None
+    currency: str
+    amount: Decimal
+    expenses: int
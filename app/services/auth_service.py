@@ -1,30 +1,40 @@
 from fastapi import HTTPException, status
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import create_access_token, get_password_hash, verify_password
+from app.core.password_pool import password_pool
+from app.core.security import create_access_token, get_password_hash, verify_and_update_password
 from app.models.user import User
 from app.schemas.auth import LoginIn, RegisterIn
 
 
-def register_user(db: Session, payload: RegisterIn):
-    existing = db.scalar(select(User).where(User.email == payload.email))
+async def register_user(db: AsyncSession, payload: RegisterIn):
+    existing = await db.scalar(select(User).where(User.email == payload.email))
     if existing:
         raise HTTPException(status_code=409, detail="Email already registered")
     user = User(
         email=payload.email,
         name=payload.name,
-        password_hash=get_password_hash(payload.password),
+        password_hash=await password_pool.run(get_password_hash, payload.password),
     )
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     token = create_access_token(str(user.id))
     return token, user
 
 
-def login_user(db: Session, payload: LoginIn):
-    user = db.scalar(select(User).where(User.email == payload.email))
-    if not user or not verify_password(payload.password, user.password_hash):
+async def login_user(db: AsyncSession, payload: LoginIn):
+    user = await db.scalar(select(User).where(User.email == payload.email))
+    if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    valid, new_hash = await password_pool.run(
+        verify_and_update_password, payload.password, user.password_hash
+    )
+    if not valid:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+    if new_hash:
+        # The stored hash used an outdated cost factor; upgrade it while we know the password.
+        user.password_hash = new_hash
+        await db.commit()
     return create_access_token(str(user.id))
@@ -0,0 +1,126 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, literal, or_, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.balance import Balance
+from app.models.enums import ParticipantType
+from app.models.expense import Expense
+from app.models.expense_split import ExpenseSplit
+from app.services.ledger import add_to_rows
+
+# (owner_id, counterparty_type, counterparty_id, group_id, currency)
+BalanceKey = tuple[uuid.UUID, ParticipantType, uuid.UUID, uuid.UUID | None, str]
+KEY_COLUMNS = ("owner_id", "counterparty_type", "counterparty_id", "group_id", "currency")
+
+
+def expense_deltas(
+    expense: Expense, sign: int = 1, into: dict[BalanceKey, Decimal] | None = None
+) -> dict[BalanceKey, Decimal]:
+    """Add the balance changes caused by ``expense`` (or by removing it, with ``sign=-1``).
+
+    The owner paid the whole expense, so every other participant owes the owner its share.
+    A registered user participant also sees the mirrored debt in its own ledger.
+    """
+    deltas = into if into is not None else defaultdict(Decimal)
+    for split in expense.splits:
+        amount = split.share_amount * sign
+        if split.participant_type == ParticipantType.friend:
+            counterparty_id = split.participant_friend_id
+        elif split.participant_user_id == expense.owner_id:
+            continue
+        else:
+            counterparty_id = split.participant_user_id
+            mirror = (
+                counterparty_id,
+                ParticipantType.user,
+                expense.owner_id,
+                expense.group_id,
+                expense.currency,
+            )
+            deltas[mirror] -= amount
+        key = (
+            expense.owner_id,
+            split.participant_type,
+            counterparty_id,
+            expense.group_id,
+            expense.currency,
+        )
+        deltas[key] += amount
+    return deltas
+
+
+def _row(key: BalanceKey, amount: Decimal) -> dict:
+    return {"id": uuid.uuid4(), **dict(zip(KEY_COLUMNS, key, strict=True)), "amount": amount}
+
+
+async def apply_deltas(db: AsyncSession, deltas: dict[BalanceKey, Decimal]) -> None:
+    """Add ``deltas`` to the ledger inside the caller's transaction."""
+    await add_to_rows(db, Balance, KEY_COLUMNS, {k: {"amount": v} for k, v in deltas.items()})
+
+
+def _computed_balances():
+    counterparty_id = func.coalesce(
+        ExpenseSplit.participant_user_id, ExpenseSplit.participant_friend_id
+    )
+    owner_side = (
+        select(
+            Expense.owner_id.label("owner_id"),
+            ExpenseSplit.participant_type.label("counterparty_type"),
+            counterparty_id.label("counterparty_id"),
+            Expense.group_id.label("group_id"),
+            Expense.currency.label("currency"),
+            ExpenseSplit.share_amount.label("amount"),
+        )
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .where(
+            or_(
+                ExpenseSplit.participant_user_id.is_(None),
+                ExpenseSplit.participant_user_id != Expense.owner_id,
+            )
+        )
+    )
+    mirror_side = (
+        select(
+            ExpenseSplit.participant_user_id,
+            literal(ParticipantType.user, Balance.counterparty_type.type),
+            Expense.owner_id,
+            Expense.group_id,
+            Expense.currency,
+            -ExpenseSplit.share_amount,
+        )
+        .join(Expense, Expense.id == ExpenseSplit.expense_id)
+        .where(
+            ExpenseSplit.participant_type == ParticipantType.user,
+            ExpenseSplit.participant_user_id != Expense.owner_id,
+        )
+    )
+    ledger = union_all(owner_side, mirror_side).subquery()
+    keys = [ledger.c[column] for column in KEY_COLUMNS]
+    return select(*keys, func.sum(ledger.c.amount)).group_by(*keys)
+
+
+async def compute_balances(db: AsyncSession) -> dict[BalanceKey, Decimal]:
+    """Recompute the whole ledger from ``expense_splits``."""
+    rows = await db.execute(_computed_balances())
+    return {
+        (owner, ParticipantType(cp_type), cp_id, group_id, currency): Decimal(amount)
+        for owner, cp_type, cp_id, group_id, currency, amount in rows
+        if amount
+    }
+
+
+async def stored_balances(db: AsyncSession) -> dict[BalanceKey, Decimal]:
+    rows = await db.execute(select(*(getattr(Balance, c) for c in KEY_COLUMNS), Balance.amount))
+    return {tuple(row[:-1]): row[-1] for row in rows if row[-1]}
+
+
+async def rebuild_balances(db: AsyncSession) -> int:
+    """Replace the ledger with balances recomputed from ``expense_splits``."""
+    computed = await compute_balances(db)
+    await db.execute(delete(Balance))
+    if computed:
+        await db.execute(insert(Balance), [_row(k, v) for k, v in computed.items()])
+    return len(computed)
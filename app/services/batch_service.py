@@ -0,0 +1,243 @@
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core import changes
+from app.models.category import Category
+from app.models.expense import Expense
+from app.models.expense_split import ExpenseSplit
+from app.models.group import Group
+from app.schemas.expense import (
+    ExpenseBatchCreate,
+    ExpenseBatchDelete,
+    ExpenseBatchOperation,
+)
+from app.services.balance_service import apply_deltas, expense_deltas
+from app.services.ownership import owned_ids
+from app.services.rollup_service import apply_rollup_deltas, rollup_accumulator, rollup_deltas
+from app.services.split_service import compute_splits, load_participants, participant_errors
+
+# Expense columns an update operation may change.
+FIELDS = ("description", "amount", "currency", "date", "category_id", "group_id", "split_type")
+
+
+class BatchValidationError(HTTPException):
+    """422 listing the problems of each failed operation, keyed by its index in the batch."""
+
+    def __init__(self, errors: dict[int, list[str]]):
+        super().__init__(status_code=422, detail="Batch rejected; nothing was written")
+        self.details = [{"index": index, "errors": msgs} for index, msgs in sorted(errors.items())]
+
+
+def _split_rows(expense_id: uuid.UUID, computed) -> list[dict]:
+    return [
+        {
+            "id": uuid.uuid4(),
+            "expense_id": expense_id,
+            "participant_type": c["split"].participant_type,
+            "participant_user_id": c["split"].user_id,
+            "participant_friend_id": c["split"].friend_id,
+            "share_amount": c["amount"],
+            "share_percentage": c["percentage"],
+        }
+        for c in computed
+    ]
+
+
+def _as_expense(values: dict, split_rows: list[dict]) -> SimpleNamespace:
+    return SimpleNamespace(**values, splits=[SimpleNamespace(**s) for s in split_rows])
+
+
+class ExpenseBatch:
+    """Validates a whole batch up front, then writes it with set-based statements.
+
+    Targets, categories, groups and split participants are each loaded with one query for
+    the whole batch. Updates that change the same columns to the same values share one
+    ``UPDATE ... WHERE id IN``; deletes and replaced splits are removed with one ``DELETE``
+    each, and new rows go in with multi-row INSERTs. Any invalid operation rejects the
+    batch before anything is written.
+    """
+
+    def __init__(self, db: AsyncSession, owner_id: uuid.UUID):
+        self.db = db
+        self.owner_id = owner_id
+        self.errors: dict[int, list[str]] = defaultdict(list)
+
+    async def _load_targets(self, operations: list[ExpenseBatchOperation]) -> dict:
+        ids = {op.id for op in operations if not isinstance(op, ExpenseBatchCreate)}
+        if not ids:
+            return {}
+        expenses = await self.db.scalars(
+            select(Expense)
+            .where(Expense.owner_id == self.owner_id, Expense.id.in_(ids))
+            .options(selectinload(Expense.splits))
+        )
+        return {expense.id: expense for expense in expenses}
+
+    async def _owned_refs(self, operations: list[ExpenseBatchOperation]) -> tuple[set, set]:
+        categories, groups = set(), set()
+        for op in operations:
+            if isinstance(op, ExpenseBatchDelete):
+                continue
+            categories.add(op.data.category_id)
+            groups.add(op.data.group_id)
+        categories.discard(None)
+        groups.discard(None)
+        return (
+            await owned_ids(self.db, Category, self.owner_id, categories),
+            await owned_ids(self.db, Group, self.owner_id, groups),
+        )
+
+    def _check_refs(self, index: int, values: dict, categories: set, groups: set) -> None:
+        if values.get("category_id") and values["category_id"] not in categories:
+            self.errors[index].append("Invalid category_id")
+        if values.get("group_id") and values["group_id"] not in groups:
+            self.errors[index].append("Invalid group_id")
+
+    def _compute(self, index: int, amount, split_type, splits, users, friends):
+        if not splits:
+            self.errors[index].append("Split must have at least one participant")
+            return None
+        split_errors = participant_errors(splits, split_type, users, friends)
+        if split_errors:
+            self.errors[index] += [
+                f"splits.{idx}: {msg}" for idx, msgs in split_errors.items() for msg in msgs
+            ]
+            return None
+        try:
+            return compute_splits(amount, split_type, splits)
+        except HTTPException as exc:
+            self.errors[index].append(exc.detail)
+            return None
+
+    async def run(self, operations: list[ExpenseBatchOperation]) -> list[dict]:
+        targets = await self._load_targets(operations)
+        categories, groups = await self._owned_refs(operations)
+        users, friends = await load_participants(
+            self.db,
+            self.owner_id,
+            [
+                s
+                for op in operations
+                if not isinstance(op, ExpenseBatchDelete)
+                for s in op.data.splits or ()
+            ],
+        )
+
+        results = []
+        expense_rows, split_rows = [], []
+        updates: dict[tuple, list[uuid.UUID]] = defaultdict(list)
+        replaced_splits, deleted = [], []
+        deltas = defaultdict(Decimal)
+        rollups = rollup_accumulator()
+        seen: set[uuid.UUID] = set()
+
+        for index, op in enumerate(operations):
+            if isinstance(op, ExpenseBatchCreate):
+                payload = op.data
+                self._check_refs(index, payload.model_dump(), categories, groups)
+                computed = self._compute(
+                    index, payload.amount, payload.split_type, payload.splits, users, friends
+                )
+                if index in self.errors:
+                    continue
+                expense_id = uuid.uuid4()
+                values = {
+                    "id": expense_id,
+                    "owner_id": self.owner_id,
+                    **payload.model_dump(exclude={"splits"}),
+                }
+                splits = _split_rows(expense_id, computed)
+                expense_rows.append(values)
+                split_rows.extend(splits)
+                written = _as_expense(values, splits)
+                expense_deltas(written, into=deltas)
+                rollup_deltas(written, into=rollups)
+                results.append({"index": index, "op": op.op, "id": expense_id, "status": "created"})
+                continue
+
+            expense = targets.get(op.id)
+            if expense is None:
+                self.errors[index].append("Expense not found")
+                continue
+            if op.id in seen:
+                self.errors[index].append("Expense appears in more than one operation")
+                continue
+            seen.add(op.id)
+
+            if isinstance(op, ExpenseBatchDelete):
+                deleted.append(op.id)
+                expense_deltas(expense, sign=-1, into=deltas)
+                rollup_deltas(expense, sign=-1, into=rollups)
+                results.append({"index": index, "op": op.op, "id": op.id, "status": "deleted"})
+                continue
+
+            # Same semantics as PATCH /expenses/{id}: unset fields keep their value and the
+            # splits are only replaced when the operation sends a list (null keeps them).
+            update_data = op.data.model_dump(exclude_unset=True)
+            self._check_refs(index, update_data, categories, groups)
+            values = {
+                "owner_id": self.owner_id,
+                **{field: update_data.get(field, getattr(expense, field)) for field in FIELDS},
+            }
+            new_splits = None
+            if op.data.splits is not None:
+                computed = self._compute(
+                    index, values["amount"], values["split_type"], op.data.splits, users, friends
+                )
+                if computed is not None:
+                    new_splits = _split_rows(op.id, computed)
+            if index in self.errors:
+                continue
+            changed = {k: v for k, v in update_data.items() if k != "splits"}
+            if changed:
+                updates[tuple(sorted(changed.items()))].append(op.id)
+            if new_splits is None:
+                written = SimpleNamespace(**values, splits=expense.splits)
+            else:
+                replaced_splits.append(op.id)
+                split_rows.extend(new_splits)
+                written = _as_expense(values, new_splits)
+            expense_deltas(expense, sign=-1, into=deltas)
+            rollup_deltas(expense, sign=-1, into=rollups)
+            expense_deltas(written, into=deltas)
+            rollup_deltas(written, into=rollups)
+            results.append({"index": index, "op": op.op, "id": op.id, "status": "updated"})
+
+        if self.errors:
+            raise BatchValidationError(self.errors)
+
+        if replaced_splits or deleted:
+            await self.db.execute(
+                delete(ExpenseSplit).where(ExpenseSplit.expense_id.in_(replaced_splits + deleted))
+            )
+        if deleted:
+            await self.db.execute(delete(Expense).where(Expense.id.in_(deleted)))
+        for changed, ids in updates.items():
+            await self.db.execute(
+                update(Expense)
+                .where(Expense.id.in_(ids))
+                .values(dict(changed))
+                .execution_options(synchronize_session=False)
+            )
+        if expense_rows:
+            await self.db.execute(insert(Expense), expense_rows)
+        if split_rows:
+            await self.db.execute(insert(ExpenseSplit), split_rows)
+        await apply_deltas(self.db, deltas)
+        await apply_rollup_deltas(self.db, rollups)
+        changes.mark(self.db.sync_session, Expense.__tablename__, self.owner_id)
+        await self.db.commit()
+        return results
+
+
+async def run_expense_batch(
+    db: AsyncSession, owner_id: uuid.UUID, operations: list[ExpenseBatchOperation]
+) -> list[dict]:
+    return await ExpenseBatch(db, owner_id).run(operations)
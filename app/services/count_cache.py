@@ -0,0 +1,65 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Hashable
+
+from app.core.changes import Change, on_commit
+from app.core.config import settings
+
+
+class CountCache:
+    """Per-owner cache of list totals, keyed by table and the filtered query.
+
+    Entries of one ``(table, owner_id)`` scope are dropped together whenever a committed
+    write touches that scope; ``ttl_seconds`` bounds staleness for writes made by other
+    processes. Scopes are evicted least-recently-used past ``max_scopes``.
+    """
+
+    def __init__(self, max_scopes: int, ttl_seconds: float):
+        self.max_scopes = max_scopes
+        self.ttl_seconds = ttl_seconds
+        self._scopes: OrderedDict[tuple[str, uuid.UUID], dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, table: str, owner_id: uuid.UUID, key: Hashable) -> tuple[int, str] | None:
+        with self._lock:
+            scope = self._scopes.get((table, owner_id))
+            if scope is None:
+                return None
+            entry = scope.get(key)
+            if entry is None:
+                return None
+            expires_at, total, kind = entry
+            if expires_at < time.monotonic():
+                del scope[key]
+                return None
+            self._scopes.move_to_end((table, owner_id))
+            return total, kind
+
+    def set(self, table: str, owner_id: uuid.UUID, key: Hashable, total: int, kind: str):
+        with self._lock:
+            scope = self._scopes.setdefault((table, owner_id), {})
+            scope[key] = (time.monotonic() + self.ttl_seconds, total, kind)
+            self._scopes.move_to_end((table, owner_id))
+            while len(self._scopes) > self.max_scopes:
+                self._scopes.popitem(last=False)
+
+    def invalidate(self, table: str, owner_id: uuid.UUID) -> None:
+        with self._lock:
+            self._scopes.pop((table, owner_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._scopes.clear()
+
+
+count_cache = CountCache(
+    max_scopes=settings.count_cache_max_scopes, ttl_seconds=settings.count_cache_ttl_seconds
+)
+
+
+@on_commit
+def _invalidate(changes: set[Change]) -> None:
+    for table, owner_id in changes:
+        count_cache.invalidate(table, owner_id)
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.expense import Expense
+from app.schemas.expense import ExpenseOut
+
+EXPORT_BATCH_SIZE = 500
+CSV_COLUMNS = (
+    "id",
+    "description",
+    "amount",
+    "currency",
+    "date",
+    "category_id",
+    "group_id",
+    "split_type",
+    "created_at",
+    "splits",
+)
+
+
+def _csv_splits(expense: Expense) -> str:
+    # Same shape as ExpenseSplitIn, so an exported file can be fed back to the import.
+    return json.dumps(
+        [
+            {
+                "participant_type": split.participant_type.value,
+                "user_id": str(split.participant_user_id) if split.participant_user_id else None,
+                "friend_id": (
+                    str(split.participant_friend_id) if split.participant_friend_id else None
+                ),
+                "share_amount": str(split.share_amount),
+                "share_percentage": (
+                    str(split.share_percentage) if split.share_percentage is not None else None
+                ),
+            }
+            for split in expense.splits
+        ]
+    )
+
+
+def _csv_line(values) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+def _csv_row(expense: Expense) -> str:
+    data = ExpenseOut.model_validate(expense).model_dump(mode="json", exclude={"splits"})
+    return _csv_line([*(data[c] for c in CSV_COLUMNS[:-1]), _csv_splits(expense)])
+
+
+async def export_expenses(db: AsyncSession, stmt: Select, fmt: str) -> AsyncIterator[str]:
+    """Yield the rows of ``stmt`` as CSV or NDJSON lines.
+
+    Rows come from a server-side cursor ``EXPORT_BATCH_SIZE`` at a time (splits are
+    selectin-loaded per batch), so memory stays flat regardless of the export size.
+    """
+    result = await db.stream_scalars(stmt.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    if fmt == "csv":
+        yield _csv_line(CSV_COLUMNS)
+    async for expense in result:
+        if fmt == "csv":
+            yield _csv_row(expense)
+        else:
+            yield ExpenseOut.model_validate(expense).model_dump_json() + "\n"
+        # Written rows are not needed again; drop them (and their splits) from the session.
+        db.expunge(expense)
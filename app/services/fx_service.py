@@ -0,0 +1,164 @@
+import bisect
+import csv
+import datetime as dt
+import io
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Iterable
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.fx_rate import FxRate
+from app.services.split_service import TWOPLACES
+
+RateKey = tuple[str, dt.date]
+
+
+class FxRateCache:
+    """Rates in effect per ``(currency, date)``, after the staleness fallback is applied."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._rates: OrderedDict[RateKey, tuple[float, Decimal]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: RateKey) -> Decimal | None:
+        with self._lock:
+            entry = self._rates.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._rates[key]
+                return None
+            self._rates.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: RateKey, rate: Decimal) -> None:
+        with self._lock:
+            self._rates[key] = (time.monotonic() + self.ttl_seconds, rate)
+            self._rates.move_to_end(key)
+            while len(self._rates) > self.max_entries:
+                self._rates.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._rates.clear()
+
+
+fx_cache = FxRateCache(
+    max_entries=settings.fx_cache_max_entries, ttl_seconds=settings.fx_cache_ttl_seconds
+)
+
+
+def parse_rates_csv(body: str) -> list[dict]:
+    """Parse ``currency,date,rate`` rows; the rate is the value of one unit in the base."""
+    rows, errors = [], []
+    for line, record in enumerate(csv.DictReader(io.StringIO(body)), start=2):
+        try:
+            currency = record["currency"].strip().upper()
+            rate = Decimal(record["rate"])
+            if len(currency) != 3 or rate <= 0:
+                raise ValueError
+            rows.append(
+                {
+                    "currency": currency,
+                    "rate_date": dt.date.fromisoformat(record["date"].strip()),
+                    "rate": rate,
+                }
+            )
+        except (KeyError, AttributeError, ValueError, InvalidOperation):
+            errors.append(line)
+    if errors:
+        raise HTTPException(status_code=422, detail=f"Invalid FX rate rows: {errors[:20]}")
+    return rows
+
+
+async def upsert_rates(db: AsyncSession, rows: list[dict]) -> None:
+    if not rows:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(FxRate).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["currency", "rate_date"], set_={"rate": stmt.excluded.rate}
+        )
+    )
+
+
+async def resolve_rates(db: AsyncSession, keys: Iterable[RateKey]) -> dict[RateKey, Decimal]:
+    """Return the rate in effect for every ``(currency, date)`` with at most one query.
+
+    A date without its own rate uses the latest earlier one, up to
+    ``settings.fx_max_staleness_days`` back. Resolved rates are cached in ``fx_cache``.
+    """
+    resolved, missing = {}, set()
+    for key in set(keys):
+        if key[0] == settings.fx_base_currency:
+            resolved[key] = Decimal("1")
+        elif (rate := fx_cache.get(key)) is not None:
+            resolved[key] = rate
+        else:
+            missing.add(key)
+    if not missing:
+        return resolved
+
+    staleness = dt.timedelta(days=settings.fx_max_staleness_days)
+    rows = await db.execute(
+        select(FxRate.currency, FxRate.rate_date, FxRate.rate)
+        .where(
+            FxRate.currency.in_({currency for currency, _ in missing}),
+            FxRate.rate_date >= min(day for _, day in missing) - staleness,
+            FxRate.rate_date <= max(day for _, day in missing),
+        )
+        .order_by(FxRate.currency, FxRate.rate_date)
+    )
+    history = defaultdict(list)
+    for currency, rate_date, rate in rows:
+        history[currency].append((rate_date, rate))
+
+    unavailable = []
+    for currency, day in sorted(missing):
+        dates = [d for d, _ in history[currency]]
+        idx = bisect.bisect_right(dates, day) - 1
+        if idx < 0 or day - dates[idx] > staleness:
+            unavailable.append(f"{currency} on {day.isoformat()}")
+            continue
+        rate = history[currency][idx][1]
+        fx_cache.set((currency, day), rate)
+        resolved[(currency, day)] = rate
+    if unavailable:
+        raise HTTPException(status_code=422, detail=f"No FX rate for {', '.join(unavailable)}")
+    return resolved
+
+
+async def convert_rows(
+    db: AsyncSession, rows: list[dict], target: str, dates: list[dt.date]
+) -> list[dict]:
+    """Convert each row's ``amount`` and ``currency`` to ``target``.
+
+    ``rows[i]`` is converted at the rate in effect on ``dates[i]``; all the rates needed are
+    resolved in one batch.
+    """
+    target = target.upper()
+    rates = await resolve_rates(
+        db,
+        [(row["currency"], day) for row, day in zip(rows, dates, strict=True)]
+        + [(target, day) for day in dates],
+    )
+    return [
+        {
+            **row,
+            "currency": target,
+            "amount": (
+                row["amount"] * rates[(row["currency"], day)] / rates[(target, day)]
+            ).quantize(TWOPLACES),
+        }
+        for row, day in zip(rows, dates, strict=True)
+    ]
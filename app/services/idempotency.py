@@ -0,0 +1,126 @@
+"""``Idempotency-Key`` support for retried writes.
+
+The key is claimed by inserting its ``(owner_id, key)`` row before the write runs, in the
+same transaction, and the rendered response is stored on that row before the commit. A
+concurrent duplicate blocks on the unique index only for that key, then fails and replays
+the committed response; a write that rolls back releases its claim. Replays return the
+stored bytes as they are. Keys expire after ``IDEMPOTENCY_KEY_TTL_SECONDS`` and a
+background task deletes them in batches.
+"""
+
+import asyncio
+import datetime as dt
+import hashlib
+import logging
+import uuid
+
+from fastapi import HTTPException, Response
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.models.idempotency_key import IdempotencyKey
+
+REPLAYED_HEADER = "Idempotent-Replayed"
+SWEEP_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def request_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def _now() -> dt.datetime:
+    return dt.datetime.now(dt.UTC)
+
+
+def _replay(row: IdempotencyKey) -> Response:
+    return Response(
+        content=row.response_body,
+        status_code=row.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+async def claim(
+    db: AsyncSession, owner_id: uuid.UUID, key: str, fingerprint: str
+) -> Response | None:
+    """Claim ``key`` for this request, or return the response stored for it.
+
+    Must be the transaction's first write: a failed claim rolls the session back.
+    """
+    values = {
+        "id": uuid.uuid4(),
+        "owner_id": owner_id,
+        "key": key,
+        "request_hash": fingerprint,
+        "expires_at": _now() + dt.timedelta(seconds=settings.idempotency_key_ttl_seconds),
+    }
+    for _ in range(2):
+        try:
+            await db.execute(insert(IdempotencyKey).values(values))
+            return None
+        except IntegrityError:
+            await db.rollback()
+        row = await db.scalar(
+            select(IdempotencyKey).where(
+                IdempotencyKey.owner_id == owner_id, IdempotencyKey.key == key
+            )
+        )
+        if row is None:
+            continue
+        expires_at = row.expires_at
+        if expires_at.tzinfo is None:
+            # SQLite hands datetimes back naive; they were stored in UTC.
+            expires_at = expires_at.replace(tzinfo=dt.UTC)
+        if expires_at <= _now():
+            # Expired but not swept yet: the key is free again.
+            await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id == row.id))
+            continue
+        if row.request_hash != fingerprint:
+            raise HTTPException(
+                status_code=422, detail="Idempotency-Key was already used with another request"
+            )
+        if row.response_body is not None:
+            return _replay(row)
+        break
+    raise HTTPException(status_code=409, detail="Idempotency-Key is being used concurrently")
+
+
+async def store_response(
+    db: AsyncSession, owner_id: uuid.UUID, key: str, response: Response
+) -> None:
+    """Save ``response`` on the claimed key, inside the write's transaction."""
+    await db.execute(
+        update(IdempotencyKey)
+        .where(IdempotencyKey.owner_id == owner_id, IdempotencyKey.key == key)
+        .values(status_code=response.status_code, response_body=bytes(response.body))
+    )
+
+
+async def sweep_expired(db: AsyncSession) -> int:
+    """Delete expired keys in batches of ``SWEEP_BATCH_SIZE``; return how many went."""
+    removed = 0
+    while True:
+        expired = select(IdempotencyKey.id).where(IdempotencyKey.expires_at <= _now())
+        ids = list(await db.scalars(expired.limit(SWEEP_BATCH_SIZE)))
+        if not ids:
+            return removed
+        await db.execute(delete(IdempotencyKey).where(IdempotencyKey.id.in_(ids)))
+        await db.commit()
+        removed += len(ids)
+
+
+async def run_sweeper(session_factory: async_sessionmaker, interval_seconds: float) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with session_factory() as db:
+                removed = await sweep_expired(db)
+            if removed:
+                logger.info("swept %d expired idempotency keys", removed)
+        except Exception:
+            logger.exception("idempotency key sweep failed")
@@ -0,0 +1,217 @@
+import codecs
+import csv
+import json
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from decimal import Decimal
+from types import SimpleNamespace
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import changes
+from app.models.category import Category
+from app.models.enums import SplitType
+from app.models.expense import Expense
+from app.models.expense_split import ExpenseSplit
+from app.models.group import Group
+from app.schemas.expense import ExpenseCreate
+from app.services.balance_service import apply_deltas, expense_deltas
+from app.services.ownership import owned_ids
+from app.services.rollup_service import apply_rollup_deltas, rollup_accumulator, rollup_deltas
+from app.services.split_service import compute_splits, load_participants, participant_errors
+
+CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+
+async def _lines(stream: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    async for chunk in stream:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def _csv_records(stream: AsyncIterator[bytes]) -> AsyncIterator[dict | str]:
+    header = None
+    pending = ""
+    async for line in _lines(stream):
+        pending += line
+        # A quoted field may span lines; the record is complete once quotes are balanced.
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        if len(values) != len(header):
+            yield f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        row = {k: v for k, v in zip(header, values, strict=True) if v.strip() != ""}
+        if "splits" in row:
+            try:
+                row["splits"] = json.loads(row["splits"])
+            except ValueError:
+                yield "splits: Invalid JSON"
+                continue
+        yield row
+    if pending.strip():
+        yield "Unterminated quoted field"
+
+
+async def _ndjson_records(stream: AsyncIterator[bytes]) -> AsyncIterator[dict | str]:
+    async for line in _lines(stream):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield "Invalid JSON"
+            continue
+        yield record if isinstance(record, dict) else "Expected a JSON object"
+
+
+def _with_default_split(record: dict, owner_id: uuid.UUID) -> dict:
+    # Spreadsheet rows usually have no split: the whole amount is the owner's own share.
+    if "splits" not in record and "amount" in record:
+        record = {
+            **record,
+            "split_type": record.get("split_type", SplitType.amount),
+            "splits": [
+                {"participant_type": "user", "user_id": owner_id, "share_amount": record["amount"]}
+            ],
+        }
+    return record
+
+
+def _validation_messages(exc: ValidationError) -> list[str]:
+    return [f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in exc.errors()]
+
+
+class ExpenseImporter:
+    """Validates parsed rows in chunks and writes each chunk with multi-row INSERTs."""
+
+    def __init__(self, db: AsyncSession, owner_id: uuid.UUID):
+        self.db = db
+        self.owner_id = owner_id
+        self.imported = 0
+        self.failed = 0
+        self.errors: list[dict] = []
+
+    def _fail(self, row: int, messages: list[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": messages})
+
+    async def write_chunk(self, chunk: list[tuple[int, dict | str]]) -> None:
+        parsed: list[tuple[int, ExpenseCreate]] = []
+        for row, record in chunk:
+            if isinstance(record, str):
+                self._fail(row, [record])
+                continue
+            try:
+                payload = ExpenseCreate.model_validate(_with_default_split(record, self.owner_id))
+            except ValidationError as exc:
+                self._fail(row, _validation_messages(exc))
+                continue
+            parsed.append((row, payload))
+
+        payloads = [payload for _, payload in parsed]
+        categories = await owned_ids(
+            self.db, Category, self.owner_id, {p.category_id for p in payloads if p.category_id}
+        )
+        groups = await owned_ids(
+            self.db, Group, self.owner_id, {p.group_id for p in payloads if p.group_id}
+        )
+        users, friends = await load_participants(
+            self.db, self.owner_id, [split for p in payloads for split in p.splits]
+        )
+
+        expense_rows, split_rows = [], []
+        deltas = defaultdict(Decimal)
+        rollups = rollup_accumulator()
+        for row, payload in parsed:
+            if payload.category_id and payload.category_id not in categories:
+                self._fail(row, ["Invalid category_id"])
+                continue
+            if payload.group_id and payload.group_id not in groups:
+                self._fail(row, ["Invalid group_id"])
+                continue
+            split_errors = participant_errors(payload.splits, payload.split_type, users, friends)
+            if split_errors:
+                self._fail(
+                    row,
+                    [f"splits.{idx}: {msg}" for idx, msgs in split_errors.items() for msg in msgs],
+                )
+                continue
+            try:
+                computed = compute_splits(payload.amount, payload.split_type, payload.splits)
+            except HTTPException as exc:
+                self._fail(row, [exc.detail])
+                continue
+
+            expense_id = uuid.uuid4()
+            expense = {
+                "id": expense_id,
+                "owner_id": self.owner_id,
+                **payload.model_dump(exclude={"splits"}),
+            }
+            splits = [
+                {
+                    "id": uuid.uuid4(),
+                    "expense_id": expense_id,
+                    "participant_type": c["split"].participant_type,
+                    "participant_user_id": c["split"].user_id,
+                    "participant_friend_id": c["split"].friend_id,
+                    "share_amount": c["amount"],
+                    "share_percentage": c["percentage"],
+                }
+                for c in computed
+            ]
+            expense_rows.append(expense)
+            split_rows.extend(splits)
+            written = SimpleNamespace(**expense, splits=[SimpleNamespace(**s) for s in splits])
+            expense_deltas(written, into=deltas)
+            rollup_deltas(written, into=rollups)
+
+        if expense_rows:
+            await self.db.execute(insert(Expense), expense_rows)
+            await self.db.execute(insert(ExpenseSplit), split_rows)
+            await apply_deltas(self.db, deltas)
+            await apply_rollup_deltas(self.db, rollups)
+            changes.mark(self.db.sync_session, Expense.__tablename__, self.owner_id)
+        await self.db.commit()
+        self.imported += len(expense_rows)
+
+    async def run(self, records: AsyncIterator[dict | str]) -> dict:
+        chunk: list[tuple[int, dict | str]] = []
+        row = 0
+        async for record in records:
+            row += 1
+            chunk.append((row, record))
+            if len(chunk) >= CHUNK_SIZE:
+                await self.write_chunk(chunk)
+                chunk = []
+        if chunk:
+            await self.write_chunk(chunk)
+        errors = sorted(self.errors, key=lambda e: e["row"])
+        return {"imported": self.imported, "failed": self.failed, "errors": errors}
+
+
+async def import_expenses(
+    db: AsyncSession, owner_id: uuid.UUID, stream: AsyncIterator[bytes], fmt: str
+) -> dict:
+    records = _csv_records(stream) if fmt == "csv" else _ndjson_records(stream)
+    return await ExpenseImporter(db, owner_id).run(records)
@@ -0,0 +1,63 @@
+import uuid
+from collections.abc import Mapping
+from decimal import Decimal
+
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import changes
+
+
+def _scope(model, key_columns: tuple[str, ...], key: tuple):
+    return [
+        getattr(model, column).is_(None) if value is None else getattr(model, column) == value
+        for column, value in zip(key_columns, key, strict=True)
+    ]
+
+
+async def add_to_rows(
+    db: AsyncSession,
+    model,
+    key_columns: tuple[str, ...],
+    increments: Mapping[tuple, Mapping[str, Decimal | int]],
+) -> None:
+    """Add ``increments`` to the counter columns of the ``model`` rows they are keyed by.
+
+    Missing rows are created. ``key_columns`` must match a unique index (nulls not
+    distinct on Postgres). Runs inside the caller's transaction; rows keyed by ``owner_id``
+    are recorded in :mod:`app.core.changes` like ORM writes.
+    """
+    # A stable order keeps concurrent writers locking rows in the same sequence.
+    updates = sorted(
+        ((k, v) for k, v in increments.items() if any(v.values())),
+        key=lambda item: [str(p) for p in item[0]],
+    )
+    if not updates:
+        return
+    rows = [
+        {"id": uuid.uuid4(), **dict(zip(key_columns, key, strict=True)), **values}
+        for key, values in updates
+    ]
+    if "owner_id" in key_columns:
+        for row in rows:
+            changes.mark(db.sync_session, model.__tablename__, row["owner_id"])
+
+    if db.get_bind().dialect.name == "postgresql":
+        stmt = postgresql.insert(model).values(rows)
+        counters = {c: getattr(model, c) + stmt.excluded[c] for c in updates[0][1]}
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=list(key_columns), set_={**counters, "updated_at": func.now()}
+            )
+        )
+        return
+
+    for (key, values), row in zip(updates, rows, strict=True):
+        result = await db.execute(
+            update(model)
+            .where(*_scope(model, key_columns, key))
+            .values({c: getattr(model, c) + v for c, v in values.items()})
+        )
+        if result.rowcount == 0:
+            await db.execute(insert(model).values(**row))
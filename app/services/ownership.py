@@ -0,0 +1,12 @@
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def owned_ids(db: AsyncSession, model, owner_id, ids: set[uuid.UUID]) -> set[uuid.UUID]:
+    """Return the ``ids`` of ``model`` rows that belong to ``owner_id``, in one query."""
+    if not ids:
+        return set()
+    rows = await db.scalars(select(model.id).where(model.id.in_(ids), model.owner_id == owner_id))
+    return set(rows)
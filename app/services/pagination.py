@@ -1,8 +1,132 @@
-from sqlalchemy import Select, func, select
-from sqlalchemy.orm import Session
+import base64
+import json
+import uuid
+from datetime import date, datetime
 
+from fastapi import HTTPException
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
-def paginate(db: Session, stmt: Select, page: int, limit: int):
-    total = db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
-    items = db.scalars(stmt.offset((page - 1) * limit).limit(limit)).all()
-    return items, {"total": int(total), "page": page, "limit": limit}
+from app.core.config import settings
+from app.services.count_cache import count_cache
+
+
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, date) else str(v) for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_value(column: InstrumentedAttribute, raw: str):
+    python_type = column.type.python_type
+    if python_type is datetime:
+        return datetime.fromisoformat(raw)
+    if python_type is date:
+        return date.fromisoformat(raw)
+    if python_type is uuid.UUID:
+        return uuid.UUID(raw)
+    return python_type(raw)
+
+
+def decode_cursor(cursor: str, keyset: tuple[InstrumentedAttribute, ...]) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(raw, list) or len(raw) != len(keyset):
+            raise ValueError
+        return [_decode_value(col, value) for col, value in zip(keyset, raw, strict=True)]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=422, detail="Invalid cursor")
+
+
+def _after(keyset: tuple[InstrumentedAttribute, ...], values: list):
+    """Rows strictly after ``values`` in descending keyset order.
+
+    Sort values are re-read from the anchor row (keyset ends with its unique id) so they are
+    compared in their stored form; the decoded values only apply if that row was deleted.
+    The seek is a single row-value comparison so both SQLite and Postgres turn it into a
+    range on the ``(owner_id, *keyset)`` index instead of filtering every row before it.
+    """
+    id_column, anchor_id = keyset[-1], values[-1]
+    bounds = [
+        func.coalesce(
+            select(column).where(id_column == anchor_id).correlate(None).scalar_subquery(),
+            literal(value, column.type),
+        )
+        for column, value in zip(keyset[:-1], values[:-1], strict=True)
+    ]
+    return tuple_(*keyset) < tuple_(*bounds, literal(anchor_id, id_column.type))
+
+
+async def _estimate_total(db: AsyncSession, stmt: Select) -> int | None:
+    """Row estimate from the Postgres planner, or ``None`` where that is unavailable."""
+    dialect = db.get_bind().dialect
+    if dialect.name != "postgresql":
+        return None
+    compiled = stmt.compile(dialect=dialect)
+    connection = await db.connection()
+    plan = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params)
+    return int(plan.scalar()[0]["Plan"]["Plan Rows"])
+
+
+async def _count_total(db: AsyncSession, stmt: Select) -> tuple[int, str]:
+    threshold = settings.count_estimate_threshold
+    if threshold:
+        estimate = await _estimate_total(db, stmt)
+        if estimate is not None and estimate >= threshold:
+            return estimate, "estimated"
+    total = await db.scalar(select(func.count()).select_from(stmt.subquery())) or 0
+    return int(total), "exact"
+
+
+async def _total(db: AsyncSession, stmt: Select, owner_id) -> tuple[int, str]:
+    if owner_id is None or not settings.count_cache_enabled:
+        return await _count_total(db, stmt)
+    table = stmt.column_descriptions[0]["entity"].__tablename__
+    compiled = stmt.compile()
+    key = (str(compiled), repr(sorted(compiled.params.items())))
+    cached = count_cache.get(table, owner_id, key)
+    if cached is None:
+        cached = await _count_total(db, stmt)
+        count_cache.set(table, owner_id, key, *cached)
+    return cached
+
+
+async def paginate(
+    db: AsyncSession,
+    stmt: Select,
+    page: int,
+    limit: int,
+    keyset: tuple[InstrumentedAttribute, ...] = (),
+    cursor: str | None = None,
+    owner_id=None,
+    include_total: bool = True,
+):
+    """Return one page of ``stmt`` and its pagination meta.
+
+    ``keyset`` lists the columns ``stmt`` is ordered by (descending, ending with a unique
+    column). When given, the meta carries a ``next_cursor`` and passing it back as
+    ``cursor`` fetches the following page with a seek instead of an OFFSET scan.
+
+    The total is skipped in cursor mode and when ``include_total`` is false. Otherwise it is
+    cached per ``owner_id`` and query, and replaced by the planner estimate on Postgres once
+    that exceeds ``settings.count_estimate_threshold``; ``total_kind`` says which one it is.
+    """
+    meta = {"total": None, "total_kind": "omitted", "page": None, "limit": limit}
+    if cursor is not None:
+        if not keyset:
+            raise HTTPException(status_code=422, detail="Cursor pagination is not supported")
+        seek = stmt.where(_after(keyset, decode_cursor(cursor, keyset)))
+        items = (await db.scalars(seek.limit(limit + 1))).all()
+    else:
+        if include_total:
+            meta["total"], meta["total_kind"] = await _total(db, stmt, owner_id)
+        items = (await db.scalars(stmt.offset((page - 1) * limit).limit(limit + 1))).all()
+        meta["page"] = page
+
+    has_more = len(items) > limit
+    items = items[:limit]
+    meta["next_cursor"] = None
+    if keyset and has_more:
+        meta["next_cursor"] = encode_cursor([getattr(items[-1], col.key) for col in keyset])
+    return items, meta
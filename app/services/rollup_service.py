@@ -0,0 +1,152 @@
+import datetime as dt
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.expense import Expense
+from app.models.spend_rollup import SpendRollup
+from app.services.fx_service import convert_rows
+from app.services.ledger import add_to_rows
+
+# (owner_id, period, category_id, group_id, currency)
+RollupKey = tuple[uuid.UUID, dt.date, uuid.UUID | None, uuid.UUID | None, str]
+KEY_COLUMNS = ("owner_id", "period", "category_id", "group_id", "currency")
+
+
+def month_start(day: dt.date) -> dt.date:
+    return day.replace(day=1)
+
+
+def rollup_accumulator() -> dict[RollupKey, dict]:
+    return defaultdict(lambda: {"amount": Decimal("0"), "expense_count": 0})
+
+
+def rollup_deltas(
+    expense: Expense, sign: int = 1, into: dict[RollupKey, dict] | None = None
+) -> dict[RollupKey, dict]:
+    """Add the rollup change caused by ``expense`` (or by removing it, with ``sign=-1``)."""
+    deltas = into if into is not None else rollup_accumulator()
+    key = (
+        expense.owner_id,
+        month_start(expense.date),
+        expense.category_id,
+        expense.group_id,
+        expense.currency,
+    )
+    deltas[key]["amount"] += expense.amount * sign
+    deltas[key]["expense_count"] += sign
+    return deltas
+
+
+async def apply_rollup_deltas(db: AsyncSession, deltas: dict[RollupKey, dict]) -> None:
+    """Add ``deltas`` to ``spend_rollups`` inside the caller's transaction."""
+    await add_to_rows(db, SpendRollup, KEY_COLUMNS, deltas)
+
+
+async def compute_rollups(db: AsyncSession) -> dict[RollupKey, dict]:
+    """Recompute every rollup row from ``expenses``."""
+    rows = await db.stream(
+        select(
+            Expense.owner_id,
+            Expense.date,
+            Expense.category_id,
+            Expense.group_id,
+            Expense.currency,
+            Expense.amount,
+        ).execution_options(yield_per=1000)
+    )
+    deltas = rollup_accumulator()
+    # Periods are bucketed here rather than with date_trunc/strftime to stay dialect-neutral.
+    async for owner_id, day, category_id, group_id, currency, amount in rows:
+        values = deltas[(owner_id, month_start(day), category_id, group_id, currency)]
+        values["amount"] += amount
+        values["expense_count"] += 1
+    return dict(deltas)
+
+
+async def stored_rollups(db: AsyncSession) -> dict[RollupKey, dict]:
+    rows = await db.execute(
+        select(
+            *(getattr(SpendRollup, c) for c in KEY_COLUMNS),
+            SpendRollup.amount,
+            SpendRollup.expense_count,
+        )
+    )
+    return {
+        tuple(row[:-2]): {"amount": row[-2], "expense_count": row[-1]} for row in rows if row[-1]
+    }
+
+
+async def rebuild_rollups(db: AsyncSession) -> int:
+    """Replace ``spend_rollups`` with rows recomputed from ``expenses``."""
+    computed = await compute_rollups(db)
+    await db.execute(delete(SpendRollup))
+    if computed:
+        await db.execute(
+            insert(SpendRollup),
+            [
+                {"id": uuid.uuid4(), **dict(zip(KEY_COLUMNS, key, strict=True)), **values}
+                for key, values in computed.items()
+            ],
+        )
+    return len(computed)
+
+
+def _month_end(period: dt.date) -> dt.date:
+    return (period + dt.timedelta(days=32)).replace(day=1) - dt.timedelta(days=1)
+
+
+async def spend_report(
+    db: AsyncSession,
+    owner_id: uuid.UUID,
+    granularity: str,
+    by: str,
+    date_from: dt.date | None = None,
+    date_to: dt.date | None = None,
+    currency: str | None = None,
+    target_currency: str | None = None,
+) -> list[dict]:
+    """Totals per period, per category or group, and currency, read from the rollups.
+
+    With ``target_currency`` each monthly row is converted at the rate in effect at the end of
+    its month (today for the current month) before rows are summed.
+    """
+    dimension = SpendRollup.category_id if by == "category" else SpendRollup.group_id
+    stmt = (
+        select(
+            SpendRollup.period,
+            dimension.label("key"),
+            SpendRollup.currency,
+            func.sum(SpendRollup.amount).label("amount"),
+            func.sum(SpendRollup.expense_count).label("expenses"),
+        )
+        .where(SpendRollup.owner_id == owner_id, SpendRollup.expense_count != 0)
+        .group_by(SpendRollup.period, dimension, SpendRollup.currency)
+    )
+    if date_from:
+        stmt = stmt.where(SpendRollup.period >= month_start(date_from))
+    if date_to:
+        stmt = stmt.where(SpendRollup.period <= date_to)
+    if currency:
+        stmt = stmt.where(SpendRollup.currency == currency)
+    rows = [dict(row) for row in (await db.execute(stmt)).mappings()]
+    if target_currency:
+        today = dt.date.today()
+        dates = [min(_month_end(row["period"]), today) for row in rows]
+        rows = await convert_rows(db, rows, target_currency, dates)
+
+    totals = defaultdict(lambda: [Decimal("0"), 0])
+    for row in rows:
+        period = row["period"].replace(month=1) if granularity == "year" else row["period"]
+        total = totals[(period, row["key"], row["currency"])]
+        total[0] += row["amount"]
+        total[1] += row["expenses"]
+    return [
+        {"period": period, by + "_id": key, "currency": cur, "amount": amount, "expenses": count}
+        for (period, key, cur), (amount, count) in sorted(
+            totals.items(), key=lambda item: (item[0][0], str(item[0][1]), item[0][2])
+        )
+    ]
@@ -0,0 +1,48 @@
+from typing import Literal
+
+from sqlalchemy import Select, column, func, literal_column, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.models.search import fts_table_name
+
+SearchSort = Literal["recent", "relevance"]
+
+# The trigram tokenizer cannot match anything shorter than one trigram.
+MIN_FTS_QUERY_LENGTH = 3
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _fts_phrase(query: str) -> str:
+    return '"' + query.replace('"', '""') + '"'
+
+
+def apply_search(
+    db: AsyncSession, stmt: Select, field: InstrumentedAttribute, query: str, ranked: bool
+) -> Select:
+    """Keep the rows of ``stmt`` whose ``field`` contains ``query`` (case-insensitive).
+
+    On Postgres the ``ILIKE`` is served by the ``pg_trgm`` GIN index and ``ranked`` orders by
+    ``word_similarity``. On SQLite the match goes through the FTS5 trigram table and
+    ``ranked`` orders by its bm25 rank. Callers add their usual ordering as a tie-break.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "sqlite" and len(query) >= MIN_FTS_QUERY_LENGTH:
+        model = field.class_
+        fts = table(fts_table_name(model.__tablename__), column("id"), column("rank"))
+        matches = (
+            select(fts.c.id, fts.c.rank)
+            .where(literal_column(fts.name).match(_fts_phrase(query)))
+            .subquery()
+        )
+        stmt = stmt.join(matches, matches.c.id == model.id)
+        return stmt.order_by(matches.c.rank) if ranked else stmt
+
+    stmt = stmt.where(field.ilike(_like_pattern(query), escape="\\"))
+    if ranked and dialect == "postgresql":
+        stmt = stmt.order_by(func.word_similarity(query, field).desc())
+    return stmt
@@ -0,0 +1,38 @@
+import heapq
+import uuid
+from decimal import Decimal
+
+from app.models.enums import ParticipantType
+from app.services.split_service import TWOPLACES
+
+Participant = tuple[ParticipantType, uuid.UUID]
+Transfer = tuple[Participant, Participant, Decimal]
+
+
+def simplify_debts(net: dict[Participant, Decimal]) -> list[Transfer]:
+    """Settle net positions (positive: is owed money) with at most ``n - 1`` transfers.
+
+    Greedy on two max-heaps: the largest debtor pays the largest creditor until one of them
+    is settled, which is O(n log n) and keeps every amount an exact two-place ``Decimal``.
+    """
+    balances = {p: amount.quantize(TWOPLACES) for p, amount in net.items()}
+    if sum(balances.values(), Decimal("0")) != 0:
+        raise ValueError("Net balances must sum to zero")
+
+    # Heap entries carry the participant as a string so ties resolve deterministically.
+    creditors = [(-amount, str(p), p) for p, amount in balances.items() if amount > 0]
+    debtors = [(amount, str(p), p) for p, amount in balances.items() if amount < 0]
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers: list[Transfer] = []
+    while creditors and debtors:
+        credit, credit_key, creditor = heapq.heappop(creditors)
+        debt, debt_key, debtor = heapq.heappop(debtors)
+        amount = min(-credit, -debt)
+        transfers.append((debtor, creditor, amount))
+        if -credit > amount:
+            heapq.heappush(creditors, (credit + amount, credit_key, creditor))
+        if -debt > amount:
+            heapq.heappush(debtors, (debt + amount, debt_key, debtor))
+    return transfers
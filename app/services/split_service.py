@@ -1,7 +1,10 @@
+import uuid
+from collections import defaultdict
 from decimal import ROUND_HALF_UP, Decimal
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.enums import ParticipantType, SplitType
 from app.models.friend import Friend
@@ -11,47 +14,72 @@ from app.schemas.expense import ExpenseSplitIn
 TWOPLACES = Decimal("0.01")
 
 
-def validate_and_compute_splits(
-    db: Session,
-    owner_id,
-    total_amount: Decimal,
-    split_type: SplitType,
-    splits: list[ExpenseSplitIn],
-):
-    if not splits:
-        raise HTTPException(status_code=422, detail="Split must have at least one participant")
+class SplitValidationError(HTTPException):
+    """422 carrying the problems found for each split, keyed by its index in the payload."""
 
-    for split in splits:
+    def __init__(self, errors: dict[int, list[str]]):
+        super().__init__(status_code=422, detail="Invalid split participants")
+        self.details = errors
+
+
+async def load_participants(
+    db: AsyncSession, owner_id, splits: list[ExpenseSplitIn]
+) -> tuple[set[uuid.UUID], set[uuid.UUID]]:
+    """Return the existing user ids and the owner's friend ids among ``splits``.
+
+    Runs at most one ``IN (...)`` query per participant type.
+    """
+    user_ids = {s.user_id for s in splits if s.participant_type == ParticipantType.user}
+    friend_ids = {s.friend_id for s in splits if s.participant_type == ParticipantType.friend}
+    users, friends = set(), set()
+    if user_ids:
+        users = set(await db.scalars(select(User.id).where(User.id.in_(user_ids))))
+    if friend_ids:
+        friends = set(
+            await db.scalars(
+                select(Friend.id).where(Friend.id.in_(friend_ids), Friend.owner_id == owner_id)
+            )
+        )
+    return users, friends
+
+
+def participant_errors(
+    splits: list[ExpenseSplitIn],
+    split_type: SplitType,
+    users: set[uuid.UUID],
+    friends: set[uuid.UUID],
+) -> dict[int, list[str]]:
+    errors: dict[int, list[str]] = defaultdict(list)
+    seen = set()
+    for idx, split in enumerate(splits):
         if split.participant_type == ParticipantType.user:
-            user = db.get(User, split.user_id)
-            if not user:
-                raise HTTPException(status_code=422, detail="Invalid user participant")
+            key = (split.participant_type, split.user_id)
+            if split.user_id not in users:
+                errors[idx].append("Invalid user participant")
         else:
-            friend = db.get(Friend, split.friend_id)
-            if not friend or friend.owner_id != owner_id:
-                raise HTTPException(status_code=422, detail="Invalid friend participant")
+            key = (split.participant_type, split.friend_id)
+            if split.friend_id not in friends:
+                errors[idx].append("Invalid friend participant")
+        if key in seen:
+            errors[idx].append("Duplicate participant")
+        seen.add(key)
+        if split_type == SplitType.amount and split.share_amount is None:
+            errors[idx].append("share_amount is required for amount split")
+        if split_type == SplitType.percentage and split.share_percentage is None:
+            errors[idx].append("share_percentage is required for percentage split")
+    return dict(errors)
 
+
+def compute_splits(total_amount: Decimal, split_type: SplitType, splits: list[ExpenseSplitIn]):
+    """Turn validated splits into amounts; the shares must add up to the expense."""
     computed = []
     if split_type == SplitType.amount:
-        sum_amount = Decimal("0")
-        for split in splits:
-            if split.share_amount is None:
-                raise HTTPException(
-                    status_code=422, detail="share_amount is required for amount split"
-                )
-            sum_amount += split.share_amount
-            computed.append({"amount": split.share_amount, "percentage": None, "split": split})
+        sum_amount = sum((split.share_amount for split in splits), Decimal("0"))
         if sum_amount.quantize(TWOPLACES) != total_amount.quantize(TWOPLACES):
             raise HTTPException(status_code=422, detail="Split amounts must equal expense amount")
-        return computed
+        return [{"amount": s.share_amount, "percentage": None, "split": s} for s in splits]
 
-    sum_percentage = Decimal("0")
-    for split in splits:
-        if split.share_percentage is None:
-            raise HTTPException(
-                status_code=422, detail="share_percentage is required for percentage split"
-            )
-        sum_percentage += split.share_percentage
+    sum_percentage = sum((split.share_percentage for split in splits), Decimal("0"))
     if sum_percentage.quantize(Decimal("0.0001")) != Decimal("100.0000"):
         raise HTTPException(status_code=422, detail="Split percentages must equal 100")
 
@@ -66,3 +94,20 @@ def validate_and_compute_splits(
             running += amount
         computed.append({"amount": amount, "percentage": split.share_percentage, "split": split})
     return computed
+
+
+async def validate_and_compute_splits(
+    db: AsyncSession,
+    owner_id,
+    total_amount: Decimal,
+    split_type: SplitType,
+    splits: list[ExpenseSplitIn],
+):
+    if not splits:
+        raise HTTPException(status_code=422, detail="Split must have at least one participant")
+
+    users, friends = await load_participants(db, owner_id, splits)
+    errors = participant_errors(splits, split_type, users, friends)
+    if errors:
+        raise SplitValidationError(errors)
+    return compute_splits(total_amount, split_type, splits)
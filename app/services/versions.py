@@ -0,0 +1,79 @@
+"""Per-owner collection versions, the validators behind conditional GETs.
+
+Every commit that writes to a versioned collection bumps the ``(owner_id, collection)``
+counter inside the same transaction, so readers never see new rows with an old version.
+ETags are a digest of those counters: a request whose ``If-None-Match`` still matches is
+answered after one lookup in ``collection_versions``, without reading the collection.
+"""
+
+import hashlib
+import uuid
+from collections.abc import Iterable
+
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core import changes
+from app.models.collection_version import CollectionVersion
+
+VERSIONED_COLLECTIONS = frozenset(
+    {"friends", "categories", "groups", "expenses", "balances", "spend_rollups"}
+)
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_versions(session: Session) -> None:
+    # Writes are recorded on flush, and commit only flushes after this hook.
+    session.flush()
+    bumped = sorted(
+        (str(owner_id), table)
+        for table, owner_id in changes.pending(session)
+        if table in VERSIONED_COLLECTIONS
+    )
+    if not bumped:
+        return
+    dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(CollectionVersion).values(
+        [
+            {"id": uuid.uuid4(), "owner_id": uuid.UUID(owner_id), "collection": table, "version": 1}
+            for owner_id, table in bumped
+        ]
+    )
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["owner_id", "collection"],
+            set_={"version": CollectionVersion.version + 1, "updated_at": func.now()},
+        )
+    )
+
+
+async def collection_versions(
+    db: AsyncSession, owner_id: uuid.UUID, collections: Iterable[str]
+) -> dict[str, int]:
+    collections = sorted(collections)
+    rows = await db.execute(
+        select(CollectionVersion.collection, CollectionVersion.version).where(
+            CollectionVersion.owner_id == owner_id, CollectionVersion.collection.in_(collections)
+        )
+    )
+    stored = dict(rows.all())
+    return {collection: stored.get(collection, 0) for collection in collections}
+
+
+def make_etag(owner_id: uuid.UUID, versions: dict[str, int], target: str, weak: bool) -> str:
+    """ETag of ``target`` (path and query) as seen by ``owner_id`` at ``versions``."""
+    raw = f"{owner_id}|{sorted(versions.items())}|{target}"
+    digest = hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+    return f'W/"{digest}"' if weak else f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison, as ``If-None-Match`` requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
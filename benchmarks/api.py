@@ -0,0 +1,455 @@
+"""Load and latency benchmark for the HTTP API.
+
+Starts the app in-process, seeds a dedicated database and drives a weighted mix of requests
+from concurrent clients, then writes per-operation throughput and latency percentiles as
+JSON. Two result files from different commits can be compared with ``compare``.
+
+Usage::
+
+    python -m benchmarks.api run [--database-url URL] [--users 20] [--expenses 500]
+        [--mix mixed] [--requests 2000] [--concurrency 16] [--transport asgi|uvicorn]
+        [--output results.json]
+    python -m benchmarks.api compare base.json head.json [--threshold 0.1]
+
+The database at ``--database-url`` is dropped and recreated; it must not be the one the app
+is configured with.
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import platform
+import random
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+import httpx
+from sqlalchemy import insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.config import settings
+from app.core.database import Base, engine_options, get_db
+from app.core.security import create_access_token, get_password_hash
+from app.main import app
+from app.models import Category, Expense, ExpenseSplit, Friend, Group, User
+from app.models.enums import ParticipantType, SplitType
+from app.services.balance_service import rebuild_balances
+from app.services.rollup_service import rebuild_rollups
+
+PASSWORD = "benchmark"
+PAGE_SIZE = 20
+FIRST_DATE = dt.date(2025, 1, 1)
+
+# operation -> relative weight
+MIXES = {
+    "read": {
+        "list_expenses_filtered": 30,
+        "list_expenses_deep_offset": 10,
+        "list_expenses_cursor": 20,
+        "balances": 20,
+        "spend_report": 15,
+        "login": 5,
+    },
+    "mixed": {
+        "list_expenses_filtered": 25,
+        "list_expenses_deep_offset": 5,
+        "list_expenses_cursor": 15,
+        "create_expense": 25,
+        "balances": 15,
+        "spend_report": 10,
+        "login": 5,
+    },
+    "write": {
+        "create_expense": 80,
+        "list_expenses_filtered": 10,
+        "login": 10,
+    },
+}
+
+
+def seed_rows(args: argparse.Namespace, rng: random.Random) -> tuple[dict, list[dict]]:
+    password_hash = get_password_hash(PASSWORD)
+    rows = {model: [] for model in (User, Friend, Group, Category, Expense, ExpenseSplit)}
+    scopes = []
+    for u in range(args.users):
+        user_id = uuid.uuid4()
+        email = f"bench{u}@example.com"
+        rows[User].append(
+            {"id": user_id, "email": email, "name": f"Bench {u}", "password_hash": password_hash}
+        )
+        scope = {
+            "user_id": user_id,
+            "email": email,
+            "token": create_access_token(str(user_id)),
+            "friends": [uuid.uuid4() for _ in range(args.friends)],
+            "groups": [uuid.uuid4() for _ in range(args.groups)],
+            "categories": [uuid.uuid4() for _ in range(args.categories)],
+            "cursor": None,
+        }
+        scopes.append(scope)
+        rows[Friend] += [
+            {"id": f, "owner_id": user_id, "name": f"Friend {i}"}
+            for i, f in enumerate(scope["friends"])
+        ]
+        rows[Group] += [
+            {"id": g, "owner_id": user_id, "name": f"Group {i}"}
+            for i, g in enumerate(scope["groups"])
+        ]
+        rows[Category] += [
+            {"id": c, "owner_id": user_id, "name": f"Category {i}"}
+            for i, c in enumerate(scope["categories"])
+        ]
+        for e in range(args.expenses):
+            expense_id = uuid.uuid4()
+            share = Decimal(rng.randint(100, 10_000)) / 100
+            rows[Expense].append(
+                {
+                    "id": expense_id,
+                    "owner_id": user_id,
+                    "description": f"Expense {e}",
+                    "amount": share * 2,
+                    "currency": "BRL",
+                    "date": FIRST_DATE + dt.timedelta(days=rng.randrange(365)),
+                    "category_id": rng.choice(scope["categories"]),
+                    "group_id": rng.choice(scope["groups"]),
+                    "split_type": SplitType.amount,
+                }
+            )
+            rows[ExpenseSplit] += [
+                {
+                    "id": uuid.uuid4(),
+                    "expense_id": expense_id,
+                    "participant_type": ParticipantType.user,
+                    "participant_user_id": user_id,
+                    "participant_friend_id": None,
+                    "share_amount": share,
+                },
+                {
+                    "id": uuid.uuid4(),
+                    "expense_id": expense_id,
+                    "participant_type": ParticipantType.friend,
+                    "participant_user_id": None,
+                    "participant_friend_id": rng.choice(scope["friends"]),
+                    "share_amount": share,
+                },
+            ]
+    return rows, scopes
+
+
+async def seed(engine: AsyncEngine, rows: dict) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine)() as db:
+        for model, values in rows.items():
+            # Stay under the bound-parameter limits of both SQLite and Postgres.
+            for start in range(0, len(values), 1000):
+                await db.execute(insert(model), values[start : start + 1000])
+        await rebuild_balances(db)
+        await rebuild_rollups(db)
+        await db.commit()
+
+
+async def _login(client, scope, rng, args):
+    return await client.post("/v1/auth/login", json={"email": scope["email"], "password": PASSWORD})
+
+
+async def _create_expense(client, scope, rng, args):
+    share = f"{rng.randint(100, 10_000) / 100:.2f}"
+    payload = {
+        "description": "Benchmark",
+        "amount": f"{Decimal(share) * 2:.2f}",
+        "date": (FIRST_DATE + dt.timedelta(days=rng.randrange(365))).isoformat(),
+        "category_id": str(rng.choice(scope["categories"])),
+        "group_id": str(rng.choice(scope["groups"])),
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": str(scope["user_id"]), "share_amount": share},
+            {
+                "participant_type": "friend",
+                "friend_id": str(rng.choice(scope["friends"])),
+                "share_amount": share,
+            },
+        ],
+    }
+    return await client.post("/v1/expenses", json=payload, headers=_auth(scope))
+
+
+async def _list_expenses_filtered(client, scope, rng, args):
+    date_from = FIRST_DATE + dt.timedelta(days=rng.randrange(300))
+    params = {
+        "category_id": str(rng.choice(scope["categories"])),
+        "date_from": date_from.isoformat(),
+        "limit": PAGE_SIZE,
+    }
+    return await client.get("/v1/expenses", params=params, headers=_auth(scope))
+
+
+async def _list_expenses_deep_offset(client, scope, rng, args):
+    last_page = max(1, args.expenses // PAGE_SIZE)
+    params = {"page": rng.randint(max(1, last_page - 5), last_page), "limit": PAGE_SIZE}
+    return await client.get("/v1/expenses", params=params, headers=_auth(scope))
+
+
+async def _list_expenses_cursor(client, scope, rng, args):
+    # Each call fetches the page after the previous one; a walk restarts at the end.
+    params = {"limit": PAGE_SIZE}
+    if scope["cursor"]:
+        params["cursor"] = scope["cursor"]
+    response = await client.get("/v1/expenses", params=params, headers=_auth(scope))
+    if response.status_code == 200:
+        scope["cursor"] = response.json()["meta"]["next_cursor"]
+    return response
+
+
+async def _balances(client, scope, rng, args):
+    return await client.get("/v1/balances", headers=_auth(scope))
+
+
+async def _spend_report(client, scope, rng, args):
+    return await client.get("/v1/reports/spend", params={"by": "group"}, headers=_auth(scope))
+
+
+OPERATIONS = {
+    "login": _login,
+    "create_expense": _create_expense,
+    "list_expenses_filtered": _list_expenses_filtered,
+    "list_expenses_deep_offset": _list_expenses_deep_offset,
+    "list_expenses_cursor": _list_expenses_cursor,
+    "balances": _balances,
+    "spend_report": _spend_report,
+}
+
+
+def _auth(scope: dict) -> dict:
+    return {"Authorization": f"Bearer {scope['token']}"}
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, round(q * (len(ordered) - 1)))]
+
+
+def summarize(samples: dict[str, list[float]], errors: dict[str, int], seconds: float) -> dict:
+    operations = {}
+    for name in sorted(samples.keys() | errors.keys()):
+        ordered = sorted(samples.get(name, []))
+        operations[name] = {
+            "requests": len(ordered) + errors.get(name, 0),
+            "errors": errors.get(name, 0),
+            "throughput_rps": len(ordered) / seconds if seconds else 0.0,
+            "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+            "p50_ms": _percentile(ordered, 0.50) * 1000,
+            "p90_ms": _percentile(ordered, 0.90) * 1000,
+            "p99_ms": _percentile(ordered, 0.99) * 1000,
+            "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        }
+    completed = sum(len(v) for v in samples.values())
+    return {
+        "total": {
+            "requests": completed + sum(errors.values()),
+            "errors": sum(errors.values()),
+            "seconds": seconds,
+            "throughput_rps": completed / seconds if seconds else 0.0,
+        },
+        "operations": operations,
+    }
+
+
+async def drive(client: httpx.AsyncClient, scopes: list[dict], args: argparse.Namespace) -> dict:
+    mix = MIXES[args.mix]
+    names, weights = list(mix), list(mix.values())
+    samples: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    remaining = {"warmup": args.warmup, "measured": args.requests}
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(args.seed * 1000 + worker_id)
+        while True:
+            if remaining["warmup"] > 0:
+                remaining["warmup"] -= 1
+                measured = False
+            elif remaining["measured"] > 0:
+                remaining["measured"] -= 1
+                measured = True
+            else:
+                return
+            name = rng.choices(names, weights)[0]
+            scope = rng.choice(scopes)
+            started = time.perf_counter()
+            response = await OPERATIONS[name](client, scope, rng, args)
+            elapsed = time.perf_counter() - started
+            if not measured:
+                continue
+            if response.status_code >= 400:
+                errors[name] += 1
+            else:
+                samples[name].append(elapsed)
+
+    # Warm-up requests run first so caches and pools are populated before measuring.
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(args.concurrency)))
+    return summarize(samples, errors, time.perf_counter() - started)
+
+
+async def _serve_uvicorn():
+    import uvicorn
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task, f"http://127.0.0.1:{port}"
+
+
+def _commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+async def run(args: argparse.Namespace) -> dict:
+    if make_url(args.database_url) == make_url(settings.database_url):
+        raise SystemExit("--database-url must point at a dedicated benchmark database")
+    options = engine_options(args.database_url)
+    if make_url(args.database_url).get_backend_name() == "sqlite":
+        # SQLite has a single writer: concurrent write transactions would fail with
+        # "database is locked", so requests queue for one connection instead.
+        options = {"poolclass": AsyncAdaptedQueuePool, "pool_size": 1, "max_overflow": 0}
+    engine = create_async_engine(args.database_url, **options)
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def benchmark_db():
+        async with sessions() as db:
+            yield db
+
+    rng = random.Random(args.seed)
+    rows, scopes = seed_rows(args, rng)
+    await seed(engine, rows)
+    app.dependency_overrides[get_db] = benchmark_db
+    try:
+        if args.transport == "uvicorn":
+            server, task, base_url = await _serve_uvicorn()
+            try:
+                async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+                    result = await drive(client, scopes, args)
+            finally:
+                server.should_exit = True
+                await task
+        else:
+            # Unhandled errors become 500 responses, as they would behind uvicorn.
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://benchmark", timeout=60
+            ) as client:
+                result = await drive(client, scopes, args)
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        await engine.dispose()
+
+    meta = {
+        "commit": _commit(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "transport": args.transport,
+        "mix": args.mix,
+        "scale": {
+            "users": args.users,
+            "expenses": args.expenses,
+            "friends": args.friends,
+            "groups": args.groups,
+            "categories": args.categories,
+        },
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+    }
+    return {"meta": meta, **result}
+
+
+def compare(base: dict, head: dict, threshold: float) -> tuple[list[str], bool]:
+    """Per-operation report of ``head`` against ``base``.
+
+    An operation regresses when its p50 or p99 latency grew by more than ``threshold``.
+    """
+    lines, regressed = [], False
+    keys = ("database", "transport", "mix", "scale", "concurrency")
+    if any(base["meta"].get(k) != head["meta"].get(k) for k in keys):
+        lines.append("warning: the runs used different settings; numbers are not comparable")
+    lines.append(f"{'operation':<28}{'p50 ms':>22}{'p99 ms':>22}{'rps':>22}")
+    for name in sorted(base["operations"].keys() & head["operations"].keys()):
+        old, new = base["operations"][name], head["operations"][name]
+        cells, flagged = [], False
+        for metric in ("p50_ms", "p99_ms", "throughput_rps"):
+            change = (new[metric] - old[metric]) / old[metric] if old[metric] else 0.0
+            cells.append(f"{old[metric]:.1f} -> {new[metric]:.1f} ({change:+.0%})")
+            if metric != "throughput_rps" and change > threshold:
+                flagged = True
+        regressed |= flagged
+        marker = "  REGRESSION" if flagged else ""
+        lines.append(f"{name:<28}" + "".join(f"{cell:>22}" for cell in cells) + marker)
+    return lines, regressed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.api")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="seed a database and measure the API")
+    run_parser.add_argument(
+        "--database-url", default="sqlite+aiosqlite:///./benchmark.db", help="dropped first"
+    )
+    run_parser.add_argument("--users", type=int, default=20)
+    run_parser.add_argument("--expenses", type=int, default=500, help="per user")
+    run_parser.add_argument("--friends", type=int, default=20, help="per user")
+    run_parser.add_argument("--groups", type=int, default=5, help="per user")
+    run_parser.add_argument("--categories", type=int, default=10, help="per user")
+    run_parser.add_argument("--mix", choices=sorted(MIXES), default="mixed")
+    run_parser.add_argument("--requests", type=int, default=2000)
+    run_parser.add_argument("--warmup", type=int, default=200)
+    run_parser.add_argument("--concurrency", type=int, default=16)
+    run_parser.add_argument("--transport", choices=["asgi", "uvicorn"], default="asgi")
+    run_parser.add_argument("--seed", type=int, default=7)
+    run_parser.add_argument("--output", help="write the JSON results here as well")
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("head")
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.1, help="relative p50/p99 growth that fails"
+    )
+
+    args = parser.parse_args()
+    if args.command == "compare":
+        with open(args.base) as base, open(args.head) as head:
+            lines, regressed = compare(json.load(base), json.load(head), args.threshold)
+        print("\n".join(lines))
+        sys.exit(1 if regressed else 0)
+
+    results = asyncio.run(run(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(output + "\n")
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
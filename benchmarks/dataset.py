@@ -0,0 +1,374 @@
+"""Generate a large synthetic dataset for scale testing.
+
+Usage: ``python -m benchmarks.dataset [--database-url URL] [--users 10000]
+[--expenses 2000000] [--seed 7] [--reset]``
+
+Rows are produced from a seeded generator, so the same arguments always yield the same
+data. The shapes are skewed the way real usage is: a few users own most expenses (Pareto
+weights), friend lists are long-tailed, most expenses are solo or split in two, and dates
+cluster around the present. Users, friends, groups, categories, expenses and splits are
+written in batches through the models' tables: ``COPY`` on Postgres, multi-row
+``INSERT`` elsewhere. The balances and spend rollups are then rebuilt from the generated
+expenses.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import datetime as dt
+import json
+import math
+import random
+import time
+import uuid
+from collections.abc import Iterator
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base, engine_options
+from app.core.security import get_password_hash
+from app.models import Category, Expense, ExpenseSplit, Friend, Group, User
+from app.models.enums import ParticipantType, SplitType
+from app.services.balance_service import rebuild_balances
+from app.services.rollup_service import rebuild_rollups
+
+PASSWORD = "synthetic"
+
+# Parents before children, so every flushed batch satisfies the foreign keys.
+COLUMNS = {
+    Friend: ("id", "owner_id", "name", "notes", "created_at"),
+    Group: ("id", "owner_id", "name", "description", "created_at"),
+    Category: ("id", "owner_id", "name", "color", "created_at"),
+    Expense: (
+        "id",
+        "owner_id",
+        "description",
+        "amount",
+        "currency",
+        "date",
+        "category_id",
+        "group_id",
+        "split_type",
+        "created_at",
+    ),
+    ExpenseSplit: (
+        "id",
+        "expense_id",
+        "participant_type",
+        "participant_user_id",
+        "participant_friend_id",
+        "share_amount",
+        "share_percentage",
+        "created_at",
+    ),
+}
+USER_COLUMNS = ("id", "email", "name", "password_hash", "created_at")
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Heitor", "Isabela",
+    "João", "Karina", "Lucas", "Marina", "Nicolas", "Olívia", "Pedro", "Rafaela", "Samuel",
+    "Tatiana", "Vinícius",
+)  # fmt: skip
+DESCRIPTIONS = (
+    "Mercado", "Padaria", "Uber", "Jantar", "Almoço", "Aluguel", "Conta de luz", "Internet",
+    "Farmácia", "Cinema", "Gasolina", "Academia", "Presente", "Viagem", "Hotel", "Passagem",
+    "Bar", "Café", "Streaming", "Feira",
+)  # fmt: skip
+CATEGORY_NAMES = (
+    "Alimentação", "Transporte", "Moradia", "Lazer", "Saúde", "Educação", "Viagem",
+    "Assinaturas", "Compras", "Outros",
+)  # fmt: skip
+COLORS = ("#22c55e", "#3b82f6", "#ef4444", "#f59e0b", "#a855f7", None)
+# participants per expense (owner included) -> weight
+PARTICIPANT_WEIGHTS = {1: 35, 2: 33, 3: 12, 4: 9, 5: 5, 6: 3, 8: 2, 12: 1}
+CURRENCY_WEIGHTS = {"BRL": 90, "USD": 7, "EUR": 3}
+CENT = Decimal("0.01")
+HUNDRED = Decimal("100")
+
+
+@dataclasses.dataclass(frozen=True)
+class DatasetSpec:
+    users: int = 1_000
+    expenses: int = 100_000
+    max_friends: int = 150
+    max_groups: int = 12
+    max_categories: int = 10
+    # Share of non-owner participants that are registered users rather than friends.
+    user_participant_share: float = 0.1
+    days: int = 730
+    seed: int = 7
+    batch_size: int = 20_000
+    email_prefix: str = "synthetic"
+
+
+class _Ids:
+    """Deterministic UUIDs drawn from the dataset's generator."""
+
+    def __init__(self, rng: random.Random):
+        self._bits = rng.getrandbits
+
+    def __call__(self) -> uuid.UUID:
+        return uuid.UUID(int=self._bits(128), version=4)
+
+
+class _BatchWriter:
+    """Buffers rows per table and writes them in foreign-key order once a batch is full."""
+
+    def __init__(self, conn: AsyncConnection, batch_size: int):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.pending = {model: [] for model in COLUMNS}
+        self.buffered = 0
+        self.written = {model.__tablename__: 0 for model in (User, *COLUMNS)}
+
+    def add(self, model, row: tuple) -> None:
+        self.pending[model].append(row)
+        self.buffered += 1
+
+    async def maybe_flush(self) -> None:
+        if self.buffered >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        for model, rows in self.pending.items():
+            if rows:
+                await self.write(model, COLUMNS[model], rows)
+                rows.clear()
+        self.buffered = 0
+        await self.conn.commit()
+
+    async def write(self, model, columns: tuple[str, ...], rows: list[tuple]) -> None:
+        if self.conn.dialect.name == "postgresql":
+            raw = (await self.conn.get_raw_connection()).driver_connection
+            statement = f"COPY {model.__tablename__} ({', '.join(columns)}) FROM STDIN"
+            async with raw.cursor() as cursor, cursor.copy(statement) as copy:
+                for row in rows:
+                    await copy.write_row(row)
+        else:
+            await self.conn.execute(
+                insert(model), [dict(zip(columns, row, strict=True)) for row in rows]
+            )
+        self.written[model.__tablename__] += len(rows)
+
+
+def _weighted(weights: dict) -> tuple[list, list[int]]:
+    return list(weights), list(weights.values())
+
+
+def _cents(value: int) -> Decimal:
+    return Decimal(value).scaleb(-2)
+
+
+def _amount_shares(rng: random.Random, total: int, count: int) -> list[int]:
+    """Split ``total`` cents in ``count`` parts: even most of the time, uneven otherwise."""
+    if count == 1:
+        return [total]
+    if rng.random() < 0.6:
+        weights = [1.0] * count
+    else:
+        weights = [rng.uniform(0.2, 1.0) for _ in range(count)]
+    scale = total / sum(weights)
+    shares = [int(w * scale) for w in weights]
+    shares[0] += total - sum(shares)
+    return shares
+
+
+def _percentage_shares(total: Decimal, count: int) -> list[tuple[Decimal, Decimal]]:
+    """Equal percentages, rounded like ``compute_splits``; the last share takes the rest."""
+    percentage = (HUNDRED / count).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+    percentages = [percentage] * (count - 1) + [HUNDRED - percentage * (count - 1)]
+    shares, running = [], Decimal("0")
+    for idx, pct in enumerate(percentages):
+        if idx == count - 1:
+            amount = total - running
+        else:
+            amount = (total * pct / HUNDRED).quantize(CENT, rounding=ROUND_HALF_UP)
+            running += amount
+        shares.append((amount, pct))
+    return shares
+
+
+def _expense_counts(rng: random.Random, users: int, total: int) -> list[int]:
+    # alpha 1.16 is the Pareto shape behind the 80/20 rule.
+    weights = [rng.paretovariate(1.16) for _ in range(users)]
+    scale = total / sum(weights)
+    counts = [int(w * scale) for w in weights]
+    for idx in rng.sample(range(users), min(users, total - sum(counts))):
+        counts[idx] += 1
+    return counts
+
+
+def _users(spec: DatasetSpec, ids: _Ids, now: dt.datetime) -> Iterator[tuple]:
+    password_hash = get_password_hash(PASSWORD)
+    for idx in range(spec.users):
+        yield (
+            ids(),
+            f"{spec.email_prefix}-{spec.seed}-{idx}@example.com",
+            f"{FIRST_NAMES[idx % len(FIRST_NAMES)]} {idx}",
+            password_hash,
+            now - dt.timedelta(days=spec.days),
+        )
+
+
+async def _write_user_data(
+    writer: _BatchWriter,
+    spec: DatasetSpec,
+    rng: random.Random,
+    ids: _Ids,
+    owner_id: uuid.UUID,
+    user_ids: list[uuid.UUID],
+    expense_count: int,
+    now: dt.datetime,
+) -> None:
+    today = now.date()
+    joined = now - dt.timedelta(days=spec.days)
+    friends = [ids() for _ in range(min(spec.max_friends, int(rng.paretovariate(1.5) * 3)))]
+    for idx, friend_id in enumerate(friends):
+        name = f"{rng.choice(FIRST_NAMES)} {idx}"
+        writer.add(Friend, (friend_id, owner_id, name, None, joined))
+    groups = [ids() for _ in range(rng.randint(0, spec.max_groups))]
+    for idx, group_id in enumerate(groups):
+        writer.add(Group, (group_id, owner_id, f"Grupo {idx}", None, joined))
+    categories = [ids() for _ in range(rng.randint(1, spec.max_categories))]
+    for idx, category_id in enumerate(categories):
+        name = f"{CATEGORY_NAMES[idx % len(CATEGORY_NAMES)]} {idx}"
+        writer.add(Category, (category_id, owner_id, name, rng.choice(COLORS), joined))
+
+    sizes, size_weights = _weighted(PARTICIPANT_WEIGHTS)
+    currencies, currency_weights = _weighted(CURRENCY_WEIGHTS)
+    others = [u for u in rng.sample(user_ids, min(len(user_ids), 20)) if u != owner_id]
+    for _ in range(expense_count):
+        expense_id = ids()
+        # Most expenses are recent: exponential age with a mean of a quarter of the window.
+        age = min(spec.days, int(rng.expovariate(4 / spec.days)))
+        date = today - dt.timedelta(days=age)
+        created_at = dt.datetime.combine(date, dt.time(rng.randrange(24)), tzinfo=dt.UTC)
+        total = max(100, int(rng.lognormvariate(math.log(6_000), 1.0)))
+        count = min(rng.choices(sizes, size_weights)[0], 1 + len(friends) + len(others))
+
+        participants = [(ParticipantType.user, owner_id)]
+        pool_friends = rng.sample(friends, min(len(friends), count - 1))
+        for friend_id in pool_friends:
+            if others and rng.random() < spec.user_participant_share:
+                candidate = rng.choice(others)
+                if (ParticipantType.user, candidate) not in participants:
+                    participants.append((ParticipantType.user, candidate))
+                    continue
+            participants.append((ParticipantType.friend, friend_id))
+        for candidate in others:
+            if len(participants) >= count:
+                break
+            if (ParticipantType.user, candidate) not in participants:
+                participants.append((ParticipantType.user, candidate))
+
+        amount = _cents(total)
+        if len(participants) > 1 and rng.random() < 0.3:
+            split_type = SplitType.percentage
+            shares = _percentage_shares(amount, len(participants))
+        else:
+            split_type = SplitType.amount
+            shares = [(_cents(c), None) for c in _amount_shares(rng, total, len(participants))]
+
+        writer.add(
+            Expense,
+            (
+                expense_id,
+                owner_id,
+                rng.choice(DESCRIPTIONS),
+                amount,
+                rng.choices(currencies, currency_weights)[0],
+                date,
+                rng.choice(categories) if rng.random() < 0.9 else None,
+                rng.choice(groups) if groups and rng.random() < 0.5 else None,
+                split_type.value,
+                created_at,
+            ),
+        )
+        for (kind, participant_id), (share, percentage) in zip(participants, shares, strict=True):
+            writer.add(
+                ExpenseSplit,
+                (
+                    ids(),
+                    expense_id,
+                    kind.value,
+                    participant_id if kind == ParticipantType.user else None,
+                    participant_id if kind == ParticipantType.friend else None,
+                    share,
+                    percentage,
+                    created_at,
+                ),
+            )
+        await writer.maybe_flush()
+
+
+async def generate(engine: AsyncEngine, spec: DatasetSpec, reset: bool = False) -> dict:
+    """Write the dataset described by ``spec`` and rebuild the derived tables.
+
+    With ``reset`` the schema is dropped and recreated from the models first.
+    """
+    started = time.perf_counter()
+    rng = random.Random(spec.seed)
+    ids = _Ids(rng)
+    now = dt.datetime(2026, 10, 18, 12, 0, tzinfo=dt.UTC)
+
+    if reset:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+    async with engine.connect() as conn:
+        writer = _BatchWriter(conn, spec.batch_size)
+        users = list(_users(spec, ids, now))
+        for start in range(0, len(users), spec.batch_size):
+            await writer.write(User, USER_COLUMNS, users[start : start + spec.batch_size])
+        await conn.commit()
+
+        user_ids = [user[0] for user in users]
+        counts = _expense_counts(rng, spec.users, spec.expenses)
+        for owner_id, expense_count in zip(user_ids, counts, strict=True):
+            await _write_user_data(writer, spec, rng, ids, owner_id, user_ids, expense_count, now)
+        await writer.flush()
+    generated = time.perf_counter() - started
+
+    async with AsyncSession(engine) as db:
+        await rebuild_balances(db)
+        await rebuild_rollups(db)
+        await db.commit()
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    return {
+        "rows": writer.written,
+        "generate_seconds": generated,
+        "total_seconds": time.perf_counter() - started,
+        "password": PASSWORD,
+    }
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dataset")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate the schema first")
+    for field in dataclasses.fields(DatasetSpec):
+        parser.add_argument(
+            f"--{field.name.replace('_', '-')}", type=field.type, default=field.default
+        )
+    args = parser.parse_args()
+    spec = DatasetSpec(**{f.name: getattr(args, f.name) for f in dataclasses.fields(defaults)})
+
+    async def run() -> dict:
+        engine = create_async_engine(args.database_url, **engine_options(args.database_url))
+        try:
+            return await generate(engine, spec, reset=args.reset)
+        finally:
+            await engine.dispose()
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Benchmark list responses: FastAPI's ``response_model`` path against ``ModelResponse``.
+
+Usage: ``python -m benchmarks.responses [--sizes 20 100] [--repeat 200]``
+"""
+
+import argparse
+import asyncio
+import datetime as dt
+import json
+import time
+import uuid
+from decimal import Decimal
+
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.core.responses import ModelResponse
+from app.models.enums import ParticipantType, SplitType
+from app.schemas.common import SuccessListResponse
+from app.schemas.expense import ExpenseOut, ExpenseSplitOut
+
+
+def synthetic_page(size: int) -> tuple[list[ExpenseOut], dict]:
+    now = dt.datetime(2026, 2, 11, 12, 0)
+    items = []
+    for idx in range(size):
+        expense_id = uuid.uuid4()
+        splits = [
+            ExpenseSplitOut(
+                id=uuid.uuid4(),
+                expense_id=expense_id,
+                participant_type=ParticipantType.friend,
+                participant_user_id=None,
+                participant_friend_id=uuid.uuid4(),
+                share_amount=Decimal("10.00"),
+                share_percentage=None,
+                created_at=now,
+            )
+            for _ in range(2)
+        ]
+        items.append(
+            ExpenseOut(
+                id=expense_id,
+                owner_id=uuid.uuid4(),
+                description=f"Expense {idx}",
+                amount=Decimal("20.00"),
+                currency="BRL",
+                date=now.date(),
+                category_id=uuid.uuid4(),
+                group_id=None,
+                split_type=SplitType.amount,
+                created_at=now,
+                splits=splits,
+            )
+        )
+    meta = {"total": size, "total_kind": "exact", "page": 1, "limit": size, "next_cursor": None}
+    return items, meta
+
+
+async def _response_model_body(field, items: list[ExpenseOut], meta: dict) -> bytes:
+    # What FastAPI does with the dict a route returns: validate it, then dump it to JSON.
+    return await serialize_response(
+        field=field, response_content={"data": items, "meta": meta}, dump_json=True
+    )
+
+
+def _model_response_body(items: list[ExpenseOut], meta: dict) -> bytes:
+    return ModelResponse(SuccessListResponse[ExpenseOut](data=items, meta=meta)).body
+
+
+async def run(sizes: list[int], repeat: int) -> list[dict]:
+    field = create_model_field(
+        name="Response", type_=SuccessListResponse[ExpenseOut], mode="serialization"
+    )
+    results = []
+    for size in sizes:
+        items, meta = synthetic_page(size)
+        if await _response_model_body(field, items, meta) != _model_response_body(items, meta):
+            raise AssertionError("ModelResponse body differs from the response_model body")
+
+        response_model, model_response = [], []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await _response_model_body(field, items, meta)
+            response_model.append(time.perf_counter() - started)
+            started = time.perf_counter()
+            _model_response_body(items, meta)
+            model_response.append(time.perf_counter() - started)
+        results.append(
+            {
+                "items": size,
+                "response_model_best_seconds": min(response_model),
+                "model_response_best_seconds": min(model_response),
+                "speedup": min(response_model) / min(model_response),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.responses")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args.sizes, args.repeat)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
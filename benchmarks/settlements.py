@@ -0,0 +1,58 @@
+"""Benchmark debt simplification on large synthetic groups.
+
+Usage: ``python -m benchmarks.settlements [--sizes 100 1000 10000] [--seed 7]``
+"""
+
+import argparse
+import json
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from app.models.enums import ParticipantType
+from app.services.settlement_service import simplify_debts
+
+
+def synthetic_group(size: int, rng: random.Random) -> dict:
+    participants = [
+        (rng.choice(list(ParticipantType)), uuid.UUID(int=rng.getrandbits(128)))
+        for _ in range(size)
+    ]
+    net = {p: Decimal(rng.randint(-50_000, 50_000)) / 100 for p in participants[:-1]}
+    net[participants[-1]] = -sum(net.values(), Decimal("0"))
+    return net
+
+
+def run(sizes: list[int], seed: int, repeat: int) -> list[dict]:
+    rng = random.Random(seed)
+    results = []
+    for size in sizes:
+        net = synthetic_group(size, rng)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            transfers = simplify_debts(net)
+            timings.append(time.perf_counter() - started)
+        results.append(
+            {
+                "participants": size,
+                "transfers": len(transfers),
+                "best_seconds": min(timings),
+                "mean_seconds": sum(timings) / len(timings),
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.settlements")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sizes, args.seed, args.repeat), indent=2))
+
+
+if __name__ == "__main__":
+    main()
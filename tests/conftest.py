@@ -3,37 +3,52 @@ from collections.abc import Generator
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
-os.environ["DATABASE_URL"] = "sqlite+pysqlite:///:memory:"
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite:///:memory:"
 os.environ["SECRET_KEY"] = "test-secret"
+os.environ["BCRYPT_ROUNDS"] = "4"
 
+from app.core import metrics, profiling  # noqa: E402
+from app.core.auth_cache import principal_cache  # noqa: E402
 from app.core.database import Base, get_db  # noqa: E402
 from app.main import app  # noqa: E402
+from app.services.fx_service import fx_cache  # noqa: E402
 
 
 @pytest.fixture()
-def db_session() -> Generator[Session, None, None]:
-    engine = create_engine("sqlite+pysqlite:///:memory:", connect_args={"check_same_thread": False})
-    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+def db_engine() -> AsyncEngine:
+    engine = create_async_engine(
+        "sqlite+aiosqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    metrics.instrument_engine(engine)
+    profiling.instrument_engine(engine)
+    return engine
 
 
 @pytest.fixture()
-def client(db_session: Session) -> Generator[TestClient, None, None]:
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+def client(db_engine: AsyncEngine) -> Generator[TestClient, None, None]:
+    TestingSessionLocal = async_sessionmaker(
+        bind=db_engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_db():
+        async with TestingSessionLocal() as db:
+            yield db
+
+    async def create_schema():
+        async with db_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
 
     app.dependency_overrides[get_db] = override_get_db
+    principal_cache.clear()
+    principal_cache.reset_stats()
+    fx_cache.clear()
     with TestClient(app) as c:
+        c.portal.call(create_schema)
         yield c
+        c.portal.call(db_engine.dispose)
     app.dependency_overrides.clear()
@@ -1,3 +1,27 @@
+import asyncio
+import threading
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from passlib.hash import bcrypt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.auth_cache import principal_cache
+from app.core.password_pool import PasswordHashPool, password_pool
+from app.models.user import User
+
+
+def register(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "cache@example.com", "password": "123456", "name": "Cache"},
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
 def test_register_login_me(client):
     register = client.post(
         "/v1/auth/register",
@@ -15,3 +39,94 @@ def test_register_login_me(client):
     me = client.get("/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
     assert me.status_code == 200
     assert me.json()["data"]["email"] == "user@example.com"
+
+
+def test_principal_cache_hits_and_invalidation(client, db_engine):
+    headers, user_id = register(client)
+    assert client.get("/v1/auth/me", headers=headers).status_code == 200
+    assert client.get("/v1/auth/me", headers=headers).status_code == 200
+
+    stats = client.get("/health/auth-cache").json()["data"]
+    assert stats["token_hits"] == 1
+    assert stats["principal_hits"] == 1
+
+    async def rename():
+        async with async_sessionmaker(bind=db_engine)() as db:
+            user = await db.get(User, uuid.UUID(user_id))
+            user.name = "Renamed"
+            await db.commit()
+
+    client.portal.call(rename)
+    me = client.get("/v1/auth/me", headers=headers).json()["data"]
+    assert me["name"] == "Renamed"
+
+
+def test_principal_cache_can_be_disabled(client):
+    headers, _ = register(client)
+    principal_cache.enabled = False
+    try:
+        for _ in range(2):
+            assert client.get("/v1/auth/me", headers=headers).status_code == 200
+        stats = principal_cache.snapshot()
+        assert stats["principals"] == 0
+        assert stats["principal_hits"] == stats["principal_misses"] == 0
+    finally:
+        principal_cache.enabled = True
+
+
+def test_login_rehashes_outdated_password_hash(client, db_engine):
+    register(client)
+    Session = async_sessionmaker(bind=db_engine)
+
+    async def set_hash(value):
+        async with Session() as db:
+            user = await db.scalar(select(User).where(User.email == "cache@example.com"))
+            user.password_hash = value
+            await db.commit()
+
+    async def get_hash():
+        async with Session() as db:
+            return await db.scalar(
+                select(User.password_hash).where(User.email == "cache@example.com")
+            )
+
+    client.portal.call(set_hash, bcrypt.using(rounds=5).hash("123456"))
+    login = client.post("/v1/auth/login", json={"email": "cache@example.com", "password": "123456"})
+    assert login.status_code == 200
+
+    stored = client.portal.call(get_hash)
+    assert stored.startswith("$2b$04$")
+    assert bcrypt.verify("123456", stored)
+
+
+def test_password_pool_rejects_when_queue_is_full():
+    pool = PasswordHashPool(workers=1, max_queue=0)
+    release = threading.Event()
+
+    async def scenario():
+        busy = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.01)
+        with pytest.raises(HTTPException) as exc:
+            await pool.run(lambda: None)
+        release.set()
+        await busy
+        return exc.value
+
+    error = asyncio.run(scenario())
+    assert error.status_code == 503
+    stats = pool.snapshot()
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 1
+    assert stats["queued"] == stats["running"] == 0
+
+
+def test_saturated_password_pool_answers_503_with_retry_after(client, monkeypatch):
+    # No slot left: every hashing request is rejected before reaching the executor.
+    monkeypatch.setattr(password_pool, "max_queue", -password_pool.workers)
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "busy@example.com", "password": "123456", "name": "Busy"},
+    )
+    password_pool.reset_stats()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.balance_service import compute_balances, stored_balances
+
+
+def register(client, email):
+    response = client.post(
+        "/v1/auth/register", json={"email": email, "password": "123456", "name": email}
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def balances(client, headers):
+    body = client.get("/v1/balances", headers=headers).json()["data"]
+    return {b["counterparty_id"]: Decimal(b["amount"]) for b in body}
+
+
+def test_balances_follow_expense_writes(client, db_engine):
+    headers, owner_id = register(client, "owner@example.com")
+    other_headers, other_id = register(client, "other@example.com")
+    friend = client.post("/v1/friends", json={"name": "Ana"}, headers=headers)
+    friend_id = friend.json()["data"]["id"]
+    payload = {
+        "description": "Trip",
+        "amount": "90.00",
+        "date": "2026-02-11",
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": owner_id, "share_amount": "30.00"},
+            {"participant_type": "user", "user_id": other_id, "share_amount": "30.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "30.00"},
+        ],
+    }
+    expense_id = client.post("/v1/expenses", json=payload, headers=headers).json()["data"]["id"]
+
+    assert balances(client, headers) == {other_id: Decimal("30.00"), friend_id: Decimal("30.00")}
+    assert balances(client, other_headers) == {owner_id: Decimal("-30.00")}
+
+    update = {
+        "splits": [
+            {"participant_type": "user", "user_id": owner_id, "share_amount": "50.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "40.00"},
+        ]
+    }
+    response = client.patch(f"/v1/expenses/{expense_id}", json=update, headers=headers)
+    assert response.status_code == 200
+    assert balances(client, headers) == {friend_id: Decimal("40.00")}
+    assert balances(client, other_headers) == {}
+
+    async def ledger_matches_splits():
+        async with AsyncSession(db_engine) as db:
+            return await stored_balances(db) == await compute_balances(db)
+
+    assert client.portal.call(ledger_matches_splits)
+
+    client.delete(f"/v1/expenses/{expense_id}", headers=headers)
+    assert balances(client, headers) == {}
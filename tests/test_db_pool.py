@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.pool_stats import InstrumentedQueuePool, pool_stats
+
+
+def test_db_pool_endpoint(client):
+    response = client.get("/health/db-pool")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert "checkout_timeouts" in data
+    assert "+Inf" in data["wait_seconds_histogram"]
+
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path):
+    async def exhaust_pool():
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        try:
+            async with engine.connect():
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+        finally:
+            await engine.dispose()
+
+    before = pool_stats.snapshot()
+    asyncio.run(exhaust_pool())
+    after = pool_stats.snapshot()
+
+    assert after["checkouts"] == before["checkouts"] + 2
+    assert after["checkout_timeouts"] == before["checkout_timeouts"] + 1
+    assert after["wait_seconds_sum"] - before["wait_seconds_sum"] >= 0.05
@@ -0,0 +1,76 @@
+from sqlalchemy import event
+
+
+def register(client, email):
+    response = client.post(
+        "/v1/auth/register", json={"email": email, "password": "123456", "name": email}
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def test_list_and_resource_etags_follow_writes(client, db_engine):
+    headers, _ = register(client, "etag@example.com")
+    category = client.post("/v1/categories", json={"name": "Food"}, headers=headers).json()
+    category_id = category["data"]["id"]
+
+    listing = client.get("/v1/categories", headers=headers)
+    list_etag = listing.headers["etag"]
+    assert list_etag.startswith('W/"')
+    single = client.get(f"/v1/categories/{category_id}", headers=headers)
+    single_etag = single.headers["etag"]
+    assert single_etag.startswith('"')
+    assert client.get("/v1/categories?limit=5", headers=headers).headers["etag"] != list_etag
+
+    statements = []
+
+    def record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        cached = client.get("/v1/categories", headers={**headers, "If-None-Match": list_etag})
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == list_etag
+    assert statements and not [s for s in statements if "FROM categories" in s]
+
+    conditional = {**headers, "If-None-Match": single_etag}
+    assert client.get(f"/v1/categories/{category_id}", headers=conditional).status_code == 304
+
+    client.patch(f"/v1/categories/{category_id}", json={"name": "Meals"}, headers=headers)
+    refreshed = client.get("/v1/categories", headers={**headers, "If-None-Match": list_etag})
+    assert refreshed.status_code == 200
+    assert refreshed.headers["etag"] != list_etag
+    assert client.get(f"/v1/categories/{category_id}", headers=conditional).status_code == 200
+
+    # Another owner's ETag never matches.
+    other_headers, _ = register(client, "other-etag@example.com")
+    other = client.get("/v1/categories", headers={**other_headers, "If-None-Match": list_etag})
+    assert other.status_code == 200
+
+
+def test_mirrored_balances_bump_the_counterparty_version(client):
+    headers, owner_id = register(client, "payer@example.com")
+    other_headers, other_id = register(client, "debtor@example.com")
+    before = client.get("/v1/balances", headers=other_headers).headers["etag"]
+
+    payload = {
+        "description": "Taxi",
+        "amount": "40.00",
+        "date": "2026-02-11",
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": owner_id, "share_amount": "20.00"},
+            {"participant_type": "user", "user_id": other_id, "share_amount": "20.00"},
+        ],
+    }
+    assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+    after = client.get("/v1/balances", headers={**other_headers, "If-None-Match": before})
+    assert after.status_code == 200
+    assert after.json()["data"][0]["amount"] == "-20.00"
+    assert "etag" not in client.get("/v1/balances?target_currency=BRL", headers=headers).headers
@@ -0,0 +1,164 @@
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.balance_service import compute_balances, stored_balances
+from app.services.rollup_service import compute_rollups, stored_rollups
+
+
+def setup_owner(client):
+    data = client.post(
+        "/v1/auth/register",
+        json={"email": "batch@example.com", "password": "123456", "name": "Batch"},
+    ).json()["data"]
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    friend_id = client.post("/v1/friends", json={"name": "Ana"}, headers=headers).json()["data"][
+        "id"
+    ]
+    category_id = client.post("/v1/categories", json={"name": "Food"}, headers=headers).json()[
+        "data"
+    ]["id"]
+    return headers, data["user"]["id"], friend_id, category_id
+
+
+def expense_body(user_id, friend_id, description="Lunch"):
+    return {
+        "description": description,
+        "amount": "30.00",
+        "date": "2026-02-11",
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": user_id, "share_amount": "10.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "20.00"},
+        ],
+    }
+
+
+def create_expenses(client, headers, user_id, friend_id, count):
+    operations = [
+        {"op": "create", "data": expense_body(user_id, friend_id, f"Expense {i}")}
+        for i in range(count)
+    ]
+    response = client.post("/v1/expenses:batch", json={"operations": operations}, headers=headers)
+    assert response.status_code == 200, response.text
+    return [r["id"] for r in response.json()["data"]["results"]]
+
+
+def ledgers_match(client, db_engine):
+    async def check():
+        async with AsyncSession(db_engine) as db:
+            return await stored_balances(db) == await compute_balances(db) and await stored_rollups(
+                db
+            ) == await compute_rollups(db)
+
+    return client.portal.call(check)
+
+
+def test_batch_applies_mixed_operations_in_one_transaction(client, db_engine):
+    headers, user_id, friend_id, category_id = setup_owner(client)
+    ids = create_expenses(client, headers, user_id, friend_id, 4)
+
+    operations = [
+        {"op": "update", "id": ids[0], "data": {"category_id": category_id}},
+        {"op": "update", "id": ids[1], "data": {"category_id": category_id}},
+        {
+            "op": "update",
+            "id": ids[2],
+            "data": {
+                "amount": "50.00",
+                "splits": [
+                    {"participant_type": "friend", "friend_id": friend_id, "share_amount": "50.00"}
+                ],
+            },
+        },
+        {"op": "delete", "id": ids[3]},
+        {"op": "create", "data": expense_body(user_id, friend_id, "Dinner")},
+    ]
+    response = client.post("/v1/expenses:batch", json={"operations": operations}, headers=headers)
+    assert response.status_code == 200, response.text
+    results = response.json()["data"]["results"]
+    assert [(r["index"], r["status"]) for r in results] == [
+        (0, "updated"),
+        (1, "updated"),
+        (2, "updated"),
+        (3, "deleted"),
+        (4, "created"),
+    ]
+
+    expenses = {e["id"]: e for e in client.get("/v1/expenses", headers=headers).json()["data"]}
+    assert ids[3] not in expenses
+    assert expenses[ids[0]]["category_id"] == expenses[ids[1]]["category_id"] == category_id
+    assert expenses[ids[2]]["amount"] == "50.00"
+    assert [s["share_amount"] for s in expenses[ids[2]]["splits"]] == ["50.00"]
+    assert expenses[results[4]["id"]]["description"] == "Dinner"
+    assert ledgers_match(client, db_engine)
+
+
+def test_batch_update_with_null_splits_keeps_them_like_patch(client, db_engine):
+    headers, user_id, friend_id, _ = setup_owner(client)
+    ids = create_expenses(client, headers, user_id, friend_id, 2)
+
+    patched = client.patch(
+        f"/v1/expenses/{ids[0]}", json={"description": "Patched", "splits": None}, headers=headers
+    )
+    assert patched.status_code == 200, patched.text
+    operations = [
+        {"op": "update", "id": ids[1], "data": {"description": "Batched", "splits": None}}
+    ]
+    response = client.post("/v1/expenses:batch", json={"operations": operations}, headers=headers)
+    assert response.status_code == 200, response.text
+
+    expenses = {e["id"]: e for e in client.get("/v1/expenses", headers=headers).json()["data"]}
+    for expense_id, description in ((ids[0], "Patched"), (ids[1], "Batched")):
+        assert expenses[expense_id]["description"] == description
+        assert [s["share_amount"] for s in expenses[expense_id]["splits"]] == ["10.00", "20.00"]
+    assert ledgers_match(client, db_engine)
+
+
+def test_batch_is_rejected_as_a_whole_when_an_operation_is_invalid(client, db_engine):
+    headers, user_id, friend_id, _ = setup_owner(client)
+    ids = create_expenses(client, headers, user_id, friend_id, 2)
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    operations = [
+        {"op": "delete", "id": ids[0]},
+        {"op": "update", "id": ids[1], "data": {"category_id": missing}},
+        {"op": "update", "id": missing, "data": {"description": "Ghost"}},
+        {"op": "delete", "id": ids[0]},
+    ]
+    response = client.post("/v1/expenses:batch", json={"operations": operations}, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["error"]["details"] == [
+        {"index": 1, "errors": ["Invalid category_id"]},
+        {"index": 2, "errors": ["Expense not found"]},
+        {"index": 3, "errors": ["Expense appears in more than one operation"]},
+    ]
+    assert len(client.get("/v1/expenses", headers=headers).json()["data"]) == 2
+    assert ledgers_match(client, db_engine)
+
+
+def test_batch_query_count_does_not_grow_with_the_batch(client, db_engine):
+    headers, user_id, friend_id, category_id = setup_owner(client)
+    ids = create_expenses(client, headers, user_id, friend_id, 40)
+    statements = []
+
+    def count_statement(*_):
+        statements.append(1)
+
+    def recategorize(targets):
+        statements.clear()
+        operations = [
+            {"op": "update", "id": i, "data": {"category_id": category_id}} for i in targets
+        ]
+        event.listen(db_engine.sync_engine, "before_cursor_execute", count_statement)
+        try:
+            response = client.post(
+                "/v1/expenses:batch", json={"operations": operations}, headers=headers
+            )
+        finally:
+            event.remove(db_engine.sync_engine, "before_cursor_execute", count_statement)
+        assert response.status_code == 200, response.text
+        return len(statements)
+
+    # The first batch also creates the category's rollup row.
+    recategorize(ids[:2])
+    assert recategorize(ids[2:7]) == recategorize(ids[7:])
@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+
+
+def auth_header(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "export@example.com", "password": "123456", "name": "Export"},
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def create_expenses(client, headers, user_id):
+    friend = client.post("/v1/friends", json={"name": "Bia"}, headers=headers)
+    friend_id = friend.json()["data"]["id"]
+    for i, date in enumerate(["2026-01-10", "2026-02-10", "2026-03-10"]):
+        payload = {
+            "description": f"Market {i}",
+            "amount": "30.00",
+            "date": date,
+            "split_type": "amount",
+            "splits": [
+                {"participant_type": "user", "user_id": user_id, "share_amount": "20.00"},
+                {"participant_type": "friend", "friend_id": friend_id, "share_amount": "10.00"},
+            ],
+        }
+        assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+
+def test_ndjson_export_applies_list_filters(client):
+    headers, user_id = auth_header(client)
+    create_expenses(client, headers, user_id)
+
+    response = client.get("/v1/expenses/export?date_from=2026-02-01", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["description"] for r in rows] == ["Market 2", "Market 1"]
+    assert all(len(r["splits"]) == 2 for r in rows)
+
+
+def test_csv_export_can_be_imported_back(client):
+    headers, user_id = auth_header(client)
+    create_expenses(client, headers, user_id)
+
+    exported = client.get("/v1/expenses/export?format=csv", headers=headers)
+    assert exported.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(exported.text)))
+    assert len(rows) == 3
+    assert len(json.loads(rows[0]["splits"])) == 2
+
+    response = client.post(
+        "/v1/expenses/import",
+        content=exported.content,
+        headers={**headers, "Content-Type": "text/csv"},
+    )
+    assert response.json()["data"]["imported"] == 3
@@ -0,0 +1,67 @@
+import json
+
+
+def auth_header(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "import@example.com", "password": "123456", "name": "Import"},
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def test_import_csv_reports_bad_rows(client):
+    headers, _ = auth_header(client)
+    body = (
+        "description,amount,currency,date\n"
+        'Groceries,"12.50",BRL,2026-02-01\n'
+        '"Dinner, with\nfriends",40.00,BRL,2026-02-02\n'
+        "Broken,-5,BRL,2026-02-03\n"
+    )
+    response = client.post(
+        "/v1/expenses/import", content=body, headers={**headers, "Content-Type": "text/csv"}
+    )
+    assert response.status_code == 200
+    report = response.json()["data"]
+    assert report["imported"] == 2
+    assert report["failed"] == 1
+    assert report["errors"][0]["row"] == 3
+
+    listed = client.get("/v1/expenses", headers=headers).json()
+    assert listed["meta"]["total"] == 2
+    assert {e["description"] for e in listed["data"]} == {"Groceries", "Dinner, with\nfriends"}
+
+    spend = client.get("/v1/reports/spend", headers=headers).json()["data"]
+    assert [(r["period"], r["amount"], r["expenses"]) for r in spend] == [
+        ("2026-02-01", "52.50", 2)
+    ]
+
+
+def test_import_ndjson_with_splits_updates_balances(client):
+    headers, user_id = auth_header(client)
+    friend = client.post("/v1/friends", json={"name": "Caio"}, headers=headers)
+    friend_id = friend.json()["data"]["id"]
+    rows = [
+        {
+            "description": f"Taxi {i}",
+            "amount": "20.00",
+            "date": "2026-03-01",
+            "split_type": "amount",
+            "splits": [
+                {"participant_type": "user", "user_id": user_id, "share_amount": "10.00"},
+                {"participant_type": "friend", "friend_id": friend_id, "share_amount": "10.00"},
+            ],
+        }
+        for i in range(3)
+    ]
+    rows.append({**rows[0], "category_id": "00000000-0000-0000-0000-000000000000"})
+    body = "\n".join(json.dumps(r) for r in rows) + "\nnot json\n"
+
+    response = client.post("/v1/expenses/import?format=ndjson", content=body, headers=headers)
+    report = response.json()["data"]
+    assert report["imported"] == 3
+    assert [e["row"] for e in report["errors"]] == [4, 5]
+
+    balances = client.get("/v1/balances", headers=headers).json()["data"]
+    assert balances[0]["counterparty_id"] == friend_id
+    assert balances[0]["amount"] == "30.00"
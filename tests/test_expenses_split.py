@@ -1,3 +1,10 @@
+import uuid
+
+from sqlalchemy import event
+
+from app.services.count_cache import count_cache
+
+
 def auth_header(client):
     response = client.post(
         "/v1/auth/register",
@@ -8,8 +15,13 @@ def auth_header(client):
     return {"Authorization": f"Bearer {token}"}, user_id
 
 
+def create_friend(client, headers, name="Bia"):
+    return client.post("/v1/friends", json={"name": name}, headers=headers).json()["data"]["id"]
+
+
 def test_create_expense_valid_split_amount(client):
     headers, user_id = auth_header(client)
+    friend_id = create_friend(client, headers)
     payload = {
         "description": "Dinner",
         "amount": "100.00",
@@ -18,7 +30,7 @@ def test_create_expense_valid_split_amount(client):
         "split_type": "amount",
         "splits": [
             {"participant_type": "user", "user_id": user_id, "share_amount": "60.00"},
-            {"participant_type": "user", "user_id": user_id, "share_amount": "40.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "40.00"},
         ],
     }
     response = client.post("/v1/expenses", json=payload, headers=headers)
@@ -28,6 +40,7 @@ def test_create_expense_valid_split_amount(client):
 
 def test_create_expense_invalid_split_amount(client):
     headers, user_id = auth_header(client)
+    friend_id = create_friend(client, headers)
     payload = {
         "description": "Dinner",
         "amount": "100.00",
@@ -36,8 +49,102 @@ def test_create_expense_invalid_split_amount(client):
         "split_type": "amount",
         "splits": [
             {"participant_type": "user", "user_id": user_id, "share_amount": "30.00"},
-            {"participant_type": "user", "user_id": user_id, "share_amount": "40.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "40.00"},
+        ],
+    }
+    response = client.post("/v1/expenses", json=payload, headers=headers)
+    assert response.status_code == 422
+
+
+def test_list_expenses_query_count_is_constant(client, db_engine):
+    headers, user_id = auth_header(client)
+    friend_id = create_friend(client, headers)
+    for i in range(30):
+        payload = {
+            "description": f"Expense {i}",
+            "amount": "10.00",
+            "currency": "BRL",
+            "date": "2026-02-11",
+            "split_type": "amount",
+            "splits": [
+                {"participant_type": "user", "user_id": user_id, "share_amount": "4.00"},
+                {"participant_type": "friend", "friend_id": friend_id, "share_amount": "6.00"},
+            ],
+        }
+        assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+    statements = []
+
+    def count_statement(*_):
+        statements.append(1)
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    try:
+        counts = []
+        for limit in (2, 30):
+            statements.clear()
+            count_cache.clear()
+            response = client.get(f"/v1/expenses?limit={limit}", headers=headers)
+            assert response.status_code == 200
+            assert len(response.json()["data"]) == limit
+            assert all(len(e["splits"]) == 2 for e in response.json()["data"])
+            counts.append(len(statements))
+    finally:
+        event.remove(engine, "before_cursor_execute", count_statement)
+
+    assert counts[0] == counts[1]
+    assert counts[0] <= 4
+
+
+def test_split_errors_are_reported_per_participant(client):
+    headers, user_id = auth_header(client)
+    friend_id = create_friend(client, headers)
+    payload = {
+        "description": "Trip",
+        "amount": "90.00",
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": user_id, "share_amount": "30.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "30.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "10.00"},
+            {"participant_type": "friend", "friend_id": str(uuid.uuid4())},
         ],
     }
     response = client.post("/v1/expenses", json=payload, headers=headers)
     assert response.status_code == 422
+    assert response.json()["error"]["details"] == {
+        "2": ["Duplicate participant"],
+        "3": ["Invalid friend participant", "share_amount is required for amount split"],
+    }
+
+
+def test_participants_are_checked_with_one_query_per_type(client, db_engine):
+    headers, user_id = auth_header(client)
+    friend_ids = [create_friend(client, headers, f"Friend {i}") for i in range(20)]
+    payload = {
+        "description": "Party",
+        "amount": "105.00",
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": user_id, "share_amount": "5.00"},
+            *(
+                {"participant_type": "friend", "friend_id": f, "share_amount": "5.00"}
+                for f in friend_ids
+            ),
+        ],
+    }
+    statements = []
+
+    def record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    friend_lookups = [s for s in statements if s.lstrip().startswith("SELECT friends.id")]
+    assert len(friend_lookups) == 1
@@ -0,0 +1,88 @@
+import datetime as dt
+from decimal import Decimal
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+
+def register(client, email):
+    response = client.post(
+        "/v1/auth/register", json={"email": email, "password": "123456", "name": "Fx"}
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def upload(client, headers, body):
+    return client.post(
+        "/v1/fx-rates", content=body, headers={**headers, "Content-Type": "text/csv"}
+    )
+
+
+def create_expense(client, headers, user_id, friend_id, amount, currency, date):
+    half = str(Decimal(amount) / 2)
+    payload = {
+        "description": "Trip",
+        "amount": amount,
+        "currency": currency,
+        "date": date,
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": user_id, "share_amount": half},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": half},
+        ],
+    }
+    assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+
+def test_rate_upload_is_admin_only(client, monkeypatch):
+    headers, _ = register(client, "fx@example.com")
+    assert upload(client, headers, "currency,date,rate\nUSD,2026-01-30,5\n").status_code == 403
+
+    monkeypatch.setattr(settings, "admin_emails", ["fx@example.com"])
+    assert upload(client, headers, "currency,date,rate\nUSD,not-a-date,5\n").status_code == 422
+    response = upload(client, headers, "currency,date,rate\nUSD,2026-01-30,5\n")
+    assert response.json()["data"] == {"imported": 1}
+
+
+def test_reports_and_balances_convert_to_target_currency(client, db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "admin_emails", ["fx@example.com"])
+    headers, user_id = register(client, "fx@example.com")
+    friend = client.post("/v1/friends", json={"name": "Lia"}, headers=headers).json()["data"]
+    today = dt.date.today().isoformat()
+    rates = f"currency,date,rate\nUSD,2026-01-28,5.00\nUSD,{today},5.50\nEUR,{today},6.00\n"
+    assert upload(client, headers, rates).status_code == 200
+
+    create_expense(client, headers, user_id, friend["id"], "20.00", "USD", "2026-01-10")
+    create_expense(client, headers, user_id, friend["id"], "30.00", "BRL", "2026-01-12")
+
+    statements = []
+
+    def record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        spend = client.get("/v1/reports/spend?target_currency=BRL", headers=headers).json()
+        # Jan 31 falls back to the Jan 28 rate.
+        assert [(r["period"], r["currency"], r["amount"]) for r in spend["data"]] == [
+            ("2026-01-01", "BRL", "130.00")
+        ]
+        assert len([s for s in statements if "FROM fx_rates" in s]) == 1
+
+        statements.clear()
+        client.get("/v1/reports/spend?target_currency=BRL", headers=headers)
+        assert not [s for s in statements if "FROM fx_rates" in s]
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    balances = client.get("/v1/balances?target_currency=EUR", headers=headers).json()["data"]
+    # 10 USD at 5.50 plus 15 BRL, in EUR at 6.00.
+    assert [(b["counterparty_id"], b["currency"], b["amount"]) for b in balances] == [
+        (friend["id"], "EUR", "11.67")
+    ]
+
+    missing = client.get("/v1/reports/spend?target_currency=GBP", headers=headers)
+    assert missing.status_code == 422
@@ -0,0 +1,109 @@
+import datetime as dt
+
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Expense, IdempotencyKey
+from app.services.idempotency import sweep_expired
+
+
+def setup_owner(client):
+    data = client.post(
+        "/v1/auth/register",
+        json={"email": "retry@example.com", "password": "123456", "name": "Retry"},
+    ).json()["data"]
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    friend_id = client.post("/v1/friends", json={"name": "Ana"}, headers=headers).json()["data"][
+        "id"
+    ]
+    return headers, data["user"]["id"], friend_id
+
+
+def expense_body(user_id, friend_id, amount="30.00"):
+    return {
+        "description": "Taxi",
+        "amount": amount,
+        "date": "2026-02-11",
+        "split_type": "amount",
+        "splits": [
+            {"participant_type": "user", "user_id": user_id, "share_amount": "10.00"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_amount": "20.00"},
+        ],
+    }
+
+
+def count(client, db_engine, model):
+    async def run():
+        async with AsyncSession(db_engine) as db:
+            return await db.scalar(select(func.count()).select_from(model))
+
+    return client.portal.call(run)
+
+
+def test_retry_with_the_same_key_replays_the_original_response(client, db_engine):
+    headers, user_id, friend_id = setup_owner(client)
+    keyed = {**headers, "Idempotency-Key": "taxi-1"}
+    first = client.post("/v1/expenses", json=expense_body(user_id, friend_id), headers=keyed)
+    retry = client.post("/v1/expenses", json=expense_body(user_id, friend_id), headers=keyed)
+
+    assert first.status_code == retry.status_code == 200
+    assert retry.content == first.content
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert count(client, db_engine, Expense) == 1
+    balances = client.get("/v1/balances", headers=headers).json()["data"]
+    assert [b["amount"] for b in balances] == ["20.00"]
+
+
+def test_key_reused_with_another_request_is_rejected(client):
+    headers, user_id, friend_id = setup_owner(client)
+    keyed = {**headers, "Idempotency-Key": "taxi-2"}
+    assert (
+        client.post("/v1/expenses", json=expense_body(user_id, friend_id), headers=keyed)
+    ).status_code == 200
+    other = expense_body(user_id, friend_id, amount="31.00")
+    other["splits"][0]["share_amount"] = "11.00"
+    assert client.post("/v1/expenses", json=other, headers=keyed).status_code == 422
+
+
+def test_failed_write_releases_the_key(client, db_engine):
+    headers, user_id, friend_id = setup_owner(client)
+    keyed = {**headers, "Idempotency-Key": "taxi-3"}
+    invalid = expense_body(user_id, friend_id, amount="99.00")
+    assert client.post("/v1/expenses", json=invalid, headers=keyed).status_code == 422
+    assert count(client, db_engine, IdempotencyKey) == 0
+    response = client.post("/v1/expenses", json=expense_body(user_id, friend_id), headers=keyed)
+    assert response.status_code == 200
+    assert "idempotent-replayed" not in response.headers
+
+
+def test_expired_keys_are_reusable_and_swept(client, db_engine):
+    headers, user_id, friend_id = setup_owner(client)
+    for key in ("old-1", "old-2"):
+        client.post(
+            "/v1/expenses",
+            json=expense_body(user_id, friend_id),
+            headers={**headers, "Idempotency-Key": key},
+        )
+
+    async def expire_all():
+        async with AsyncSession(db_engine) as db:
+            past = dt.datetime.now(dt.UTC) - dt.timedelta(seconds=1)
+            await db.execute(update(IdempotencyKey).values(expires_at=past))
+            await db.commit()
+
+    client.portal.call(expire_all)
+    response = client.post(
+        "/v1/expenses",
+        json=expense_body(user_id, friend_id),
+        headers={**headers, "Idempotency-Key": "old-1"},
+    )
+    assert "idempotent-replayed" not in response.headers
+    assert count(client, db_engine, Expense) == 3
+
+    async def sweep():
+        async with AsyncSession(db_engine) as db:
+            return await sweep_expired(db)
+
+    assert client.portal.call(sweep) == 1
+    assert count(client, db_engine, IdempotencyKey) == 1
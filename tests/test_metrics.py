@@ -0,0 +1,41 @@
+import re
+
+from app.core.metrics import request_metrics
+
+
+def sample(text: str, name: str, **labels) -> float:
+    selector = ",".join(f'{k}="{v}"' for k, v in labels.items())
+    match = re.search(rf"^{name}{{{re.escape(selector)}}} (\S+)$", text, re.MULTILINE)
+    assert match, f"{name}{{{selector}}} not in metrics"
+    return float(match.group(1))
+
+
+def test_metrics_report_route_templates_latency_and_queries(client):
+    request_metrics.reset()
+    token = client.post(
+        "/v1/auth/register",
+        json={"email": "metrics@example.com", "password": "123456", "name": "Metrics"},
+    ).json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    friend = client.post("/v1/friends", json={"name": "Ana"}, headers=headers).json()["data"]
+    for _ in range(2):
+        assert client.get(f"/v1/friends/{friend['id']}", headers=headers).status_code == 200
+    assert client.get("/v1/friends/not-a-uuid", headers=headers).status_code == 422
+    assert client.get("/nowhere").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    route = {"method": "GET", "route": "/v1/friends/{friend_id}"}
+    assert sample(text, "http_requests_total", **route, status=200) == 2
+    assert sample(text, "http_requests_total", **route, status=422) == 1
+    assert sample(text, "http_requests_total", method="GET", route="unmatched", status=404) == 1
+    assert sample(text, "http_request_duration_seconds_count", **route) == 3
+    assert sample(text, "http_request_duration_seconds_bucket", **route, le="+Inf") == 3
+    assert sample(text, "http_request_db_statements_count", **route) == 3
+    assert sample(text, "http_request_db_statements_sum", **route) > 0
+    assert sample(text, "http_request_db_seconds_sum", **route) > 0
+    # Series are labelled with the template, never the raw path.
+    assert "/v1/friends/not-a-uuid" not in text
@@ -0,0 +1,153 @@
+from sqlalchemy import event
+
+
+def auth_header(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "page@example.com", "password": "123456", "name": "Page"},
+    )
+    token = response.json()["data"]["access_token"]
+    user_id = response.json()["data"]["user"]["id"]
+    return {"Authorization": f"Bearer {token}"}, user_id
+
+
+def walk_cursor(client, url, headers, first):
+    seen = [item["id"] for item in first["data"]]
+    cursor = first["meta"]["next_cursor"]
+    for _ in range(20):
+        if cursor is None:
+            return seen
+        body = client.get(f"{url}&cursor={cursor}", headers=headers).json()
+        assert body["meta"]["total"] is None
+        seen.extend(item["id"] for item in body["data"])
+        assert body["meta"]["next_cursor"] != cursor
+        cursor = body["meta"]["next_cursor"]
+    raise AssertionError("cursor pagination did not terminate")
+
+
+def test_cursor_pagination_walks_every_row_once(client):
+    headers, _ = auth_header(client)
+    for i in range(7):
+        response = client.post("/v1/friends", json={"name": f"Friend {i}"}, headers=headers)
+        assert response.status_code == 200
+
+    first = client.get("/v1/friends?limit=3", headers=headers).json()
+    assert first["meta"]["total"] == 7
+    seen = walk_cursor(client, "/v1/friends?limit=3", headers, first)
+
+    assert len(seen) == 7
+    assert len(set(seen)) == 7
+
+
+def test_cursor_pagination_over_expenses_sharing_a_date(client):
+    headers, user_id = auth_header(client)
+    for i in range(5):
+        payload = {
+            "description": f"Expense {i}",
+            "amount": "10.00",
+            "date": "2026-02-11",
+            "split_type": "amount",
+            "splits": [{"participant_type": "user", "user_id": user_id, "share_amount": "10.00"}],
+        }
+        assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+    first = client.get("/v1/expenses?limit=2", headers=headers).json()
+    seen = walk_cursor(client, "/v1/expenses?limit=2", headers, first)
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_last_offset_page_has_no_next_cursor(client):
+    headers, _ = auth_header(client)
+    for i in range(3):
+        client.post("/v1/groups", json={"name": f"Group {i}"}, headers=headers)
+
+    body = client.get("/v1/groups?limit=3", headers=headers).json()
+    assert len(body["data"]) == 3
+    assert body["meta"]["next_cursor"] is None
+
+
+def test_invalid_cursor_is_rejected(client):
+    headers, _ = auth_header(client)
+    response = client.get("/v1/categories?cursor=not-a-cursor", headers=headers)
+    assert response.status_code == 422
+
+
+def test_total_can_be_omitted(client):
+    headers, _ = auth_header(client)
+    client.post("/v1/friends", json={"name": "Solo"}, headers=headers)
+
+    meta = client.get("/v1/friends?include_total=false", headers=headers).json()["meta"]
+    assert meta["total"] is None
+    assert meta["total_kind"] == "omitted"
+
+
+def test_cached_total_is_reused_and_invalidated_by_writes(client, db_engine):
+    headers, _ = auth_header(client)
+    client.post("/v1/categories", json={"name": "Food"}, headers=headers)
+
+    statements = []
+
+    def record(_conn, _cursor, statement, *_):
+        statements.append(statement)
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        first = client.get("/v1/categories", headers=headers).json()["meta"]
+        second = client.get("/v1/categories", headers=headers).json()["meta"]
+        counts = [s for s in statements if "count(*)" in s]
+        assert first["total"] == second["total"] == 1
+        assert first["total_kind"] == "exact"
+        assert len(counts) == 1
+
+        client.post("/v1/categories", json={"name": "Travel"}, headers=headers)
+        third = client.get("/v1/categories", headers=headers).json()["meta"]
+        assert third["total"] == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def test_cursor_page_seeks_on_the_keyset_index(client, db_engine):
+    headers, user_id = auth_header(client)
+    for i in range(3):
+        client.post("/v1/friends", json={"name": f"Friend {i}"}, headers=headers)
+        payload = {
+            "description": f"Expense {i}",
+            "amount": "10.00",
+            "date": "2026-02-11",
+            "split_type": "amount",
+            "splits": [{"participant_type": "user", "user_id": user_id, "share_amount": "10.00"}],
+        }
+        client.post("/v1/expenses", json=payload, headers=headers)
+
+    seeks = []
+
+    def record(_conn, _cursor, statement, parameters, *_):
+        if " < (" in statement:
+            seeks.append((statement, parameters))
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        for url in ("/v1/expenses?limit=1", "/v1/friends?limit=1"):
+            cursor = client.get(url, headers=headers).json()["meta"]["next_cursor"]
+            assert client.get(f"{url}&cursor={cursor}", headers=headers).status_code == 200
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    async def plans():
+        async with db_engine.connect() as conn:
+            return [
+                (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)).all()
+                for statement, params in seeks
+            ]
+
+    # The whole keyset is the index range, not a filter applied to every row before it.
+    expected = [
+        "SEARCH expenses USING INDEX ix_expenses_owner_date_id (owner_id=? AND (date,id)<(?,?))",
+        "SEARCH friends USING INDEX ix_friends_owner_created_at_id "
+        "(owner_id=? AND (created_at,id)<(?,?))",
+    ]
+    assert [plan[0][-1] for plan in client.portal.call(plans)] == expected
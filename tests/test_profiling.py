@@ -0,0 +1,82 @@
+import json
+import logging
+
+from sqlalchemy import event
+
+from app.core import profiling
+from app.core.config import settings
+
+
+def register(client, email="profile@example.com"):
+    token = client.post(
+        "/v1/auth/register",
+        json={"email": email, "password": "123456", "name": "Profile"},
+    ).json()["data"]["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_profile_header_returns_summary_and_logs_statements(client, caplog):
+    headers = register(client)
+    client.post("/v1/friends", json={"name": "Ana"}, headers=headers)
+
+    assert "x-sql-profile" not in client.get("/v1/friends", headers=headers).headers
+
+    with caplog.at_level(logging.INFO, logger="app.sql.profile"):
+        response = client.get("/v1/friends", headers={**headers, "X-SQL-Profile": "1"})
+    assert response.status_code == 200
+    summary = dict(item.split("=") for item in response.headers["x-sql-profile"].split("; "))
+    assert int(summary["statements"]) >= 2
+    assert float(summary["db_ms"]) >= float(summary["slowest_ms"]) > 0
+
+    record = json.loads(caplog.records[-1].getMessage().split(" ", 2)[2])
+    assert record["statements"] == int(summary["statements"])
+    query = next(q for q in record["queries"] if "FROM friends" in q["statement"])
+    # Parameter types are recorded, never their values.
+    assert "UUID" in query["params"] or "str" in query["params"]
+    assert "Ana" not in json.dumps(record)
+
+
+def test_profiling_can_be_sampled(client, monkeypatch):
+    headers = register(client)
+    monkeypatch.setattr(settings, "sql_profile_sample_rate", 1.0)
+    assert "x-sql-profile" in client.get("/v1/auth/me", headers=headers).headers
+
+
+def test_slow_statements_are_logged_with_their_plan(client, monkeypatch, caplog):
+    headers = register(client)
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 1e-6)
+    with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+        client.get("/v1/friends", headers=headers)
+    slow = [r for r in caplog.records if r.name == "app.sql.slow" and "FROM friends" in r.sql]
+    assert slow
+    assert "friends" in slow[0].plan
+
+
+def test_failed_explain_does_not_fail_the_request(client, db_engine, monkeypatch, caplog):
+    headers = register(client)
+    monkeypatch.setattr(settings, "slow_query_threshold_ms", 1e-6)
+
+    def fail_explain(_conn, _cursor, statement, *_):
+        if statement.startswith("EXPLAIN"):
+            raise RuntimeError("EXPLAIN is unavailable")
+
+    engine = db_engine.sync_engine
+    event.listen(engine, "before_cursor_execute", fail_explain)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.sql.slow"):
+            created = client.post("/v1/friends", json={"name": "Ana"}, headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", fail_explain)
+
+    assert created.status_code == 200
+    # The transaction went on after the failed EXPLAIN and committed the friend.
+    listed = client.get("/v1/friends", headers=headers).json()["data"]
+    assert [friend["name"] for friend in listed] == ["Ana"]
+    slow = [r for r in caplog.records if getattr(r, "plan", None) == "(EXPLAIN failed)"]
+    assert slow
+
+
+def test_param_shape_summarizes_long_and_batched_parameters():
+    assert profiling.param_shape({"id": 1, "name": "a"}, False) == "(id: int, name: str)"
+    assert profiling.param_shape([(1, "a"), (2, "b")], True) == "2 x (int, str)"
+    assert profiling.param_shape(tuple(range(20)), False) == "20 params: 20 int"
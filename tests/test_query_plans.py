@@ -0,0 +1,370 @@
+"""Query-plan regression suite.
+
+Seeds a dataset, records every statement a route issues and fails when a route goes over its
+query budget, when a statement's plan falls back to a full scan of an application table or
+when a page is not read as a range of its keyset index.
+"""
+
+import datetime as dt
+import re
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.auth_cache import principal_cache
+from app.core.config import settings
+from app.core.security import create_access_token, get_password_hash
+from app.models import Category, Expense, ExpenseSplit, Friend, FxRate, Group, User
+from app.models.enums import ParticipantType, SplitType
+from app.services.balance_service import rebuild_balances
+from app.services.count_cache import count_cache
+from app.services.fx_service import fx_cache
+from app.services.rollup_service import rebuild_rollups
+
+SEED_USERS = 10
+SEED_FRIENDS = 40
+SEED_GROUPS = 10
+SEED_CATEGORIES = 10
+SEED_EXPENSES = 200
+SEED_PASSWORD = "plan-password"
+
+# Tables whose full scan in a request path is a regression.
+APP_TABLES = {
+    "users",
+    "friends",
+    "groups",
+    "categories",
+    "expenses",
+    "expense_splits",
+    "balances",
+    "spend_rollups",
+    "fx_rates",
+    "collection_versions",
+}
+
+
+def seed_rows() -> dict:
+    models = (User, Friend, Group, Category, Expense, ExpenseSplit, FxRate)
+    rows = {model: [] for model in models}
+    password_hash = get_password_hash(SEED_PASSWORD)
+    start = dt.date(2026, 1, 1)
+    rows[FxRate] = [
+        {
+            "id": uuid.uuid4(),
+            "currency": currency,
+            "rate_date": start + dt.timedelta(days=d),
+            "rate": rate,
+        }
+        for currency, rate in (("USD", Decimal("5.5")), ("EUR", Decimal("6")))
+        for d in range((dt.date.today() - start).days + 1)
+    ]
+    for u in range(SEED_USERS):
+        user_id = uuid.uuid4()
+        rows[User].append(
+            {
+                "id": user_id,
+                "email": f"plan{u}@example.com",
+                "name": f"U{u}",
+                "password_hash": password_hash,
+            }
+        )
+        friends = [uuid.uuid4() for _ in range(SEED_FRIENDS)]
+        groups = [uuid.uuid4() for _ in range(SEED_GROUPS)]
+        categories = [uuid.uuid4() for _ in range(SEED_CATEGORIES)]
+        rows[Friend] += [{"id": f, "owner_id": user_id, "name": f"Friend {f}"} for f in friends]
+        rows[Group] += [{"id": g, "owner_id": user_id, "name": f"Group {g}"} for g in groups]
+        rows[Category] += [
+            {"id": c, "owner_id": user_id, "name": f"Category {c}"} for c in categories
+        ]
+        for e in range(SEED_EXPENSES):
+            expense_id = uuid.uuid4()
+            rows[Expense].append(
+                {
+                    "id": expense_id,
+                    "owner_id": user_id,
+                    "description": f"Expense {e}",
+                    "amount": Decimal("20.00"),
+                    "currency": "BRL",
+                    "date": dt.date(2026, 1, 1) + dt.timedelta(days=e % 300),
+                    "category_id": categories[e % SEED_CATEGORIES],
+                    "group_id": groups[e % SEED_GROUPS],
+                    "split_type": SplitType.amount,
+                }
+            )
+            rows[ExpenseSplit] += [
+                {
+                    "id": uuid.uuid4(),
+                    "expense_id": expense_id,
+                    "participant_type": ParticipantType.user,
+                    "participant_user_id": user_id,
+                    "participant_friend_id": None,
+                    "share_amount": Decimal("10.00"),
+                },
+                {
+                    "id": uuid.uuid4(),
+                    "expense_id": expense_id,
+                    "participant_type": ParticipantType.friend,
+                    "participant_user_id": None,
+                    "participant_friend_id": friends[e % SEED_FRIENDS],
+                    "share_amount": Decimal("10.00"),
+                },
+            ]
+    # Unreferenced rows of the first user for the DELETE routes.
+    owner_id = rows[User][0]["id"]
+    rows[Friend].append({"id": uuid.uuid4(), "owner_id": owner_id, "name": "Spare friend"})
+    rows[Group].append({"id": uuid.uuid4(), "owner_id": owner_id, "name": "Spare group"})
+    rows[Category].append({"id": uuid.uuid4(), "owner_id": owner_id, "name": "Spare category"})
+    rows[Expense].append(
+        {
+            "id": uuid.uuid4(),
+            "owner_id": owner_id,
+            "description": "Spare expense",
+            "amount": Decimal("5.00"),
+            "currency": "BRL",
+            "date": dt.date(2026, 1, 1),
+            "split_type": SplitType.amount,
+        }
+    )
+    return rows
+
+
+@pytest.fixture()
+def seeded(client, db_engine):
+    rows = seed_rows()
+
+    async def load():
+        async with AsyncSession(db_engine) as db:
+            for model, values in rows.items():
+                await db.execute(insert(model), values)
+            await rebuild_balances(db)
+            await rebuild_rollups(db)
+            await db.commit()
+        async with db_engine.begin() as conn:
+            await conn.execute(text("ANALYZE"))
+
+    client.portal.call(load)
+    user = rows[User][0]
+    ids = {
+        "user_id": user["id"],
+        "expense_id": rows[Expense][0]["id"],
+        "friend_id": rows[Friend][0]["id"],
+        "group_id": rows[Group][0]["id"],
+        "category_id": rows[Category][0]["id"],
+        "spare_friend_id": rows[Friend][-1]["id"],
+        "spare_group_id": rows[Group][-1]["id"],
+        "spare_category_id": rows[Category][-1]["id"],
+        "spare_expense_id": rows[Expense][-1]["id"],
+    }
+    headers = {"Authorization": f"Bearer {create_access_token(str(user['id']))}"}
+    return client, headers, ids
+
+
+EXPENSE_BODY = {
+    "description": "Lunch",
+    "amount": "30.00",
+    "date": "2026-02-11",
+    "category_id": "{category_id}",
+    "group_id": "{group_id}",
+    "split_type": "amount",
+    "splits": [
+        {"participant_type": "user", "user_id": "{user_id}", "share_amount": "10.00"},
+        {"participant_type": "friend", "friend_id": "{friend_id}", "share_amount": "20.00"},
+    ],
+}
+
+BATCH_BODY = {
+    "operations": [
+        {"op": "update", "id": "{expense_id}", "data": {"category_id": "{category_id}"}},
+        {"op": "create", "data": EXPENSE_BODY},
+    ]
+}
+
+IMPORT_CSV = (
+    "description,amount,currency,date,category_id\n"
+    "Taxi,15.00,BRL,2026-02-12,{category_id}\n"
+    "Bus,4.50,BRL,2026-02-13,\n"
+)
+
+FX_RATES_CSV = "currency,date,rate\nUSD,2026-02-11,5.4\nEUR,2026-02-11,5.9\n"
+
+ROUTES = [
+    # (method, path, body, query budget, in-memory sort allowed). A str body is sent as
+    # CSV, anything else as JSON; ``{cursor}`` is the next_cursor of the listing's first
+    # page. Text searches go through the trigram/FTS index first, so their page is
+    # necessarily sorted in memory.
+    (
+        "POST",
+        "/v1/auth/register",
+        {"email": "plan-new@example.com", "password": "123456", "name": "New"},
+        3,
+        False,
+    ),
+    (
+        "POST",
+        "/v1/auth/login",
+        {"email": "plan0@example.com", "password": SEED_PASSWORD},
+        1,
+        False,
+    ),
+    ("GET", "/v1/auth/me", None, 1, False),
+    ("GET", "/v1/friends", None, 4, False),
+    ("GET", "/v1/friends?limit=5&cursor={cursor}", None, 3, False),
+    ("GET", "/v1/friends?name=Friend", None, 4, True),
+    ("POST", "/v1/friends", {"name": "New friend"}, 4, False),
+    ("GET", "/v1/friends/{friend_id}", None, 3, False),
+    ("PATCH", "/v1/friends/{friend_id}", {"notes": "updated"}, 5, False),
+    ("DELETE", "/v1/friends/{spare_friend_id}", None, 4, False),
+    ("GET", "/v1/groups", None, 4, False),
+    ("GET", "/v1/groups?limit=5&cursor={cursor}", None, 3, False),
+    ("POST", "/v1/groups", {"name": "New group"}, 4, False),
+    ("GET", "/v1/groups/{group_id}", None, 3, False),
+    ("GET", "/v1/groups/{group_id}/settlements", None, 4, False),
+    ("PATCH", "/v1/groups/{group_id}", {"name": "Renamed"}, 5, False),
+    ("DELETE", "/v1/groups/{spare_group_id}", None, 4, False),
+    ("GET", "/v1/categories", None, 4, False),
+    ("GET", "/v1/categories?limit=5&cursor={cursor}", None, 3, False),
+    ("GET", "/v1/categories/{category_id}", None, 3, False),
+    ("POST", "/v1/categories", {"name": "New category"}, 4, False),
+    ("PATCH", "/v1/categories/{category_id}", {"color": "#22c55e"}, 5, False),
+    ("DELETE", "/v1/categories/{spare_category_id}", None, 4, False),
+    ("GET", "/v1/expenses", None, 5, False),
+    ("GET", "/v1/expenses?limit=5&cursor={cursor}", None, 4, False),
+    ("GET", "/v1/expenses?category_id={category_id}&date_from=2026-03-01", None, 5, False),
+    ("GET", "/v1/expenses?q=Expense%2012&sort=relevance", None, 5, True),
+    ("GET", "/v1/expenses/export", None, 3, False),
+    ("GET", "/v1/expenses/{expense_id}", None, 4, False),
+    ("POST", "/v1/expenses", EXPENSE_BODY, 13, False),
+    ("PATCH", "/v1/expenses/{expense_id}", {"description": "Renamed"}, 9, False),
+    ("POST", "/v1/expenses:batch", BATCH_BODY, 14, False),
+    ("POST", "/v1/expenses/import", IMPORT_CSV, 11, False),
+    ("DELETE", "/v1/expenses/{spare_expense_id}", None, 6, False),
+    ("GET", "/v1/balances", None, 3, False),
+    ("GET", "/v1/reports/spend?by=group&date_from=2026-03-01", None, 3, False),
+    ("GET", "/v1/balances?by_group=true&group_id={group_id}", None, 3, False),
+    ("GET", "/v1/reports/spend?target_currency=USD", None, 3, False),
+    ("GET", "/v1/balances?target_currency=EUR", None, 3, False),
+    ("POST", "/v1/fx-rates", FX_RATES_CSV, 2, False),
+]
+
+
+def fill(body, ids: dict):
+    if isinstance(body, dict):
+        return {k: fill(v, ids) for k, v in body.items()}
+    if isinstance(body, list):
+        return [fill(v, ids) for v in body]
+    return body.format(**ids) if isinstance(body, str) else body
+
+
+def seek_columns(statement: str) -> list[str]:
+    """ORDER BY columns of a paginated ``statement`` that its WHERE clause also compares.
+
+    Those bound the page (a cursor seek or a range filter), so the index condition has to
+    contain them; otherwise the database filters every row in front of the page.
+    """
+    match = re.search(r"\bWHERE\b(.*)\bORDER BY\b(.*?)\bLIMIT\b", statement, re.S)
+    if match is None:
+        return []
+    where, order_by = match.groups()
+    columns = [term.split()[0] for term in order_by.split(",")]
+    return [c.split(".")[-1] for c in columns if re.search(rf"{re.escape(c)}\b", where)]
+
+
+def plan_problems(conn, statement: str, parameters) -> list[str]:
+    """Return the application tables ``statement`` reads with a full scan.
+
+    Paginated statements (with a LIMIT) must also be served in index order: an in-memory
+    sort there is reported as ``"sort"``, and a page bound the index condition does not
+    cover as ``"seek:<column>"``.
+    """
+    paginated = re.search(r"\bLIMIT\b", statement) is not None
+    if conn.dialect.name == "postgresql":
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        conn.exec_driver_sql("SET LOCAL enable_sort = off")
+        plan = str(conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar())
+        problems = re.findall(r"'Node Type': 'Seq Scan'.*?'Relation Name': '(\w+)'", plan)
+        if paginated and "'Node Type': 'Sort'" in plan:
+            problems.append("sort")
+        conditions = " ".join(re.findall(r"'Index Cond': '([^']*)'", plan))
+    else:
+        details = [
+            row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        ]
+        problems = [m.group(1) for d in details if (m := re.match(r"SCAN (\w+)", d))]
+        if paginated and any(
+            d.startswith("USE TEMP B-TREE FOR") and "ORDER BY" in d for d in details
+        ):
+            problems.append("sort")
+        conditions = " ".join(
+            m.group(1) for d in details if (m := re.match(r"SEARCH .*INDEX \w+ \((.*)\)$", d))
+        )
+    if paginated:
+        problems += [
+            f"seek:{column}"
+            for column in seek_columns(statement)
+            if not re.search(rf"\b{column}\b", conditions)
+        ]
+    return [p for p in problems if p in APP_TABLES or p == "sort" or p.startswith("seek:")]
+
+
+def test_route_plans_stay_indexed_and_within_budget(seeded, db_engine, monkeypatch):
+    client, headers, ids = seeded
+    monkeypatch.setattr(settings, "admin_emails", ["plan0@example.com"])
+    statements = []
+
+    def record(_conn, _cursor, statement, parameters, *_):
+        statements.append((statement, parameters))
+
+    def explain(conn):
+        return {
+            statement: scans
+            for statement, parameters in statements
+            if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+            and (scans := plan_problems(conn, statement, parameters))
+        }
+
+    async def run_explain():
+        async with db_engine.connect() as conn:
+            return await conn.run_sync(explain)
+
+    engine = db_engine.sync_engine
+    problems = {}
+    for method, path, body, budget, allow_sort in ROUTES:
+        if "{cursor}" in path:
+            first = client.get(path.split("&cursor=")[0], headers=headers)
+            ids["cursor"] = first.json()["meta"]["next_cursor"]
+        if isinstance(body, str):
+            content, json_body = body.format(**ids), None
+            request_headers = {**headers, "Content-Type": "text/csv"}
+        else:
+            content, json_body, request_headers = None, fill(body, ids), headers
+        statements.clear()
+        # Measure the cold path: no cached principal or totals.
+        principal_cache.clear()
+        count_cache.clear()
+        fx_cache.clear()
+        event.listen(engine, "before_cursor_execute", record)
+        try:
+            response = client.request(
+                method,
+                path.format(**ids),
+                content=content,
+                json=json_body,
+                headers=request_headers,
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record)
+        assert response.status_code == 200, (path, response.text)
+
+        route = f"{method} {path}"
+        if len(statements) > budget:
+            problems[route] = f"{len(statements)} queries, budget {budget}"
+        elif plans := client.portal.call(run_explain):
+            if allow_sort:
+                plans = {k: v for k, v in plans.items() if v != ["sort"]}
+            if plans:
+                problems[route] = plans
+
+    assert problems == {}
@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.auth_cache import principal_cache
+from app.core.database import Base, get_db, get_replica_db
+from app.core.replica import RecentWriters, recent_writers
+from app.main import app
+
+
+@pytest.fixture()
+def replicated_client(tmp_path):
+    """Two SQLite files stand in for the primary and a replica that never catches up."""
+    engines = {
+        name: create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("primary", "replica")
+    }
+    sessions = {
+        name: async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+        for name, engine in engines.items()
+    }
+
+    async def primary_db():
+        async with sessions["primary"]() as db:
+            yield db
+
+    async def replica_db():
+        async with sessions["replica"]() as db:
+            yield db
+
+    async def create_schemas():
+        for engine in engines.values():
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+    async def dispose():
+        for engine in engines.values():
+            await engine.dispose()
+
+    app.dependency_overrides[get_db] = primary_db
+    app.dependency_overrides[get_replica_db] = replica_db
+    principal_cache.clear()
+    recent_writers.clear()
+    with TestClient(app) as c:
+        c.portal.call(create_schemas)
+        yield c
+        c.portal.call(dispose)
+    app.dependency_overrides.clear()
+    recent_writers.clear()
+
+
+def test_reads_go_to_the_replica_except_right_after_a_write(replicated_client):
+    client = replicated_client
+    token = client.post(
+        "/v1/auth/register",
+        json={"email": "replica@example.com", "password": "123456", "name": "Replica"},
+    ).json()["data"]["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    friend = client.post("/v1/friends", json={"name": "Ana"}, headers=headers).json()["data"]
+
+    # Read your writes: the friend just created is served from the primary.
+    assert [f["id"] for f in client.get("/v1/friends", headers=headers).json()["data"]] == [
+        friend["id"]
+    ]
+    assert client.get(f"/v1/friends/{friend['id']}", headers=headers).status_code == 200
+
+    # Once the marker expires, reads hit the (stale) replica.
+    recent_writers.clear()
+    assert client.get("/v1/friends", headers=headers).json()["data"] == []
+    assert client.get(f"/v1/friends/{friend['id']}", headers=headers).status_code == 404
+    # Authentication still resolves the user on the primary.
+    assert client.get("/v1/auth/me", headers=headers).status_code == 200
+
+
+def test_recent_writers_expire_after_the_window(monkeypatch):
+    writers = RecentWriters(window_seconds=5)
+    clock = iter([100.0, 104.0, 106.0])
+    monkeypatch.setattr("app.core.replica.time.monotonic", lambda: next(clock))
+    owner = object()
+    writers.touch(owner)
+    assert writers.wrote_recently(owner)
+    assert not writers.wrote_recently(owner)
@@ -0,0 +1,93 @@
+from decimal import Decimal
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.rollup_service import compute_rollups, stored_rollups
+
+
+def register(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "report@example.com", "password": "123456", "name": "Report"},
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def create_expense(client, headers, user_id, amount, date, **extra):
+    payload = {
+        "description": "Spend",
+        "amount": amount,
+        "date": date,
+        "split_type": "amount",
+        "splits": [{"participant_type": "user", "user_id": user_id, "share_amount": amount}],
+        **extra,
+    }
+    return client.post("/v1/expenses", json=payload, headers=headers).json()["data"]["id"]
+
+
+def report(client, headers, query=""):
+    body = client.get(f"/v1/reports/spend?{query}", headers=headers).json()["data"]
+    return [(r["period"], r.get("category_id"), Decimal(r["amount"]), r["expenses"]) for r in body]
+
+
+def test_spend_rollups_follow_expense_writes(client, db_engine):
+    headers, user_id = register(client)
+    food = client.post("/v1/categories", json={"name": "Food"}, headers=headers).json()["data"]
+    travel = client.post("/v1/categories", json={"name": "Travel"}, headers=headers).json()
+    travel = travel["data"]
+
+    create_expense(client, headers, user_id, "10.00", "2026-01-05", category_id=food["id"])
+    moved = create_expense(client, headers, user_id, "20.00", "2026-01-20", category_id=food["id"])
+    create_expense(client, headers, user_id, "5.00", "2026-02-01")
+
+    assert report(client, headers) == [
+        ("2026-01-01", food["id"], Decimal("30.00"), 2),
+        ("2026-02-01", None, Decimal("5.00"), 1),
+    ]
+
+    update = {
+        "amount": "25.00",
+        "date": "2026-02-10",
+        "category_id": travel["id"],
+        "splits": [{"participant_type": "user", "user_id": user_id, "share_amount": "25.00"}],
+    }
+    assert client.patch(f"/v1/expenses/{moved}", json=update, headers=headers).status_code == 200
+    rows = report(client, headers)
+    assert ("2026-01-01", food["id"], Decimal("10.00"), 1) in rows
+    assert ("2026-02-01", travel["id"], Decimal("25.00"), 1) in rows
+    assert len(rows) == 3
+
+    assert report(client, headers, "granularity=year&date_from=2026-02-01") == sorted(
+        [
+            ("2026-01-01", None, Decimal("5.00"), 1),
+            ("2026-01-01", travel["id"], Decimal("25.00"), 1),
+        ],
+        key=lambda r: str(r[1]),
+    )
+
+    async def rollups_match_expenses():
+        async with AsyncSession(db_engine) as db:
+            return await stored_rollups(db) == await compute_rollups(db)
+
+    assert client.portal.call(rollups_match_expenses)
+
+    client.delete(f"/v1/expenses/{moved}", headers=headers)
+    assert len(report(client, headers)) == 2
+
+
+def test_spend_report_by_group_omits_category_key(client):
+    headers, user_id = register(client)
+    group = client.post("/v1/groups", json={"name": "Home"}, headers=headers).json()["data"]
+    create_expense(client, headers, user_id, "12.00", "2026-03-03", group_id=group["id"])
+
+    body = client.get("/v1/reports/spend?by=group", headers=headers).json()["data"]
+    assert body == [
+        {
+            "period": "2026-03-01",
+            "group_id": group["id"],
+            "currency": "BRL",
+            "amount": "12.00",
+            "expenses": 1,
+        }
+    ]
@@ -0,0 +1,52 @@
+import pytest
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from app.schemas.common import SuccessListResponse, SuccessResponse
+from app.schemas.expense import ExpenseOut
+from app.schemas.report import SpendOut
+
+
+def register(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "json@example.com", "password": "123456", "name": "Json"},
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+@pytest.mark.parametrize(
+    ("path", "model", "exclude_unset"),
+    [
+        ("/v1/expenses?limit=5", SuccessListResponse[ExpenseOut], False),
+        ("/v1/expenses/{expense_id}", SuccessResponse[ExpenseOut], False),
+        ("/v1/reports/spend", SuccessResponse[list[SpendOut]], True),
+    ],
+)
+def test_model_response_matches_response_model_output(client, path, model, exclude_unset):
+    headers, user_id = register(client)
+    category = client.post("/v1/categories", json={"name": "Food"}, headers=headers).json()
+    payload = {
+        "description": "Café com pão",
+        "amount": "12.50",
+        "date": "2026-02-11",
+        "category_id": category["data"]["id"],
+        "split_type": "amount",
+        "splits": [{"participant_type": "user", "user_id": user_id, "share_amount": "12.50"}],
+    }
+    expense = client.post("/v1/expenses", json=payload, headers=headers).json()["data"]
+
+    response = client.get(path.format(expense_id=expense["id"]), headers=headers)
+    assert response.headers["content-type"] == "application/json"
+
+    field = create_model_field(name="Response", type_=model, mode="serialization")
+    expected = client.portal.call(
+        lambda: serialize_response(
+            field=field,
+            response_content=response.json(),
+            exclude_unset=exclude_unset,
+            dump_json=True,
+        )
+    )
+    assert response.content == expected
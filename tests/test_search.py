@@ -0,0 +1,50 @@
+def auth_header(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "search@example.com", "password": "123456", "name": "Search"},
+    )
+    data = response.json()["data"]
+    return {"Authorization": f"Bearer {data['access_token']}"}, data["user"]["id"]
+
+
+def friend_names(client, headers, query):
+    body = client.get(f"/v1/friends?{query}", headers=headers).json()
+    return [f["name"] for f in body["data"]], body["meta"]
+
+
+def test_name_search_matches_substrings_and_follows_writes(client):
+    headers, _ = auth_header(client)
+    ids = {}
+    for name in ["Mariana Souza", "ANA", "Bruno", "100% Real"]:
+        response = client.post("/v1/friends", json={"name": name}, headers=headers)
+        ids[name] = response.json()["data"]["id"]
+
+    names, meta = friend_names(client, headers, "name=ana")
+    assert sorted(names) == ["ANA", "Mariana Souza"]
+    assert meta["total"] == 2
+
+    assert friend_names(client, headers, "name=un")[0] == ["Bruno"]
+    assert friend_names(client, headers, "name=0%25")[0] == ["100% Real"]
+
+    client.patch(f"/v1/friends/{ids['Bruno']}", json={"name": "Bruna"}, headers=headers)
+    client.delete(f"/v1/friends/{ids['ANA']}", headers=headers)
+    assert friend_names(client, headers, "name=ana")[0] == ["Mariana Souza"]
+    assert friend_names(client, headers, "name=bruna")[0] == ["Bruna"]
+
+
+def test_relevance_sort_ranks_closer_matches_first(client):
+    headers, user_id = auth_header(client)
+    for description in ["Taxi", "Taxi to the airport after a very long trip", "Dinner"]:
+        payload = {
+            "description": description,
+            "amount": "10.00",
+            "date": "2026-02-11",
+            "split_type": "amount",
+            "splits": [{"participant_type": "user", "user_id": user_id, "share_amount": "10.00"}],
+        }
+        assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+    body = client.get("/v1/expenses?q=taxi&sort=relevance&limit=1", headers=headers).json()
+    assert [e["description"] for e in body["data"]] == ["Taxi"]
+    assert body["meta"]["total"] == 2
+    assert body["meta"]["next_cursor"] is None
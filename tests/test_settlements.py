@@ -0,0 +1,74 @@
+import random
+import uuid
+from collections import defaultdict
+from decimal import Decimal
+
+import pytest
+
+from app.models.enums import ParticipantType
+from app.services.settlement_service import simplify_debts
+
+
+def participant():
+    return (ParticipantType.friend, uuid.uuid4())
+
+
+def test_simplify_debts_settles_everyone_with_few_transfers():
+    rng = random.Random(3)
+    people = [participant() for _ in range(200)]
+    net = {p: Decimal(rng.randint(-10_000, 10_000)) / 100 for p in people[:-1]}
+    net[people[-1]] = -sum(net.values(), Decimal("0"))
+
+    transfers = simplify_debts(net)
+
+    settled = defaultdict(Decimal)
+    for debtor, creditor, amount in transfers:
+        assert amount > 0
+        settled[debtor] -= amount
+        settled[creditor] += amount
+    assert {p: a for p, a in settled.items() if a} == {p: a for p, a in net.items() if a}
+    assert len(transfers) <= len(people) - 1
+
+
+def test_simplify_debts_rejects_unbalanced_input():
+    with pytest.raises(ValueError):
+        simplify_debts({participant(): Decimal("10.00"), participant(): Decimal("-9.99")})
+
+
+def test_group_settlements_endpoint(client):
+    response = client.post(
+        "/v1/auth/register",
+        json={"email": "group@example.com", "password": "123456", "name": "Group"},
+    )
+    data = response.json()["data"]
+    headers = {"Authorization": f"Bearer {data['access_token']}"}
+    owner_id = data["user"]["id"]
+    group = client.post("/v1/groups", json={"name": "Trip"}, headers=headers)
+    friend = client.post("/v1/friends", json={"name": "Bia"}, headers=headers)
+    group_id = group.json()["data"]["id"]
+    friend_id = friend.json()["data"]["id"]
+    payload = {
+        "description": "Hotel",
+        "amount": "100.00",
+        "date": "2026-02-11",
+        "group_id": group_id,
+        "split_type": "percentage",
+        "splits": [
+            {"participant_type": "user", "user_id": owner_id, "share_percentage": "40"},
+            {"participant_type": "friend", "friend_id": friend_id, "share_percentage": "60"},
+        ],
+    }
+    assert client.post("/v1/expenses", json=payload, headers=headers).status_code == 200
+
+    response = client.get(f"/v1/groups/{group_id}/settlements", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {
+            "from_type": "friend",
+            "from_id": friend_id,
+            "to_type": "user",
+            "to_id": owner_id,
+            "currency": "BRL",
+            "amount": "60.00",
+        }
+    ]